@@ -0,0 +1,192 @@
+"""Partition audit and webhook logs
+
+Revision ID: 7c2d5e8a4b19
+Revises: 0d7b4f2e91c3
+Create Date: 2026-10-17 17:02:44.510937
+
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c2d5e8a4b19"
+down_revision = "0d7b4f2e91c3"
+branch_labels = None
+depends_on = None
+
+PREMADE_PARTITIONS = 3
+
+# Table, partition column and foreign keys
+PARTITIONED_TABLES: list[tuple[str, str, list[tuple[str, str]]]] = [
+    ("audit_logs", "timestamp", []),
+    ("webhook_logs", "created_at", [("webhook_id", "webhooks")]),
+]
+
+DROPPED_AUDIT_LOGS_INDEXES = [
+    "level",
+    "object_class",
+    "admin_user_id",
+    "admin_api_key_id",
+]
+
+
+def _get_month_start(value: datetime, months: int = 0) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=UTC)
+
+
+def _get_indexes(connection: sa.Connection, table: str) -> list[tuple[str, str]]:
+    result = connection.exec_driver_sql(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        f"WHERE tablename = '{table}' AND left(indexname, 3) = 'ix_'"
+    )
+    return [(name, definition) for name, definition in result.all()]
+
+
+def _add_foreign_keys(
+    connection: sa.Connection,
+    table: str,
+    foreign_keys: list[tuple[str, str]],
+    table_prefix: str,
+) -> None:
+    for column, referred_table in foreign_keys:
+        connection.exec_driver_sql(
+            f"ALTER TABLE {table} ADD CONSTRAINT "
+            f"fk_{table}_{column}_{table_prefix}{referred_table} "
+            f"FOREIGN KEY ({column}) "
+            f"REFERENCES {table_prefix}{referred_table} (id) ON DELETE CASCADE"
+        )
+
+
+def _get_primary_key(connection: sa.Connection, table: str) -> str:
+    return connection.exec_driver_sql(
+        "SELECT conname FROM pg_constraint "
+        f"WHERE conrelid = '{table}'::regclass AND contype = 'p'"
+    ).scalar_one()
+
+
+def _partition_table(
+    connection: sa.Connection,
+    table: str,
+    column: str,
+    foreign_keys: list[tuple[str, str]],
+    table_prefix: str,
+) -> None:
+    # The existing table is attached as the oldest partition,
+    # so existing logs stay available. It's scanned once to check its bound.
+    legacy = f"{table}_legacy"
+    indexes = _get_indexes(connection, table)
+    primary_key = _get_primary_key(connection, table)
+    connection.exec_driver_sql(f"ALTER TABLE {table} RENAME TO {legacy}")
+    for name, _ in indexes:
+        connection.exec_driver_sql(
+            f"ALTER INDEX {name} RENAME TO {name.replace(table, legacy, 1)}"
+        )
+
+    latest = connection.exec_driver_sql(
+        f'SELECT max("{column}") FROM {legacy}'
+    ).scalar_one()
+    bound = datetime.now(UTC)
+    if latest is not None:
+        bound = max(bound, latest + timedelta(microseconds=1))
+
+    # The primary key of a partitioned table has to include the partition column
+    connection.exec_driver_sql(
+        f"ALTER TABLE {legacy} DROP CONSTRAINT {primary_key}, "
+        f'ADD CONSTRAINT {legacy}_pkey PRIMARY KEY (id, "{column}")'
+    )
+    connection.exec_driver_sql(
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS, "
+        f'CONSTRAINT {table}_pkey PRIMARY KEY (id, "{column}")) '
+        f'PARTITION BY RANGE ("{column}")'
+    )
+    _add_foreign_keys(connection, table, foreign_keys, table_prefix)
+    for _, definition in indexes:
+        connection.exec_driver_sql(definition)
+
+    connection.exec_driver_sql(
+        f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{bound.isoformat()}')"
+    )
+    connection.exec_driver_sql(
+        f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"
+    )
+    start = bound
+    end = max(
+        _get_month_start(bound, 1),
+        _get_month_start(datetime.now(UTC), PREMADE_PARTITIONS),
+    )
+    while start < end:
+        next_start = _get_month_start(start, 1)
+        connection.exec_driver_sql(
+            f"CREATE TABLE {table}_p{start:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{next_start.isoformat()}')"
+        )
+        start = next_start
+
+
+def _unpartition_table(
+    connection: sa.Connection,
+    table: str,
+    foreign_keys: list[tuple[str, str]],
+    table_prefix: str,
+) -> None:
+    indexes = _get_indexes(connection, table)
+
+    connection.exec_driver_sql(
+        f"CREATE TABLE {table}_unpartitioned (LIKE {table} INCLUDING DEFAULTS)"
+    )
+    connection.exec_driver_sql(
+        f"INSERT INTO {table}_unpartitioned SELECT * FROM {table}"
+    )
+    connection.exec_driver_sql(f"DROP TABLE {table}")
+    connection.exec_driver_sql(f"ALTER TABLE {table}_unpartitioned RENAME TO {table}")
+
+    connection.exec_driver_sql(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+    _add_foreign_keys(connection, table, foreign_keys, table_prefix)
+    for _, definition in indexes:
+        connection.exec_driver_sql(definition)
+
+
+def upgrade():
+    table_prefix = op.get_context().opts["table_prefix"]
+
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        return
+
+    # Each of them would be maintained on every partition
+    for column in DROPPED_AUDIT_LOGS_INDEXES:
+        op.drop_index(
+            op.f(f"ix_{table_prefix}audit_logs_{column}"),
+            table_name=f"{table_prefix}audit_logs",
+        )
+
+    for table, column, foreign_keys in PARTITIONED_TABLES:
+        _partition_table(
+            connection, f"{table_prefix}{table}", column, foreign_keys, table_prefix
+        )
+
+
+def downgrade():
+    table_prefix = op.get_context().opts["table_prefix"]
+
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        return
+
+    for table, _, foreign_keys in PARTITIONED_TABLES:
+        _unpartition_table(
+            connection, f"{table_prefix}{table}", foreign_keys, table_prefix
+        )
+
+    for column in DROPPED_AUDIT_LOGS_INDEXES:
+        op.create_index(
+            op.f(f"ix_{table_prefix}audit_logs_{column}"),
+            f"{table_prefix}audit_logs",
+            [column],
+            unique=False,
+        )
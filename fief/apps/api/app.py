@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fief import __version__
 from fief.apps.api.routers.clients import router as clients_router
 from fief.apps.api.routers.email_templates import router as email_templates_router
+from fief.apps.api.routers.metrics import router as metrics_router
 from fief.apps.api.routers.oauth_providers import router as oauth_providers_router
 from fief.apps.api.routers.permissions import router as permissions_router
 from fief.apps.api.routers.roles import router as roles_router
@@ -11,6 +12,7 @@ from fief.apps.api.routers.tenants import router as tenants_router
 from fief.apps.api.routers.user_fields import router as user_fields_router
 from fief.apps.api.routers.users import router as users_router
 from fief.apps.api.routers.webhooks import router as webhooks_router
+from fief.executor import ExecutorBusyError, executor_busy_exception_handler
 from fief.middlewares.security_headers import SecurityHeadersMiddleware
 from fief.services.localhost import is_localhost
 from fief.settings import settings
@@ -44,6 +46,7 @@ app = FastAPI(
             },
         }
     ],
+    exception_handlers={ExecutorBusyError: executor_busy_exception_handler},
 )
 
 app.add_middleware(
@@ -59,6 +62,7 @@ app.include_router(clients_router, prefix="/clients", tags=["Clients"])
 app.include_router(
     email_templates_router, prefix="/email-templates", tags=["Email templates"]
 )
+app.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
 app.include_router(
     oauth_providers_router, prefix="/oauth-providers", tags=["OAuth Providers"]
 )
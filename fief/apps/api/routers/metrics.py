@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+
+from fief import schemas
+from fief.crypto.jwt import crypto_executor
+from fief.crypto.password import password_executor
+from fief.dependencies.admin_authentication import is_authenticated_admin_api
+
+router = APIRouter(dependencies=[Depends(is_authenticated_admin_api)])
+
+
+@router.get("/", name="metrics:get", response_model=schemas.metrics.Metrics)
+async def get_metrics() -> schemas.metrics.Metrics:
+    return schemas.metrics.Metrics(
+        executors=[
+            schemas.metrics.Executor.model_validate(executor)
+            for executor in (crypto_executor, password_executor)
+        ]
+    )
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from fief import schemas
+from fief.db.unit_of_work import after_commit
 from fief.dependencies.admin_authentication import is_authenticated_admin_api
 from fief.dependencies.logger import get_audit_logger
 from fief.dependencies.pagination import PaginatedObjects
@@ -14,6 +15,7 @@ from fief.logger import AuditLogger
 from fief.models import AuditLogMessage, Permission
 from fief.repositories import PermissionRepository
 from fief.schemas.generics import PaginatedResults
+from fief.services.user_permissions_cache import user_permissions_cache
 from fief.services.webhooks.models import (
     PermissionCreated,
     PermissionDeleted,
@@ -105,6 +107,7 @@ async def update_permission(
         setattr(permission, field, value)
 
     await repository.update(permission)
+    await after_commit(repository.session, user_permissions_cache.invalidate_all)
     audit_logger.log_object_write(AuditLogMessage.OBJECT_UPDATED, permission)
     trigger_webhooks(PermissionUpdated, permission, schemas.permission.Permission)
 
@@ -124,5 +127,6 @@ async def delete_permission(
     trigger_webhooks: TriggerWebhooks = Depends(get_trigger_webhooks),
 ):
     await repository.delete(permission)
+    await after_commit(repository.session, user_permissions_cache.invalidate_all)
     audit_logger.log_object_write(AuditLogMessage.OBJECT_DELETED, permission)
     trigger_webhooks(PermissionDeleted, permission, schemas.permission.Permission)
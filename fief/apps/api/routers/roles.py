@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from fief import schemas
+from fief.db.unit_of_work import after_commit
 from fief.dependencies.admin_authentication import is_authenticated_admin_api
 from fief.dependencies.logger import get_audit_logger
 from fief.dependencies.pagination import PaginatedObjects
@@ -13,6 +14,7 @@ from fief.logger import AuditLogger
 from fief.models import AuditLogMessage, Role
 from fief.repositories import PermissionRepository, RoleRepository
 from fief.schemas.generics import PaginatedResults
+from fief.services.user_permissions_cache import user_permissions_cache
 from fief.services.webhooks.models import RoleCreated, RoleDeleted, RoleUpdated
 from fief.tasks import SendTask, on_role_updated
 
@@ -138,5 +140,6 @@ async def delete_role(
     trigger_webhooks: TriggerWebhooks = Depends(get_trigger_webhooks),
 ):
     await repository.delete(role)
+    await after_commit(repository.session, user_permissions_cache.invalidate_all)
     audit_logger.log_object_write(AuditLogMessage.OBJECT_DELETED, role)
     trigger_webhooks(RoleDeleted, role, schemas.role.Role)
@@ -5,6 +5,7 @@ from fief.dependencies.admin_authentication import is_authenticated_admin_api
 from fief.dependencies.logger import get_audit_logger
 from fief.dependencies.pagination import PaginatedObjects
 from fief.dependencies.repositories import get_repository
+from fief.dependencies.tasks import get_send_task
 from fief.dependencies.tenant import get_paginated_tenants, get_tenant_by_id_or_404
 from fief.dependencies.webhooks import TriggerWebhooks, get_trigger_webhooks
 from fief.errors import APIErrorCode
@@ -13,16 +14,19 @@ from fief.models import AuditLogMessage, Client, OAuthProvider, Tenant
 from fief.repositories import (
     ClientRepository,
     OAuthProviderRepository,
+    PooledSigningKeyRepository,
     TenantRepository,
     ThemeRepository,
 )
 from fief.schemas.generics import PaginatedResults
+from fief.services.signing_key_pool import get_signing_key
 from fief.services.webhooks.models import (
     ClientCreated,
     TenantCreated,
     TenantDeleted,
     TenantUpdated,
 )
+from fief.tasks import SendTask
 
 router = APIRouter(dependencies=[Depends(is_authenticated_admin_api)])
 
@@ -59,8 +63,12 @@ async def create_tenant(
     oauth_provider_repository: OAuthProviderRepository = Depends(
         get_repository(OAuthProviderRepository)
     ),
+    pooled_signing_key_repository: PooledSigningKeyRepository = Depends(
+        PooledSigningKeyRepository
+    ),
     audit_logger: AuditLogger = Depends(get_audit_logger),
     trigger_webhooks: TriggerWebhooks = Depends(get_trigger_webhooks),
+    send_task: SendTask = Depends(get_send_task),
 ) -> schemas.tenant.Tenant:
     if tenant_create.theme_id is not None:
         theme = await theme_repository.get_by_id(tenant_create.theme_id)
@@ -84,9 +92,13 @@ async def create_tenant(
             oauth_providers.append(oauth_provider)
 
     slug = await repository.get_available_slug(tenant_create.name)
+    sign_jwk = await get_signing_key(
+        pooled_signing_key_repository, send_task, tenant_create.sign_algorithm
+    )
     tenant = Tenant(
-        **tenant_create.model_dump(exclude={"oauth_providers"}),
+        **tenant_create.model_dump(exclude={"oauth_providers", "sign_algorithm"}),
         slug=slug,
+        sign_jwk=sign_jwk,
         oauth_providers=oauth_providers,
     )
 
@@ -153,6 +165,38 @@ async def update_tenant(
     return schemas.tenant.Tenant.model_validate(tenant)
 
 
+@router.post(
+    "/{id:uuid}/signing-key",
+    name="tenants:signing_key",
+    status_code=status.HTTP_201_CREATED,
+    response_model=schemas.tenant.Tenant,
+)
+async def create_signing_key(
+    signing_key_create: schemas.tenant.TenantSigningKeyCreate,
+    tenant: Tenant = Depends(get_tenant_by_id_or_404),
+    repository: TenantRepository = Depends(TenantRepository),
+    pooled_signing_key_repository: PooledSigningKeyRepository = Depends(
+        PooledSigningKeyRepository
+    ),
+    audit_logger: AuditLogger = Depends(get_audit_logger),
+    trigger_webhooks: TriggerWebhooks = Depends(get_trigger_webhooks),
+    send_task: SendTask = Depends(get_send_task),
+) -> schemas.tenant.Tenant:
+    algorithm = signing_key_create.algorithm or tenant.sign_algorithm
+    sign_jwk = await get_signing_key(
+        pooled_signing_key_repository, send_task, algorithm
+    )
+    tenant.rotate_sign_jwk(
+        algorithm, signing_key_create.overlap_seconds, sign_jwk=sign_jwk
+    )
+
+    await repository.update(tenant)
+    audit_logger.log_object_write(AuditLogMessage.OBJECT_UPDATED, tenant)
+    trigger_webhooks(TenantUpdated, tenant, schemas.tenant.Tenant)
+
+    return schemas.tenant.Tenant.model_validate(tenant)
+
+
 @router.delete(
     "/{id:uuid}",
     name="tenants:delete",
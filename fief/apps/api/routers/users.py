@@ -7,9 +7,10 @@ from sqlalchemy.orm import joinedload
 
 from fief import schemas
 from fief.crypto.access_token import generate_access_token
+from fief.db.unit_of_work import after_commit
 from fief.dependencies.admin_authentication import is_authenticated_admin_api
 from fief.dependencies.logger import get_audit_logger
-from fief.dependencies.pagination import PaginatedObjects
+from fief.dependencies.pagination import Page, PaginatedObjects
 from fief.dependencies.permission import (
     UserPermissionsGetter,
     get_user_permissions_getter,
@@ -21,10 +22,10 @@ from fief.dependencies.users import (
     get_paginated_user_oauth_accounts,
     get_paginated_user_permissions,
     get_paginated_user_roles,
-    get_paginated_users,
     get_user_by_id_or_404,
     get_user_create_admin,
     get_user_manager,
+    get_users_page,
 )
 from fief.dependencies.webhooks import TriggerWebhooks, get_trigger_webhooks
 from fief.errors import APIErrorCode
@@ -50,7 +51,9 @@ from fief.services.user_manager import (
     InvalidPasswordError,
     UserAlreadyExistsError,
     UserManager,
+    user_claims_cache,
 )
+from fief.services.user_permissions_cache import user_permissions_cache
 from fief.services.user_roles import (
     UserRoleAlreadyExists,
     UserRoleDoesNotExist,
@@ -69,12 +72,13 @@ router = APIRouter(dependencies=[Depends(is_authenticated_admin_api)])
     "/", name="users:list", response_model=PaginatedResults[schemas.user.UserRead]
 )
 async def list_users(
-    paginated_users: PaginatedObjects[User] = Depends(get_paginated_users),
+    page: Page[User] = Depends(get_users_page),
 ) -> PaginatedResults[schemas.user.UserRead]:
-    users, count = paginated_users
     return PaginatedResults(
-        count=count,
-        results=[schemas.user.UserRead.model_validate(user) for user in users],
+        count=page.count,
+        results=[schemas.user.UserRead.model_validate(user) for user in page.results],
+        next=page.next,
+        prev=page.prev,
     )
 
 
@@ -173,6 +177,10 @@ async def delete_user(
     trigger_webhooks: TriggerWebhooks = Depends(get_trigger_webhooks),
 ):
     await repository.delete(user)
+    await after_commit(
+        repository.session,
+        lambda: user_claims_cache.delete((user.tenant_id, user.id)),
+    )
     audit_logger.log_object_write(AuditLogMessage.OBJECT_DELETED, user)
     trigger_webhooks(UserDeleted, user, schemas.user.UserRead)
 
@@ -221,7 +229,7 @@ async def create_user_access_token(
     tenant_host = tenant.get_host()
     permissions = await get_user_permissions(user)
 
-    access_token = generate_access_token(
+    access_token = await generate_access_token(
         user.tenant.get_sign_jwk(),
         tenant_host,
         client,
@@ -284,6 +292,10 @@ async def create_user_permission(
 
     user_permission = UserPermission(user_id=user.id, permission=permission)
     await user_permission_repository.create(user_permission)
+    await after_commit(
+        user_permission_repository.session,
+        lambda: user_permissions_cache.invalidate(user.id),
+    )
     audit_logger.log_object_write(
         AuditLogMessage.OBJECT_CREATED,
         user_permission,
@@ -319,6 +331,10 @@ async def delete_user_permission(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
     await user_permission_repository.delete(user_permission)
+    await after_commit(
+        user_permission_repository.session,
+        lambda: user_permissions_cache.invalidate(user.id),
+    )
     audit_logger.log_object_write(
         AuditLogMessage.OBJECT_DELETED,
         user_permission,
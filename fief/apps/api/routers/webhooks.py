@@ -3,11 +3,11 @@ from fastapi import APIRouter, Depends, Response, status
 from fief import schemas
 from fief.dependencies.admin_authentication import is_authenticated_admin_api
 from fief.dependencies.logger import get_audit_logger
-from fief.dependencies.pagination import PaginatedObjects
+from fief.dependencies.pagination import Page, PaginatedObjects
 from fief.dependencies.webhook import (
-    get_paginated_webhook_logs,
     get_paginated_webhooks,
     get_webhook_by_id_or_404,
+    get_webhook_logs_page,
 )
 from fief.logger import AuditLogger
 from fief.models import AuditLogMessage, Webhook, WebhookLog
@@ -112,15 +112,14 @@ async def delete_role(
     response_model=PaginatedResults[schemas.webhook_log.WebhookLog],
 )
 async def list_webhook_logs(
-    paginated_webhook_logs: PaginatedObjects[WebhookLog] = Depends(
-        get_paginated_webhook_logs
-    ),
+    page: Page[WebhookLog] = Depends(get_webhook_logs_page),
 ):
-    webhook_logs, count = paginated_webhook_logs
     return PaginatedResults(
-        count=count,
+        count=page.count,
         results=[
             schemas.webhook_log.WebhookLog.model_validate(webhook_log)
-            for webhook_log in webhook_logs
+            for webhook_log in page.results
         ],
+        next=page.next,
+        prev=page.prev,
     )
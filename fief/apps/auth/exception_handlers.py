@@ -12,6 +12,7 @@ from fief.exceptions import (
     OAuthException,
     TokenRequestException,
 )
+from fief.executor import ExecutorBusyError, executor_busy_exception_handler
 from fief.forms import FormHelper
 from fief.services.authentication_flow import AuthenticationFlow
 from fief.templates import templates
@@ -108,4 +109,6 @@ async def logout_exception_handler(request: Request, exc: LogoutException):
 
 exception_handlers[LogoutException] = logout_exception_handler
 
+exception_handlers[ExecutorBusyError] = executor_busy_exception_handler
+
 __all__ = ["exception_handlers"]
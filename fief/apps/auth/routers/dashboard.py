@@ -7,6 +7,7 @@ from fief.apps.auth.forms.password import ChangePasswordForm
 from fief.apps.auth.forms.profile import PF, ChangeEmailForm, get_profile_form_class
 from fief.apps.auth.forms.verify_email import VerifyEmailForm
 from fief.apps.auth.responses import HXLocationResponse
+from fief.crypto.password import password_executor
 from fief.dependencies.branding import get_show_branding
 from fief.dependencies.session_token import (
     get_verified_email_user_from_session_token_or_verify,
@@ -109,8 +110,10 @@ async def email_change(
         (
             current_password_valid,
             _hash_update,
-        ) = user_manager.password_helper.verify_and_update(
-            current_password, user.hashed_password
+        ) = await password_executor.run(
+            user_manager.password_helper.verify_and_update,
+            current_password,
+            user.hashed_password,
         )
 
         if not current_password_valid:
@@ -201,8 +204,10 @@ async def update_password(
         (
             old_password_valid,
             _hash_update,
-        ) = user_manager.password_helper.verify_and_update(
-            old_password, user.hashed_password
+        ) = await password_executor.run(
+            user_manager.password_helper.verify_and_update,
+            old_password,
+            user.hashed_password,
         )
 
         if not old_password_valid:
@@ -44,7 +44,7 @@ async def token(
     permissions = await get_user_permissions(user)
 
     tenant_host = tenant.get_host()
-    access_token = generate_access_token(
+    access_token = await generate_access_token(
         tenant.get_sign_jwk(),
         tenant_host,
         client,
@@ -55,7 +55,7 @@ async def token(
         permissions,
         client.access_id_token_lifetime_seconds,
     )
-    id_token = generate_id_token(
+    id_token = await generate_id_token(
         tenant.get_sign_jwk(),
         tenant_host,
         client,
@@ -1,10 +1,12 @@
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 
 from fief.dependencies.users import (
-    current_active_user,
     current_active_user_acr_level_1,
     current_user,
+    get_current_active_user_claims,
     get_user_manager,
     get_user_update,
 )
@@ -28,13 +30,15 @@ router = APIRouter()
 
 
 @router.api_route("/userinfo", methods=["GET", "POST"], name="user:userinfo")
-async def userinfo(user: User = Depends(current_active_user)):
+async def userinfo(
+    user_claims: dict[str, Any] = Depends(get_current_active_user_claims),
+):
     """
     OpenID specification requires the /userinfo endpoint
     to be available both with GET and POST methods 🤷‍♂️
     https://openid.net/specs/openid-connect-core-1_0.html#UserInfoRequest
     """
-    return user.get_claims()
+    return user_claims
 
 
 @router.patch(
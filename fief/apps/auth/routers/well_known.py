@@ -1,22 +1,89 @@
-from fastapi import APIRouter, Request
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from fastapi.param_functions import Depends
-from jwcrypto import jwk
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.datastructures import URL
 from starlette.routing import Router
 
 from fief.dependencies.tenant import get_current_tenant
+from fief.errors import APIErrorCode
 from fief.models import Tenant
+from fief.repositories import TenantRepository
 from fief.schemas.well_known import OpenIDProviderMetadata
 from fief.services.acr import ACR
 from fief.services.response_type import ALLOWED_RESPONSE_TYPES
+from fief.services.well_known import (
+    WellKnownDocument,
+    get_tenant_well_known_version,
+    well_known_cache,
+)
 from fief.settings import settings
 
 router = APIRouter()
 
 
-@router.get("/openid-configuration", name="well_known:openid_configuration")
-async def get_openid_configuration(
-    request: Request, tenant: Tenant = Depends(get_current_tenant)
-):
+def _get_base_url(request: Request) -> URL:
+    x_forwarded_host = request.headers.get("X-Forwarded-Host", None)
+    host = x_forwarded_host if x_forwarded_host else request.base_url.netloc
+    return request.base_url.replace(netloc=host)
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def _get_document_response(request: Request, document: WellKnownDocument) -> Response:
+    headers = {
+        "ETag": document.etag,
+        "Cache-Control": f"public, max-age={settings.well_known_cache_max_age_seconds}",
+    }
+    if _is_not_modified(request, document.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=document.content, media_type="application/json", headers=headers
+    )
+
+
+async def _get_cached_document(
+    request: Request,
+    repository: TenantRepository,
+    cache_key: tuple[Any, ...],
+    build: Callable[[Tenant], dict[str, Any]],
+) -> Response:
+    cache_key = (request.path_params.get("tenant_slug"), *cache_key)
+    try:
+        tenant = await get_current_tenant(request, repository)
+    except (SQLAlchemyError, OSError) as e:
+        # Keep serving the last known document while the database is unavailable
+        document = well_known_cache.get(cache_key)
+        if document is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=APIErrorCode.SERVER_DATABASE_NOT_AVAILABLE,
+            ) from e
+        return _get_document_response(request, document)
+
+    version = get_tenant_well_known_version(tenant)
+    document = well_known_cache.get(cache_key)
+    if document is None or document.version != version:
+        document = well_known_cache.set(cache_key, version, build(tenant))
+
+    return _get_document_response(request, document)
+
+
+def _build_openid_configuration(
+    request: Request, base_url: URL, tenant: Tenant
+) -> dict[str, Any]:
     url_for_params = {}
     if not tenant.default:
         url_for_params["tenant_slug"] = tenant.slug
@@ -24,11 +91,6 @@ async def get_openid_configuration(
     def _url_for(name: str) -> str:
         router: Router = request.scope["router"]
         url_path = router.url_path_for(name, **url_for_params)
-
-        x_forwarded_host = request.headers.get("X-Forwarded-Host", None)
-        host = x_forwarded_host if x_forwarded_host else request.base_url.netloc
-        base_url = request.base_url.replace(netloc=host)
-
         return str(url_path.make_absolute_url(base_url))
 
     configuration = OpenIDProviderMetadata(
@@ -43,7 +105,7 @@ async def get_openid_configuration(
         response_modes_supported=["query", "fragment"],
         grant_types_supported=["authorization_code", "refresh_token"],
         subject_types_supported=["public"],
-        id_token_signing_alg_values_supported=["RS256"],
+        id_token_signing_alg_values_supported=tenant.get_sign_algorithms(),
         id_token_encryption_alg_values_supported=["RSA-OAEP-256"],
         id_token_encryption_enc_values_supported=["A256CBC-HS512"],
         userinfo_signing_alg_values_supported=["none"],
@@ -64,10 +126,29 @@ async def get_openid_configuration(
         service_documentation=settings.fief_documentation_url,
     )
 
-    return configuration.model_dump(exclude_unset=True)
+    return configuration.model_dump(mode="json", exclude_unset=True)
 
 
-@router.get("/jwks.json", name="well_known:jwks")
-async def get_jwks(tenant: Tenant = Depends(get_current_tenant)):
-    keyset = jwk.JWKSet(keys=tenant.get_sign_jwk())
+def _build_jwks(tenant: Tenant) -> dict[str, Any]:
+    keyset = tenant.get_sign_jwk_set()
     return keyset.export(private_keys=False, as_dict=True)
+
+
+@router.get("/openid-configuration", name="well_known:openid_configuration")
+async def get_openid_configuration(
+    request: Request, repository: TenantRepository = Depends(TenantRepository)
+):
+    base_url = _get_base_url(request)
+    return await _get_cached_document(
+        request,
+        repository,
+        ("openid-configuration", str(base_url)),
+        lambda tenant: _build_openid_configuration(request, base_url, tenant),
+    )
+
+
+@router.get("/jwks.json", name="well_known:jwks")
+async def get_jwks(
+    request: Request, repository: TenantRepository = Depends(TenantRepository)
+):
+    return await _get_cached_document(request, repository, ("jwks",), _build_jwks)
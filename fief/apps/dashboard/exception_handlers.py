@@ -1,8 +1,10 @@
 from collections.abc import Callable
 
-from fastapi import Request
+from fastapi import Request, status
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from fief.errors import APIErrorCode
+from fief.executor import ExecutorBusyError
 from fief.templates import templates
 
 exception_handlers: dict[type[Exception], Callable] = {}
@@ -25,4 +27,20 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 exception_handlers[StarletteHTTPException] = http_exception_handler
 
 
+async def executor_busy_exception_handler(request: Request, exc: ExecutorBusyError):
+    return templates.TemplateResponse(
+        request,
+        "admin/error.html",
+        {
+            "status_code": status.HTTP_503_SERVICE_UNAVAILABLE,
+            "detail": APIErrorCode.SERVER_BUSY,
+        },
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
+
+
+exception_handlers[ExecutorBusyError] = executor_busy_exception_handler
+
+
 __all__ = ["exception_handlers"]
@@ -1,5 +1,13 @@
-from wtforms import BooleanField, EmailField, StringField, URLField, validators
+from wtforms import (
+    BooleanField,
+    EmailField,
+    SelectField,
+    StringField,
+    URLField,
+    validators,
+)
 
+from fief.crypto.jwk import SignatureAlgorithm
 from fief.forms import (
     ComboboxSelectField,
     ComboboxSelectMultipleField,
@@ -41,7 +49,14 @@ class BaseTenantForm(CSRFBaseForm):
 
 
 class TenantCreateForm(BaseTenantForm):
-    pass
+    sign_algorithm = SelectField(
+        "Signature algorithm",
+        choices=SignatureAlgorithm.choices(),
+        coerce=SignatureAlgorithm.coerce,
+        default=SignatureAlgorithm.RS256.value,
+        validators=[validators.InputRequired()],
+        description="Algorithm used to sign the tokens issued by this tenant.",
+    )
 
 
 class TenantUpdateForm(BaseTenantForm):
@@ -1,4 +1,4 @@
-from wtforms import URLField, validators
+from wtforms import BooleanField, URLField, validators
 
 from fief.forms import CSRFBaseForm, SelectMultipleFieldCheckbox
 from fief.services.webhooks.models import WEBHOOK_EVENTS
@@ -12,6 +12,10 @@ class BaseWebhookForm(CSRFBaseForm):
     events = SelectMultipleFieldCheckbox(
         "Events to notify", choices=[event.key() for event in WEBHOOK_EVENTS]
     )
+    batch = BooleanField(
+        "Batch events",
+        description="When enabled, events are grouped and delivered together as a JSON array.",
+    )
 
 
 class WebhookCreateForm(BaseWebhookForm):
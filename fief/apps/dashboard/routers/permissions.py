@@ -10,6 +10,7 @@ from fief.apps.dashboard.dependencies import (
 )
 from fief.apps.dashboard.forms.permission import PermissionCreateForm
 from fief.apps.dashboard.responses import HXRedirectResponse
+from fief.db.unit_of_work import after_commit
 from fief.dependencies.admin_authentication import is_authenticated_admin_session
 from fief.dependencies.logger import get_audit_logger
 from fief.dependencies.pagination import PaginatedObjects
@@ -22,6 +23,7 @@ from fief.forms import FormHelper
 from fief.logger import AuditLogger
 from fief.models import AuditLogMessage, Permission
 from fief.repositories import PermissionRepository
+from fief.services.user_permissions_cache import user_permissions_cache
 from fief.services.webhooks.models import (
     PermissionCreated,
     PermissionDeleted,
@@ -130,6 +132,7 @@ async def delete_permission(
 ):
     if request.method == "DELETE":
         await repository.delete(permission)
+        await after_commit(repository.session, user_permissions_cache.invalidate_all)
         audit_logger.log_object_write(AuditLogMessage.OBJECT_DELETED, permission)
         trigger_webhooks(PermissionDeleted, permission, schemas.permission.Permission)
 
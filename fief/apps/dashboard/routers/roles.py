@@ -10,6 +10,7 @@ from fief.apps.dashboard.dependencies import (
 )
 from fief.apps.dashboard.forms.role import RoleCreateForm, RoleUpdateForm
 from fief.apps.dashboard.responses import HXRedirectResponse
+from fief.db.unit_of_work import after_commit
 from fief.dependencies.admin_authentication import is_authenticated_admin_session
 from fief.dependencies.logger import get_audit_logger
 from fief.dependencies.pagination import PaginatedObjects
@@ -21,6 +22,7 @@ from fief.forms import FormHelper
 from fief.logger import AuditLogger
 from fief.models import AuditLogMessage, Role
 from fief.repositories import PermissionRepository, RoleRepository
+from fief.services.user_permissions_cache import user_permissions_cache
 from fief.services.webhooks.models import RoleCreated, RoleDeleted, RoleUpdated
 from fief.tasks import SendTask, on_role_updated
 from fief.templates import templates
@@ -214,6 +216,7 @@ async def delete_role(
 ):
     if request.method == "DELETE":
         await repository.delete(role)
+        await after_commit(repository.session, user_permissions_cache.invalidate_all)
         audit_logger.log_object_write(AuditLogMessage.OBJECT_DELETED, role)
         trigger_webhooks(RoleDeleted, role, schemas.role.Role)
 
@@ -20,6 +20,7 @@ from fief.dependencies.email_provider import get_email_provider
 from fief.dependencies.logger import get_audit_logger
 from fief.dependencies.pagination import PaginatedObjects
 from fief.dependencies.repositories import get_repository
+from fief.dependencies.tasks import get_send_task
 from fief.dependencies.tenant import get_paginated_tenants, get_tenant_by_id_or_404
 from fief.dependencies.tenant_email_domain import get_tenant_email_domain
 from fief.dependencies.webhooks import TriggerWebhooks, get_trigger_webhooks
@@ -29,11 +30,13 @@ from fief.models import AuditLogMessage, Client, OAuthProvider, Tenant
 from fief.repositories import (
     ClientRepository,
     OAuthProviderRepository,
+    PooledSigningKeyRepository,
     TenantRepository,
     ThemeRepository,
     UserRepository,
 )
 from fief.services.email import EmailProvider
+from fief.services.signing_key_pool import get_signing_key
 from fief.services.tenant_email_domain import (
     DomainAuthenticationNotImplementedError,
     TenantEmailDomain,
@@ -46,6 +49,7 @@ from fief.services.webhooks.models import (
     TenantUpdated,
 )
 from fief.settings import settings
+from fief.tasks import SendTask
 from fief.templates import templates
 
 router = APIRouter(dependencies=[Depends(is_authenticated_admin_session)])
@@ -232,10 +236,14 @@ async def create_tenant(
     oauth_provider_repository: OAuthProviderRepository = Depends(
         get_repository(OAuthProviderRepository)
     ),
+    pooled_signing_key_repository: PooledSigningKeyRepository = Depends(
+        PooledSigningKeyRepository
+    ),
     list_context=Depends(get_list_context),
     context: BaseContext = Depends(get_base_context),
     audit_logger: AuditLogger = Depends(get_audit_logger),
     trigger_webhooks: TriggerWebhooks = Depends(get_trigger_webhooks),
+    send_task: SendTask = Depends(get_send_task),
 ):
     form_helper = FormHelper(
         TenantCreateForm,
@@ -272,6 +280,9 @@ async def create_tenant(
             oauth_providers.append(oauth_provider)
             form.oauth_providers.data = oauth_providers
 
+        tenant.sign_jwk = await get_signing_key(
+            pooled_signing_key_repository, send_task, form.data["sign_algorithm"]
+        )
         form.populate_obj(tenant)
         tenant.slug = await repository.get_available_slug(tenant.name)
         tenant = await repository.create(tenant)
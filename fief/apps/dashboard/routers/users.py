@@ -20,6 +20,7 @@ from fief.apps.dashboard.forms.user import (
 )
 from fief.apps.dashboard.responses import HXRedirectResponse
 from fief.crypto.access_token import generate_access_token
+from fief.db.unit_of_work import after_commit
 from fief.dependencies.admin_authentication import is_authenticated_admin_session
 from fief.dependencies.logger import get_audit_logger
 from fief.dependencies.pagination import PaginatedObjects
@@ -65,7 +66,9 @@ from fief.services.user_manager import (
     InvalidPasswordError,
     UserAlreadyExistsError,
     UserManager,
+    user_claims_cache,
 )
+from fief.services.user_permissions_cache import user_permissions_cache
 from fief.services.user_roles import (
     UserRoleAlreadyExists,
     UserRoleDoesNotExist,
@@ -315,7 +318,7 @@ async def create_user_access_token(
         tenant_host = tenant.get_host()
         permissions = await get_user_permissions(user)
 
-        access_token = generate_access_token(
+        access_token = await generate_access_token(
             user.tenant.get_sign_jwk(),
             tenant_host,
             client,
@@ -382,6 +385,10 @@ async def delete_user(
 ):
     if request.method == "DELETE":
         await repository.delete(user)
+        await after_commit(
+            repository.session,
+            lambda: user_claims_cache.delete((user.tenant_id, user.id)),
+        )
         audit_logger.log_object_write(AuditLogMessage.OBJECT_DELETED, user)
         trigger_webhooks(UserDeleted, user, schemas.user.UserRead)
 
@@ -457,6 +464,10 @@ async def user_permissions(
 
         user_permission = UserPermission(user_id=user.id, permission=permission)
         await user_permission_repository.create(user_permission)
+        await after_commit(
+            user_permission_repository.session,
+            lambda: user_permissions_cache.invalidate(user.id),
+        )
         audit_logger.log_object_write(
             AuditLogMessage.OBJECT_CREATED,
             user_permission,
@@ -499,6 +510,10 @@ async def delete_user_permission(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
     await user_permission_repository.delete(user_permission)
+    await after_commit(
+        user_permission_repository.session,
+        lambda: user_permissions_cache.invalidate(user.id),
+    )
     audit_logger.log_object_write(
         AuditLogMessage.OBJECT_DELETED,
         user_permission,
@@ -22,6 +22,7 @@ from fief.forms import FormHelper
 from fief.logger import AuditLogger
 from fief.models import AuditLogMessage, Webhook, WebhookLog
 from fief.repositories import WebhookRepository
+from fief.services.webhooks.circuit_breaker import webhook_circuit_breaker
 from fief.templates import templates
 
 router = APIRouter(dependencies=[Depends(is_authenticated_admin_session)])
@@ -72,10 +73,11 @@ async def get_webhook(
     list_context=Depends(get_list_context),
     context: BaseContext = Depends(get_base_context),
 ):
+    circuit = await webhook_circuit_breaker.get_circuit(webhook.id)
     return templates.TemplateResponse(
         request,
         "admin/webhooks/get.html",
-        {**context, **list_context, "webhook": webhook},
+        {**context, **list_context, "webhook": webhook, "circuit": circuit},
     )
 
 
@@ -1,12 +1,18 @@
 import asyncio
 import functools
 import os
+from pathlib import Path
 
 import typer
 import uvicorn
 from dramatiq import cli as dramatiq_cli
 
 from fief import __version__
+from fief.crypto.password import (
+    PasswordHashAlgorithm,
+    calibrate_argon2,
+    calibrate_bcrypt,
+)
 from fief.db.main import create_main_engine
 from fief.db.migration import migrate_schema
 from fief.services.initializer import (
@@ -32,6 +38,17 @@ engine = create_main_engine()
 initializer = Initializer(engine, settings)
 
 
+def _write_env_file(path: Path, variables: dict[str, str]) -> None:
+    lines = path.read_text().splitlines() if path.exists() else []
+    remaining = dict(variables)
+    for i, line in enumerate(lines):
+        name = line.split("=", 1)[0].strip()
+        if name in remaining:
+            lines[i] = f"{name}={remaining.pop(name)}"
+    lines.extend(f"{name}={value}" for name, value in remaining.items())
+    path.write_text("\n".join(lines) + "\n")
+
+
 def add_commands(app: typer.Typer) -> typer.Typer:
     @app.command("create-admin")
     @asyncio_command
@@ -108,6 +125,69 @@ def add_commands(app: typer.Typer) -> typer.Typer:
         for key, value in settings.model_dump().items():
             typer.echo(f"{key}: {value}")
 
+    @app.command("calibrate-password-hash")
+    def calibrate_password_hash(
+        target_ms: int = typer.Option(
+            250, min=1, help="Target duration of a password verification, in ms."
+        ),
+        algorithm: PasswordHashAlgorithm = typer.Option(
+            settings.password_hash_algorithm,
+            help="The algorithm to use for new password hashes.",
+        ),
+        argon2_memory_cost: int = typer.Option(
+            settings.password_argon2_memory_cost,
+            help="Argon2 memory cost to start from, in KiB.",
+        ),
+        argon2_parallelism: int = typer.Option(
+            settings.password_argon2_parallelism, help="Argon2 parallelism."
+        ),
+        env_file: Path | None = typer.Option(
+            None, help="Write the parameters to this environment file."
+        ),
+    ):
+        """
+        Benchmark password hashing on this host and recommend cost parameters.
+
+        Existing hashes are upgraded to the new parameters at the next user login.
+        """
+        target_seconds = target_ms / 1000
+
+        typer.echo("Benchmarking bcrypt...")
+        bcrypt_calibration = calibrate_bcrypt(target_seconds)
+        typer.echo(
+            f"bcrypt: {bcrypt_calibration.rounds} rounds "
+            f"({bcrypt_calibration.seconds * 1000:.0f} ms)"
+        )
+
+        typer.echo("Benchmarking Argon2...")
+        argon2_calibration = calibrate_argon2(
+            target_seconds,
+            memory_cost=argon2_memory_cost,
+            parallelism=argon2_parallelism,
+        )
+        typer.echo(
+            f"Argon2: time cost {argon2_calibration.time_cost}, "
+            f"memory cost {argon2_calibration.memory_cost} KiB, "
+            f"parallelism {argon2_calibration.parallelism} "
+            f"({argon2_calibration.seconds * 1000:.0f} ms)"
+        )
+
+        environment_variables = {
+            "PASSWORD_HASH_ALGORITHM": algorithm.value,
+            "PASSWORD_BCRYPT_ROUNDS": str(bcrypt_calibration.rounds),
+            "PASSWORD_ARGON2_TIME_COST": str(argon2_calibration.time_cost),
+            "PASSWORD_ARGON2_MEMORY_COST": str(argon2_calibration.memory_cost),
+            "PASSWORD_ARGON2_PARALLELISM": str(argon2_calibration.parallelism),
+        }
+
+        if env_file is not None:
+            _write_env_file(env_file, environment_variables)
+            typer.secho(f"Parameters written to {env_file}", fg="green")
+        else:
+            typer.secho("Recommended settings", bold=True)
+            for name, value in environment_variables.items():
+                typer.echo(f"{typer.style(name, bold=True)}={value}")
+
     @app.command("migrate")
     @asyncio_command
     async def migrate():
@@ -217,8 +297,16 @@ def add_commands(app: typer.Typer) -> typer.Typer:
 
         Just forwards the options to the Dramatiq CLI.
         """
+        worker_args = list(ctx.args)
+        # In async mode, worker threads only submit tasks to the event loop:
+        # a few of them are enough, the concurrency is bounded by the runtime.
+        if settings.worker_async_concurrency > 0 and not any(
+            arg in ("-t", "--threads") or arg.startswith("--threads=")
+            for arg in worker_args
+        ):
+            worker_args += ["--threads", str(settings.worker_async_threads)]
         parser = dramatiq_cli.make_argument_parser()
-        args = parser.parse_args(ctx.args + [worker, f"-f{scheduler}"])
+        args = parser.parse_args(worker_args + [worker, f"-f{scheduler}"])
         dramatiq_cli.main(args)
 
     return app
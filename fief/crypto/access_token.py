@@ -1,19 +1,100 @@
+import copy
+import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
 from datetime import UTC, datetime
 from typing import Any
 
 from jwcrypto import jwk, jwt
 from jwcrypto.common import JWException
 
-from fief.models import Client, User
+from fief.crypto.jwk import get_jwk_fingerprint
+from fief.crypto.jwt import crypto_executor, sign_jwt
+from fief.models import Client, Tenant, User
 from fief.services.acr import ACR
+from fief.settings import settings
 
 
 class InvalidAccessToken(Exception):
     pass
 
 
-def generate_access_token(
+class ClaimsCache:
+    """
+    Bounded, process-wide LRU cache of claims dictionaries with expiration.
+
+    Each entry lives until the given expiration timestamp,
+    capped at `ttl_seconds` after it was stored.
+    Claims are copied in and out, so callers can't alter the cached ones.
+
+    :param maxsize: Maximum number of entries to keep. `0` disables the cache.
+    :param ttl_seconds: Maximum lifetime of an entry. `0` disables the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(claims)
+
+    def set(
+        self, key: Hashable, claims: dict[str, Any], expires_at: float | None = None
+    ) -> None:
+        if not self.enabled:
+            return
+
+        max_expires_at = time.time() + self.ttl_seconds
+        if expires_at is None or expires_at > max_expires_at:
+            expires_at = max_expires_at
+
+        with self._lock:
+            self._entries[key] = (expires_at, copy.deepcopy(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+access_token_cache = ClaimsCache(
+    settings.access_token_cache_size, settings.access_token_cache_ttl_seconds
+)
+
+
+async def generate_access_token(
     key: jwk.JWK,
     host: str,
     client: Client,
@@ -40,13 +121,38 @@ def generate_access_token(
         "permissions": permissions,
     }
 
-    token = jwt.JWT(header={"alg": "RS256", "kid": key["kid"]}, claims=claims)
-    token.make_signed_token(key)
+    return await crypto_executor.run(sign_jwt, key, claims)
+
+
+async def read_access_token(key: jwk.JWK | jwk.JWKSet, token: str) -> dict[str, Any]:
+    return await crypto_executor.run(_decode_access_token, key, token)
+
+
+async def read_tenant_access_token(tenant: Tenant, token: str) -> dict[str, Any]:
+    """
+    Verify and decode an access token issued by the tenant.
 
-    return token.serialize()
+    Verified claims are cached until the token expires, so repeated calls
+    with the same token don't verify the signature again.
+    The cache key includes the current signing key, so rotating it
+    without overlap invalidates the cached tokens.
+    """
+    cache_key = (
+        tenant.id,
+        get_jwk_fingerprint(tenant.sign_jwk),
+        hashlib.sha256(token.encode("utf-8")).hexdigest(),
+    )
+    claims = access_token_cache.get(cache_key)
+    if claims is None:
+        claims = await read_access_token(tenant.get_sign_jwk_set(), token)
+        exp = claims.get("exp")
+        access_token_cache.set(
+            cache_key, claims, exp if isinstance(exp, int | float) else None
+        )
+    return claims
 
 
-def read_access_token(key: jwk.JWK, token: str) -> dict[str, Any]:
+def _decode_access_token(key: jwk.JWK | jwk.JWKSet, token: str) -> dict[str, Any]:
     try:
         decoded_jwt = jwt.JWT(jwt=token, key=key)
         return json.loads(decoded_jwt.claims)
@@ -1,14 +1,16 @@
 import base64
 import hashlib
 from datetime import UTC, datetime
+from typing import Any
 
-from jwcrypto import jwk, jwt
+from jwcrypto import jwk
 
+from fief.crypto.jwt import crypto_executor, encrypt_jwt, sign_jwt
 from fief.models import Client, User
 from fief.services.acr import ACR
 
 
-def generate_id_token(
+async def generate_id_token(
     signing_key: jwk.JWK,
     host: str,
     client: Client,
@@ -43,7 +45,7 @@ def generate_id_token(
     iat = int(datetime.now(UTC).timestamp())
     exp = iat + lifetime_seconds
 
-    claims = {
+    claims: dict[str, Any] = {
         **user.get_claims(),
         "iss": host,
         "aud": [client.client_id],
@@ -61,24 +63,24 @@ def generate_id_token(
     if access_token is not None:
         claims["at_hash"] = get_validation_hash(access_token)
 
-    signed_token = jwt.JWT(
-        header={"alg": "RS256", "kid": signing_key["kid"]}, claims=claims
+    return await crypto_executor.run(
+        _serialize_id_token, signing_key, claims, encryption_key
     )
-    signed_token.make_signed_token(signing_key)
+
+
+def _serialize_id_token(
+    signing_key: jwk.JWK, claims: dict[str, Any], encryption_key: jwk.JWK | None
+) -> str:
+    signed_token = sign_jwt(signing_key, claims)
 
     if encryption_key is not None:
-        encrypted_token = jwt.JWT(
-            header={
-                "alg": "RSA-OAEP-256",
-                "enc": "A256CBC-HS512",
-                "kid": encryption_key["kid"],
-            },
-            claims=signed_token.serialize(),
+        return encrypt_jwt(
+            encryption_key,
+            {"alg": "RSA-OAEP-256", "enc": "A256CBC-HS512"},
+            signed_token,
         )
-        encrypted_token.make_encrypted_token(encryption_key)
-        return encrypted_token.serialize()
 
-    return signed_token.serialize()
+    return signed_token
 
 
 def get_validation_hash(value: str) -> str:
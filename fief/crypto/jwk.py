@@ -1,4 +1,9 @@
+import hashlib
 import secrets
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from enum import StrEnum
 from typing import Literal
 
 from jwcrypto import jwk
@@ -14,16 +19,128 @@ class InvalidAccessToken(AuthException):
     pass
 
 
+class SignatureAlgorithm(StrEnum):
+    RS256 = "RS256"
+    ES256 = "ES256"
+    EDDSA = "EdDSA"
+
+    def get_display_name(self) -> str:
+        display_names = {
+            SignatureAlgorithm.RS256: "RS256 (RSA)",
+            SignatureAlgorithm.ES256: "ES256 (ECDSA P-256)",
+            SignatureAlgorithm.EDDSA: "EdDSA (Ed25519)",
+        }
+        return display_names[self]
+
+    @classmethod
+    def choices(cls) -> list[tuple[str, str]]:
+        return [(member.value, member.get_display_name()) for member in cls]
+
+    @classmethod
+    def coerce(cls, item):
+        return cls(str(item)) if not isinstance(item, cls) else item
+
+
 def generate_jwk(kid: str, use: Literal["sig", "enc"]) -> jwk.JWK:
     return jwk.JWK.generate(
         kty="RSA", size=settings.generated_jwk_size, use=use, kid=kid
     )
 
 
+def generate_signature_jwk(
+    kid: str, algorithm: SignatureAlgorithm = SignatureAlgorithm.RS256
+) -> jwk.JWK:
+    if algorithm == SignatureAlgorithm.ES256:
+        return jwk.JWK.generate(
+            kty="EC", crv="P-256", use="sig", kid=kid, alg=algorithm.value
+        )
+    if algorithm == SignatureAlgorithm.EDDSA:
+        return jwk.JWK.generate(
+            kty="OKP", crv="Ed25519", use="sig", kid=kid, alg=algorithm.value
+        )
+    return jwk.JWK.generate(
+        kty="RSA",
+        size=settings.generated_jwk_size,
+        use="sig",
+        kid=kid,
+        alg=algorithm.value,
+    )
+
+
+def get_signature_algorithm(key: jwk.JWK) -> SignatureAlgorithm:
+    """
+    Returns the algorithm to sign with the given key.
+
+    Keys generated before algorithm selection was introduced don't have
+    an `alg` parameter: they are RSA keys used with RS256.
+    """
+    if (alg := key.get("alg")) is not None:
+        return SignatureAlgorithm(alg)
+    if key["kty"] == "EC":
+        return SignatureAlgorithm.ES256
+    if key["kty"] == "OKP":
+        return SignatureAlgorithm.EDDSA
+    return SignatureAlgorithm.RS256
+
+
 def load_jwk(json: str) -> jwk.JWK:
     return jwk.JWK.from_json(json)
 
 
-def generate_signature_jwk_string() -> str:
-    key = generate_jwk(secrets.token_urlsafe(), "sig")
+def generate_signature_jwk_string(
+    algorithm: SignatureAlgorithm = SignatureAlgorithm.RS256,
+) -> str:
+    key = generate_signature_jwk(secrets.token_urlsafe(), algorithm)
     return key.export()
+
+
+def get_jwk_fingerprint(json: str) -> str:
+    return hashlib.sha256(json.encode("utf-8")).hexdigest()
+
+
+class JWKCache:
+    """
+    Bounded, process-wide LRU cache of parsed JWK.
+
+    Entries are keyed on the owner of the key (e.g. the tenant ID)
+    and on a fingerprint of the stored key material,
+    so a rotated key is automatically parsed again.
+
+    :param maxsize: Maximum number of parsed keys to keep. `0` disables the cache.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._keys: OrderedDict[tuple[Hashable, str], jwk.JWK] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, owner_id: Hashable, json: str) -> jwk.JWK:
+        if self.maxsize <= 0:
+            return load_jwk(json)
+
+        cache_key = (owner_id, get_jwk_fingerprint(json))
+        with self._lock:
+            key = self._keys.get(cache_key)
+            if key is not None:
+                self._keys.move_to_end(cache_key)
+                return key
+
+        key = load_jwk(json)
+
+        with self._lock:
+            self._keys[cache_key] = key
+            self._keys.move_to_end(cache_key)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+        return key
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+jwk_cache = JWKCache(settings.jwk_cache_size)
@@ -0,0 +1,41 @@
+import copyreg
+from typing import Any
+
+from jwcrypto import jwk, jwt
+
+from fief.crypto.jwk import get_signature_algorithm, jwk_cache
+from fief.executor import BoundedExecutor
+from fief.settings import settings
+
+crypto_executor = BoundedExecutor(
+    "crypto",
+    settings.crypto_executor_mode,
+    max_workers=settings.crypto_executor_max_workers,
+    max_pending=settings.crypto_executor_max_pending,
+)
+
+
+def _load_pickled_jwk(json: str) -> jwk.JWK:
+    return jwk_cache.get(None, json)
+
+
+def _pickle_jwk(key: jwk.JWK):
+    # Parsed keys hold `cryptography` objects which can't be pickled:
+    # send the key material and let the worker process parse and cache it.
+    return _load_pickled_jwk, (key.export(private_key=key.has_private),)
+
+
+copyreg.pickle(jwk.JWK, _pickle_jwk)
+
+
+def sign_jwt(key: jwk.JWK, claims: dict[str, Any] | str) -> str:
+    header = {"alg": get_signature_algorithm(key).value, "kid": key["kid"]}
+    token = jwt.JWT(header=header, claims=claims)
+    token.make_signed_token(key)
+    return token.serialize()
+
+
+def encrypt_jwt(key: jwk.JWK, header: dict[str, Any], payload: str) -> str:
+    token = jwt.JWT(header={**header, "kid": key["kid"]}, claims=payload)
+    token.make_encrypted_token(key)
+    return token.serialize()
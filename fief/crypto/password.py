@@ -1,13 +1,54 @@
+import dataclasses
+import os
 import secrets
+import statistics
+import time
 
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.base import HasherProtocol
 from pwdlib.hashers.bcrypt import BcryptHasher
 
+from fief.executor import BoundedExecutor
+from fief.settings import settings
+from fief.settings_class import PasswordHashAlgorithm
+
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 31
+ARGON2_MIN_MEMORY_COST = 19 * 1024  # OWASP recommended minimum, in KiB
+ARGON2_MAX_TIME_COST = 32
+
 
 class PasswordHelper:
-    def __init__(self) -> None:
-        self.password_hash = PasswordHash((BcryptHasher(), Argon2Hasher()))
+    """
+    Hash and verify passwords.
+
+    New hashes are computed with the `algorithm` hasher and the given cost parameters.
+    Hashes computed with the other algorithm or with other parameters
+    are still verified, but `verify_and_update` returns an updated hash for them.
+    """
+
+    def __init__(
+        self,
+        algorithm: PasswordHashAlgorithm = PasswordHashAlgorithm.BCRYPT,
+        *,
+        bcrypt_rounds: int = 12,
+        argon2_time_cost: int = 3,
+        argon2_memory_cost: int = 65536,
+        argon2_parallelism: int = 4,
+    ) -> None:
+        bcrypt_hasher = BcryptHasher(rounds=bcrypt_rounds)
+        argon2_hasher = Argon2Hasher(
+            time_cost=argon2_time_cost,
+            memory_cost=argon2_memory_cost,
+            parallelism=argon2_parallelism,
+        )
+        hashers: tuple[HasherProtocol, HasherProtocol] = (
+            (bcrypt_hasher, argon2_hasher)
+            if algorithm == PasswordHashAlgorithm.BCRYPT
+            else (argon2_hasher, bcrypt_hasher)
+        )
+        self.password_hash = PasswordHash(hashers)
 
     def verify_and_update(
         self, plain_password: str, hashed_password: str
@@ -21,4 +62,104 @@ class PasswordHelper:
         return secrets.token_urlsafe()
 
 
-password_helper = PasswordHelper()
+password_helper = PasswordHelper(
+    settings.password_hash_algorithm,
+    bcrypt_rounds=settings.password_bcrypt_rounds,
+    argon2_time_cost=settings.password_argon2_time_cost,
+    argon2_memory_cost=settings.password_argon2_memory_cost,
+    argon2_parallelism=settings.password_argon2_parallelism,
+)
+
+# Hashing is deliberately slow and memory-hard: keep it off the event loop
+# and bound the number of concurrent hashes so a login spike fails fast.
+password_executor = BoundedExecutor(
+    "password",
+    settings.password_executor_mode,
+    max_workers=settings.password_executor_max_workers or os.cpu_count(),
+    max_pending=settings.password_executor_max_pending,
+)
+
+
+@dataclasses.dataclass
+class BcryptCalibration:
+    rounds: int
+    seconds: float
+
+
+@dataclasses.dataclass
+class Argon2Calibration:
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    seconds: float
+
+
+def measure_hasher(hasher: HasherProtocol, iterations: int = 3) -> float:
+    """
+    Returns the median duration, in seconds, of a password verification.
+    """
+    password = secrets.token_urlsafe()
+    hash = hasher.hash(password)
+    durations: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        hasher.verify(password, hash)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def calibrate_bcrypt(target_seconds: float, iterations: int = 3) -> BcryptCalibration:
+    """
+    Find the highest bcrypt rounds verifying a password within `target_seconds`.
+
+    Each additional round doubles the cost,
+    so we stop as soon as a measure exceeds the target.
+    """
+    rounds = BCRYPT_MIN_ROUNDS
+    seconds = measure_hasher(BcryptHasher(rounds=rounds), iterations)
+    while rounds < BCRYPT_MAX_ROUNDS and seconds * 2 <= target_seconds:
+        next_seconds = measure_hasher(BcryptHasher(rounds=rounds + 1), iterations)
+        if next_seconds > target_seconds:
+            break
+        rounds, seconds = rounds + 1, next_seconds
+    return BcryptCalibration(rounds=rounds, seconds=seconds)
+
+
+def calibrate_argon2(
+    target_seconds: float,
+    *,
+    memory_cost: int = 65536,
+    parallelism: int = 4,
+    iterations: int = 3,
+) -> Argon2Calibration:
+    """
+    Find the highest Argon2 time cost verifying a password within `target_seconds`.
+
+    The memory cost is kept as given, unless even a single pass is too slow:
+    then it's halved until it fits, down to the OWASP recommended minimum.
+    """
+
+    def _measure(time_cost: int, memory_cost: int) -> float:
+        hasher = Argon2Hasher(
+            time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+        )
+        return measure_hasher(hasher, iterations)
+
+    time_cost = 1
+    seconds = _measure(time_cost, memory_cost)
+    while seconds > target_seconds and memory_cost // 2 >= ARGON2_MIN_MEMORY_COST:
+        memory_cost //= 2
+        seconds = _measure(time_cost, memory_cost)
+
+    while time_cost < ARGON2_MAX_TIME_COST:
+        next_seconds = _measure(time_cost + 1, memory_cost)
+        if next_seconds > target_seconds:
+            break
+        time_cost, seconds = time_cost + 1, next_seconds
+
+    return Argon2Calibration(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        seconds=seconds,
+    )
@@ -0,0 +1,104 @@
+import contextlib
+import inspect
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fief.logger import logger
+
+_UNIT_OF_WORK_KEY = "fief_unit_of_work"
+_AFTER_COMMIT_KEY = "fief_after_commit"
+
+
+def in_unit_of_work(session: AsyncSession) -> bool:
+    return session.info.get(_UNIT_OF_WORK_KEY, False)
+
+
+async def commit(session: AsyncSession) -> None:
+    """
+    Commit the session, or only flush it if it's in a unit of work.
+    """
+    if in_unit_of_work(session):
+        await session.flush()
+    else:
+        await session.commit()
+
+
+AfterCommitCallback = Callable[[], Awaitable[None] | None]
+
+
+async def after_commit(session: AsyncSession, callback: AfterCommitCallback) -> None:
+    """
+    Call `callback` once the unit of work is committed,
+    or right away if the session is not in a unit of work.
+
+    Use it for side effects which must not be seen before the data,
+    like sending tasks or invalidating caches.
+    Callbacks are discarded if the unit of work is rolled back.
+    """
+    if in_unit_of_work(session):
+        add_after_commit(session, callback)
+    else:
+        await _run_callback(callback)
+
+
+def add_after_commit(session: AsyncSession, callback: AfterCommitCallback) -> None:
+    """
+    Register `callback` to be called once the unit of work is committed.
+
+    The session must be in a unit of work.
+    """
+    assert in_unit_of_work(session)
+    session.info[_AFTER_COMMIT_KEY].append(callback)
+
+
+@contextlib.asynccontextmanager
+async def unit_of_work(
+    session: AsyncSession,
+    *,
+    commit_on: tuple[type[BaseException], ...] = (),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Commit repository writes on `session` once, when leaving the context.
+
+    Inside the context, repository writes are only flushed.
+    Operations that must be visible to others right away
+    can still commit early by calling `session.commit()` explicitly.
+
+    :param session: The session to work with.
+    :param commit_on: Exceptions for which the work is still committed,
+    like those turned into regular responses.
+    Other exceptions roll it back.
+    """
+    session.info[_UNIT_OF_WORK_KEY] = True
+    session.info[_AFTER_COMMIT_KEY] = []
+    try:
+        try:
+            yield session
+        except commit_on:
+            await _commit(session)
+            raise
+        except BaseException:
+            await session.rollback()
+            raise
+        else:
+            await _commit(session)
+    finally:
+        session.info.pop(_UNIT_OF_WORK_KEY, None)
+        session.info.pop(_AFTER_COMMIT_KEY, None)
+
+
+async def _commit(session: AsyncSession) -> None:
+    await session.commit()
+    for callback in session.info.get(_AFTER_COMMIT_KEY, []):
+        # The work is committed: a failing callback must not prevent the others
+        try:
+            await _run_callback(callback)
+        except Exception:
+            logger.exception("After commit callback failed")
+
+
+async def _run_callback(callback: AfterCommitCallback) -> None:
+    result = callback()
+    if inspect.isawaitable(result):
+        await result
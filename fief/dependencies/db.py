@@ -3,7 +3,9 @@ from collections.abc import AsyncGenerator
 from fastapi import HTTPException, Request, status
 
 from fief.db import AsyncSession
+from fief.db.unit_of_work import unit_of_work
 from fief.errors import APIErrorCode
+from fief.settings import settings
 
 
 async def get_main_async_session(
@@ -11,7 +13,18 @@ async def get_main_async_session(
 ) -> AsyncGenerator[AsyncSession, None]:
     try:
         async with request.state.main_async_session_maker() as session:
-            yield session
+            if not settings.database_unit_of_work:
+                yield session
+                return
+
+            # Exceptions turned into responses by the app still commit the work
+            handled_exceptions = tuple(
+                exception
+                for exception in request.app.exception_handlers
+                if isinstance(exception, type)
+            )
+            async with unit_of_work(session, commit_on=handled_exceptions):
+                yield session
     except ConnectionRefusedError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -1,13 +1,27 @@
+import base64
+import dataclasses
+import json
+import uuid
 from collections.abc import Callable, Coroutine
+from datetime import datetime
+from typing import Generic
 
-from fastapi import Depends, Header, Query
+from fastapi import Depends, Header, HTTPException, Query, status
+from pydantic import UUID4
 from sqlalchemy.sql import Select
 
-from fief.repositories.base import BaseRepository, M
+from fief.errors import APIErrorCode
+from fief.models.generics import M_UUID
+from fief.repositories.base import (
+    BaseRepository,
+    KeysetPaginationRepositoryProtocol,
+    M,
+)
 
 RawOrdering = list[str]
 Ordering = list[tuple[list[str], bool]]
 Pagination = tuple[int, int]
+CursorPagination = tuple[int, str, bool]
 PaginatedObjects = tuple[list[M], int]
 GetPaginatedObjects = Callable[
     [Select, Pagination, Ordering, BaseRepository[M]],
@@ -49,6 +63,131 @@ async def get_pagination(
     return min(limit, 100), skip
 
 
+async def get_cursor_pagination(
+    limit: int = Query(10, ge=0),
+    cursor: str | None = Query(None),
+    count: bool = Query(True),
+) -> CursorPagination | None:
+    """
+    Cursor pagination parameters, or `None` to paginate with `skip`.
+
+    An empty `cursor` starts from the first page.
+    """
+    if cursor is None:
+        return None
+    return min(limit, 100), cursor, count
+
+
+@dataclasses.dataclass
+class Page(Generic[M]):
+    results: list[M]
+    count: int | None
+    next: str | None = None
+    prev: str | None = None
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(key: tuple[datetime, UUID4], backwards: bool) -> str:
+    created_at, id = key
+    payload = json.dumps([created_at.isoformat(), str(id), backwards])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str) -> tuple[tuple[datetime, UUID4], bool]:
+    """
+    Returns the key and the direction of a cursor.
+
+    :raises InvalidCursorError: The cursor is invalid.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor))
+    except ValueError as e:
+        raise InvalidCursorError() from e
+
+    if not (
+        isinstance(payload, list)
+        and len(payload) == 3
+        and isinstance(payload[0], str)
+        and isinstance(payload[1], str)
+        and isinstance(payload[2], bool)
+    ):
+        raise InvalidCursorError()
+    created_at, id, backwards = payload
+
+    try:
+        key = (datetime.fromisoformat(created_at), uuid.UUID(id))
+    except ValueError as e:
+        raise InvalidCursorError() from e
+    if key[0].tzinfo is None:
+        raise InvalidCursorError()
+    return key, backwards
+
+
+async def get_page(
+    statement: Select,
+    pagination: Pagination,
+    cursor_pagination: CursorPagination | None,
+    ordering: Ordering,
+    repository: KeysetPaginationRepositoryProtocol[M_UUID],
+) -> Page[M_UUID]:
+    """
+    Paginate with `skip` or, if a cursor is given, by `(created_at, id)`.
+
+    In cursor mode, the only supported ordering is by `created_at`.
+    """
+    if cursor_pagination is None:
+        limit, skip = pagination
+        statement = repository.orderize(statement, ordering)
+        objects, total = await repository.paginate(statement, limit, skip)
+        return Page(objects, total)
+
+    limit, cursor, with_count = cursor_pagination
+    if ordering not in ([], [(["created_at"], False)], [(["created_at"], True)]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=APIErrorCode.PAGINATION_CURSOR_UNSUPPORTED_ORDERING,
+        )
+    key: tuple[datetime, UUID4] | None = None
+    backwards = False
+    if cursor:
+        try:
+            key, backwards = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=APIErrorCode.PAGINATION_INVALID_CURSOR,
+            ) from e
+
+    results, count, has_more = await repository.paginate_keyset(
+        statement,
+        limit,
+        key,
+        backwards=backwards,
+        descending=ordering == [(["created_at"], True)],
+        with_count=with_count,
+    )
+
+    # Coming from a cursor, there is a page on the other side of it
+    has_next = has_more if not backwards else key is not None
+    has_prev = has_more if backwards else key is not None
+    first_key = _get_key(results[0]) if results else key
+    last_key = _get_key(results[-1]) if results else key
+
+    page = Page(results, count)
+    if has_next and last_key is not None:
+        page.next = encode_cursor(last_key, False)
+    if has_prev and first_key is not None:
+        page.prev = encode_cursor(first_key, True)
+    return page
+
+
+def _get_key(object: M_UUID) -> tuple[datetime, UUID4]:
+    return getattr(object, "created_at"), object.id
+
+
 async def get_raw_ordering(ordering: str = Query(None)) -> RawOrdering:
     return ordering.split(",") if ordering else []
 
@@ -16,6 +16,7 @@ from fief.dependencies.pagination import (
 )
 from fief.models import Permission, User
 from fief.repositories import PermissionRepository
+from fief.services.user_permissions_cache import user_permissions_cache
 
 
 async def get_paginated_permissions(
@@ -57,9 +58,12 @@ async def get_user_permissions_getter(
     repository: PermissionRepository = Depends(PermissionRepository),
 ) -> UserPermissionsGetter:
     async def _get_user_permissions(user: User) -> list[str]:
-        permissions = await repository.list(
-            repository.get_user_permissions_statement(user.id)
-        )
-        return [permission.codename for permission in permissions]
+        async def _load_user_permissions() -> list[str]:
+            permissions = await repository.list(
+                repository.get_user_permissions_statement(user.id)
+            )
+            return [permission.codename for permission in permissions]
+
+        return await user_permissions_cache.get_or_load(user.id, _load_user_permissions)
 
     return _get_user_permissions
@@ -6,6 +6,7 @@ from fief.db import AsyncSession
 from fief.dependencies.db import get_main_async_session
 from fief.repositories import get_repository as _get_repository
 from fief.repositories.base import REPOSITORY
+from fief.repositories.ephemeral import ephemeral_repository_classes
 
 
 class get_repository(Generic[REPOSITORY]):
@@ -15,4 +16,14 @@ class get_repository(Generic[REPOSITORY]):
     async def __call__(
         self, session: AsyncSession = Depends(get_main_async_session)
     ) -> REPOSITORY:
+        try:
+            ephemeral_repository_class, get_store = ephemeral_repository_classes[
+                self.repository_class
+            ]
+        except KeyError:
+            pass
+        else:
+            ephemeral_store = get_store()
+            if ephemeral_store is not None:
+                return ephemeral_repository_class(session, ephemeral_store)  # type: ignore
         return _get_repository(self.repository_class, session)
@@ -1,5 +1,21 @@
+import functools
+
+from fastapi import Depends
+
+from fief.db import AsyncSession
+from fief.db.unit_of_work import add_after_commit, in_unit_of_work
+from fief.dependencies.db import get_main_async_session
 from fief.tasks import SendTask, send_task
 
 
-async def get_send_task() -> SendTask:
-    return send_task
+async def get_send_task(
+    session: AsyncSession = Depends(get_main_async_session),
+) -> SendTask:
+    if not in_unit_of_work(session):
+        return send_task
+
+    # Tasks may read what the request wrote, so they're sent once it's committed
+    def _send_task(*args, **kwargs) -> None:
+        add_after_commit(session, functools.partial(send_task, *args, **kwargs))
+
+    return _send_task
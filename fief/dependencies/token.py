@@ -127,13 +127,13 @@ async def validate_grant_request(
             raise TokenRequestException(TokenError.get_invalid_request())
 
         code_hash = get_token_hash(code)
-        authorization_code = await authorization_code_repository.get_valid_by_code(
+        authorization_code = await authorization_code_repository.pop_valid_by_code(
             code_hash
         )
         if authorization_code is None:
             raise TokenRequestException(TokenError.get_invalid_grant())
 
-        if authorization_code.client.id != client.id:
+        if authorization_code.client_id != client.id:
             raise TokenRequestException(TokenError.get_invalid_grant())
 
         if authorization_code.redirect_uri != redirect_uri:
@@ -158,8 +158,6 @@ async def validate_grant_request(
             "client": client,
             "grant_type": grant_type,
         }
-
-        await authorization_code_repository.delete(authorization_code)
         return
     elif grant_type == "refresh_token":
         if refresh_token_token is None:
@@ -5,18 +5,22 @@ from fastapi import Depends, HTTPException, Query, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.security import OAuth2AuthorizationCodeBearer
 from pydantic import UUID4, ValidationError, create_model
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import joinedload
 
-from fief.crypto.access_token import InvalidAccessToken, read_access_token
+from fief.crypto.access_token import InvalidAccessToken, read_tenant_access_token
 from fief.crypto.password import password_helper
 from fief.dependencies.logger import get_audit_logger
 from fief.dependencies.pagination import (
+    CursorPagination,
     GetPaginatedObjects,
     Ordering,
     OrderingGetter,
+    Page,
     PaginatedObjects,
     Pagination,
+    get_cursor_pagination,
+    get_page,
     get_paginated_objects_getter,
     get_pagination,
 )
@@ -53,7 +57,7 @@ from fief.repositories import (
 )
 from fief.schemas.user import UF, UserCreateAdmin, UserUpdate, UserUpdateAdmin
 from fief.services.acr import ACR
-from fief.services.user_manager import UserManager
+from fief.services.user_manager import UserManager, user_claims_cache
 from fief.services.user_roles import UserRolesService
 from fief.tasks import SendTask
 
@@ -96,7 +100,7 @@ def current_user(
     async def _current_user(
         token: str | None = Depends(scheme),
         tenant: Tenant = Depends(get_current_tenant),
-        user_manager: UserManager = Depends(get_user_manager),
+        user_repository: UserRepository = Depends(UserRepository),
     ) -> User | None:
         if token is None:
             if optional:
@@ -104,15 +108,20 @@ def current_user(
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
         try:
-            claims = read_access_token(tenant.get_sign_jwk(), token)
+            claims = await read_tenant_access_token(tenant, token)
             user_id = uuid.UUID(claims["sub"])
             acr_claim = ACR(claims["acr"])
-            user = await user_manager.get(user_id, tenant.id)
+            user = await user_repository.get_by_id_and_tenant(user_id, tenant.id)
         except (InvalidAccessToken, KeyError, ValueError) as e:
             if optional:
                 return None
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED) from e
         else:
+            if user is None:
+                if optional:
+                    return None
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
             if active and not user.is_active:
                 if optional:
                     return None
@@ -135,17 +144,42 @@ current_active_user = current_user(active=True)
 current_active_user_acr_level_1 = current_user(active=True, acr=ACR.LEVEL_ONE)
 
 
-async def get_paginated_users(
+async def get_current_active_user_claims(
+    token: str | None = Depends(scheme),
+    tenant: Tenant = Depends(get_current_tenant),
+    user_repository: UserRepository = Depends(UserRepository),
+) -> dict[str, Any]:
+    """
+    Returns the claims of the current active user.
+
+    When `USER_CLAIMS_CACHE_TTL_SECONDS` is set, they are kept in memory
+    for this duration, sparing the user lookup on repeated calls.
+    Cached claims are returned without checking the user is still active:
+    they are evicted when the user is updated or deleted by this process.
+    """
+    if token is not None:
+        try:
+            claims = await read_tenant_access_token(tenant, token)
+            cache_key = (tenant.id, uuid.UUID(claims["sub"]))
+        except (InvalidAccessToken, KeyError, ValueError) as e:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED) from e
+        if (user_claims := user_claims_cache.get(cache_key)) is not None:
+            return user_claims
+
+    user = await current_active_user(
+        token=token, tenant=tenant, user_repository=user_repository
+    )
+    assert user is not None
+    user_claims = user.get_claims()
+    user_claims_cache.set((tenant.id, user.id), user_claims)
+    return user_claims
+
+
+async def get_users_statement(
     query: str | None = Query(None),
     email: str | None = Query(None),
     tenant: UUID4 | None = Query(None),
-    pagination: Pagination = Depends(get_pagination),
-    ordering: Ordering = Depends(OrderingGetter()),
-    repository: UserRepository = Depends(UserRepository),
-    get_paginated_objects: GetPaginatedObjects[User] = Depends(
-        get_paginated_objects_getter
-    ),
-) -> PaginatedObjects[User]:
+) -> Select:
     statement = select(User).options(joinedload(User.tenant))
     if query is not None:
         statement = statement.where(User.email_lower.ilike(f"%{query}%"))
@@ -153,9 +187,33 @@ async def get_paginated_users(
         statement = statement.where(User.email_lower == email.lower())
     if tenant is not None:
         statement = statement.where(User.tenant_id == tenant)
+    return statement
+
+
+async def get_paginated_users(
+    statement: Select = Depends(get_users_statement),
+    pagination: Pagination = Depends(get_pagination),
+    ordering: Ordering = Depends(OrderingGetter()),
+    repository: UserRepository = Depends(UserRepository),
+    get_paginated_objects: GetPaginatedObjects[User] = Depends(
+        get_paginated_objects_getter
+    ),
+) -> PaginatedObjects[User]:
     return await get_paginated_objects(statement, pagination, ordering, repository)
 
 
+async def get_users_page(
+    statement: Select = Depends(get_users_statement),
+    pagination: Pagination = Depends(get_pagination),
+    cursor_pagination: CursorPagination | None = Depends(get_cursor_pagination),
+    ordering: Ordering = Depends(OrderingGetter()),
+    repository: UserRepository = Depends(UserRepository),
+) -> Page[User]:
+    return await get_page(
+        statement, pagination, cursor_pagination, ordering, repository
+    )
+
+
 async def get_user_by_id_or_404(
     id: UUID4,
     repository: UserRepository = Depends(UserRepository),
@@ -1,13 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from pydantic import UUID4
-from sqlalchemy import select
+from sqlalchemy import Select, select
 
 from fief.dependencies.pagination import (
+    CursorPagination,
     GetPaginatedObjects,
     Ordering,
     OrderingGetter,
+    Page,
     PaginatedObjects,
     Pagination,
+    get_cursor_pagination,
+    get_page,
     get_paginated_objects_getter,
     get_pagination,
 )
@@ -40,8 +44,14 @@ async def get_webhook_by_id_or_404(
     return webhook
 
 
-async def get_paginated_webhook_logs(
+async def get_webhook_logs_statement(
     webhook: Webhook = Depends(get_webhook_by_id_or_404),
+) -> Select:
+    return select(WebhookLog).where(WebhookLog.webhook_id == webhook.id)
+
+
+async def get_paginated_webhook_logs(
+    statement: Select = Depends(get_webhook_logs_statement),
     pagination: Pagination = Depends(get_pagination),
     ordering: Ordering = Depends(OrderingGetter([(["created_at"], True)])),
     repository: WebhookLogRepository = Depends(WebhookLogRepository),
@@ -49,11 +59,21 @@ async def get_paginated_webhook_logs(
         get_paginated_objects_getter
     ),
 ) -> PaginatedObjects[WebhookLog]:
-    statement = select(WebhookLog).where(WebhookLog.webhook_id == webhook.id)
-
     return await get_paginated_objects(statement, pagination, ordering, repository)
 
 
+async def get_webhook_logs_page(
+    statement: Select = Depends(get_webhook_logs_statement),
+    pagination: Pagination = Depends(get_pagination),
+    cursor_pagination: CursorPagination | None = Depends(get_cursor_pagination),
+    ordering: Ordering = Depends(OrderingGetter([(["created_at"], True)])),
+    repository: WebhookLogRepository = Depends(WebhookLogRepository),
+) -> Page[WebhookLog]:
+    return await get_page(
+        statement, pagination, cursor_pagination, ordering, repository
+    )
+
+
 async def get_webhook_log_by_id_and_webhook_or_404(
     log_id: UUID4,
     webhook: Webhook = Depends(get_webhook_by_id_or_404),
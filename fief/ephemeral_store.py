@@ -0,0 +1,203 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Protocol
+
+from redis.asyncio import Redis
+
+from fief.redis import get_redis
+from fief.settings import settings
+from fief.settings_class import EphemeralStoreBackend
+
+
+class EphemeralStore(Protocol):
+    """
+    Key-value store for short-lived objects, expiring by themselves.
+    """
+
+    async def set(
+        self, key: str, value: str, ttl_seconds: int
+    ) -> None: ...  # pragma: no cover
+
+    async def get(self, key: str) -> str | None: ...  # pragma: no cover
+
+    async def pop(self, key: str) -> str | None:
+        """
+        Atomically get and delete a value,
+        so it can be consumed only once.
+        """
+        ...  # pragma: no cover
+
+    async def delete(self, key: str) -> None: ...  # pragma: no cover
+
+
+class MemoryEphemeralStore:
+    """
+    Ephemeral store local to the process.
+
+    Only suitable for single-process deployments and tests.
+    Expired values are purged when read
+    and swept on write, at most every `sweep_interval_seconds`.
+    """
+
+    def __init__(self, *, sweep_interval_seconds: float = 60.0) -> None:
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._values: dict[str, tuple[str, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval_seconds:
+            self._sweep(now)
+        self._values[key] = (value, now + ttl_seconds)
+
+    async def get(self, key: str) -> str | None:
+        item = self._values.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            self._values.pop(key, None)
+            return None
+        return value
+
+    async def pop(self, key: str) -> str | None:
+        value = await self.get(key)
+        self._values.pop(key, None)
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def _sweep(self, now: float) -> None:
+        self._values = {
+            key: item for key, item in self._values.items() if item[1] > now
+        }
+        self._last_sweep = now
+
+
+class RedisEphemeralStore:
+    """
+    Ephemeral store shared by every process, relying on Redis expiration.
+
+    :param get_redis: Function returning the Redis client to use.
+    """
+
+    def __init__(
+        self,
+        get_redis: Callable[[], Redis] = get_redis,
+        *,
+        key_prefix: str = "fief:ephemeral",
+    ) -> None:
+        self.get_redis = get_redis
+        self.key_prefix = key_prefix
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self.get_redis().set(self._get_key(key), value, ex=ttl_seconds)
+
+    async def get(self, key: str) -> str | None:
+        value = await self.get_redis().get(self._get_key(key))
+        return value.decode("utf-8") if value is not None else None
+
+    async def pop(self, key: str) -> str | None:
+        value = await self.get_redis().getdel(self._get_key(key))
+        return value.decode("utf-8") if value is not None else None
+
+    async def delete(self, key: str) -> None:
+        await self.get_redis().delete(self._get_key(key))
+
+    def _get_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+
+class NearCacheEphemeralStore:
+    """
+    Keep values read from another store in a small cache local to the process.
+
+    Values are cached for `ttl_seconds` at most, and the least recently used
+    ones are evicted beyond `max_size`.
+    Deleting a value through this store invalidates it in both layers;
+    other processes may still serve it from their cache until it expires.
+
+    :param store: The store to cache values from.
+    :param ttl_seconds: How long a value is cached. `0` disables the cache.
+    :param max_size: Maximum number of cached values.
+    """
+
+    def __init__(
+        self, store: EphemeralStore, *, ttl_seconds: float, max_size: int
+    ) -> None:
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._values: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._values.pop(key, None)
+        await self.store.set(key, value, ttl_seconds)
+
+    async def get(self, key: str) -> str | None:
+        item = self._values.get(key)
+        if item is not None:
+            cached_value, expires_at = item
+            if expires_at > time.monotonic():
+                self._values.move_to_end(key)
+                return cached_value
+            self._values.pop(key, None)
+
+        value = await self.store.get(key)
+        if value is not None and self.ttl_seconds > 0:
+            self._values[key] = (value, time.monotonic() + self.ttl_seconds)
+            if len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+        return value
+
+    async def pop(self, key: str) -> str | None:
+        self._values.pop(key, None)
+        return await self.store.pop(key)
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+        await self.store.delete(key)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+memory_ephemeral_store = MemoryEphemeralStore()
+redis_ephemeral_store = RedisEphemeralStore()
+near_cache_redis_ephemeral_store = NearCacheEphemeralStore(
+    redis_ephemeral_store,
+    ttl_seconds=settings.session_token_near_cache_ttl_seconds,
+    max_size=settings.session_token_near_cache_size,
+)
+
+
+def get_ephemeral_store() -> EphemeralStore | None:
+    """
+    Returns the configured ephemeral store,
+    or `None` if short-lived objects are kept in the database.
+    """
+    if settings.ephemeral_store == EphemeralStoreBackend.REDIS:
+        return redis_ephemeral_store
+    if settings.ephemeral_store == EphemeralStoreBackend.MEMORY:
+        return memory_ephemeral_store
+    return None
+
+
+def get_session_token_store() -> EphemeralStore | None:
+    """
+    Returns the configured store for session tokens,
+    or `None` if they are kept in the database.
+
+    Session tokens are read on most requests,
+    so Redis is fronted by a cache local to the process.
+    """
+    if settings.session_token_store == EphemeralStoreBackend.REDIS:
+        return near_cache_redis_ephemeral_store
+    if settings.session_token_store == EphemeralStoreBackend.MEMORY:
+        return memory_ephemeral_store
+    return None
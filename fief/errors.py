@@ -4,6 +4,10 @@ from enum import StrEnum
 class APIErrorCode(StrEnum):
     SERVER_DATABASE_NOT_AVAILABLE = "SERVER_DATABASE_NOT_AVAILABLE"
     SERVER_REDIS_NOT_AVAILABLE = "SERVER_REDIS_NOT_AVAILABLE"
+    SERVER_BUSY = "SERVER_BUSY"
+
+    PAGINATION_INVALID_CURSOR = "PAGINATION_INVALID_CURSOR"
+    PAGINATION_CURSOR_UNSUPPORTED_ORDERING = "PAGINATION_CURSOR_UNSUPPORTED_ORDERING"
 
     ACR_TOO_LOW = "ACR_TOO_LOW"
 
@@ -0,0 +1,154 @@
+import asyncio
+import concurrent.futures
+import dataclasses
+import multiprocessing
+import time
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any, ParamSpec, TypeVar
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from fief.errors import APIErrorCode
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class ExecutorMode(StrEnum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ExecutorBusyError(Exception):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        super().__init__(f"Executor {name} has reached its maximum pending calls.")
+
+
+@dataclasses.dataclass
+class ExecutorMetrics:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+    run_seconds_max: float = 0.0
+
+    def record(self, wait_seconds: float, run_seconds: float) -> None:
+        self.completed += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        self.run_seconds_total += run_seconds
+        self.run_seconds_max = max(self.run_seconds_max, run_seconds)
+
+
+def _timed_call(
+    func: Callable[..., T], args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[float, float, T]:
+    started_at = time.monotonic()
+    result = func(*args, **kwargs)
+    return started_at, time.monotonic(), result
+
+
+class BoundedExecutor:
+    """
+    Runs CPU-bound callables outside of the event loop.
+
+    Depending on the mode, callables are run in a thread pool, in a process pool
+    or directly on the event loop (`inline`, the historical behavior).
+    In `process` mode, callables and their arguments must be picklable.
+
+    The number of calls either running or waiting for a worker is capped
+    by `max_pending`. Beyond it, `ExecutorBusyError` is raised immediately,
+    so the caller fails fast instead of piling up requests.
+
+    :param name: Name of the executor, used in worker names and errors.
+    :param mode: Execution mode.
+    :param max_workers: Size of the pool. Defaults to the standard library default.
+    :param max_pending: Maximum number of in-flight calls. `0` means unbounded.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        mode: ExecutorMode,
+        *,
+        max_workers: int | None = None,
+        max_pending: int = 0,
+    ) -> None:
+        self.name = name
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.metrics = ExecutorMetrics()
+        self._executor: concurrent.futures.Executor | None = None
+
+    async def run(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        if self.max_pending > 0 and self.metrics.in_flight >= self.max_pending:
+            self.metrics.rejected += 1
+            raise ExecutorBusyError(self.name)
+
+        self.metrics.submitted += 1
+        self.metrics.in_flight += 1
+        submitted_at = time.monotonic()
+        try:
+            if self.mode == ExecutorMode.INLINE:
+                started_at, finished_at, result = _timed_call(func, args, kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                started_at, finished_at, result = await loop.run_in_executor(
+                    self._get_executor(), _timed_call, func, args, kwargs
+                )
+        except Exception:
+            self.metrics.failed += 1
+            raise
+        finally:
+            self.metrics.in_flight -= 1
+
+        self.metrics.record(
+            max(started_at - submitted_at, 0.0), finished_at - started_at
+        )
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            if self.mode == ExecutorMode.PROCESS:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # Forking a process running an event loop and threads is unsafe
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"fief-{self.name}",
+                )
+        return self._executor
+
+
+async def executor_busy_exception_handler(request: Request, exc: ExecutorBusyError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": APIErrorCode.SERVER_BUSY},
+        headers={"Retry-After": "1"},
+    )
+
+
+__all__ = [
+    "BoundedExecutor",
+    "ExecutorBusyError",
+    "ExecutorMetrics",
+    "ExecutorMode",
+    "executor_busy_exception_handler",
+]
@@ -5,8 +5,11 @@ from typing import Any, TypedDict
 from fastapi import FastAPI
 
 from fief import __version__, tasks
+from fief.crypto.jwt import crypto_executor
+from fief.crypto.password import password_executor
 from fief.db.main import create_main_async_session_maker, create_main_engine
 from fief.logger import init_logger, logger
+from fief.redis import close_redis
 from fief.services.posthog import get_server_id
 from fief.settings import settings
 
@@ -39,5 +42,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[LifespanState, None]:
     }
 
     await main_engine.dispose()
+    await close_redis()
+    crypto_executor.shutdown()
+    password_executor.shutdown()
 
     logger.info("Fief Server stopped")
@@ -1,6 +1,7 @@
 import json
 import logging
 import sys
+import threading
 import uuid
 from datetime import UTC
 from typing import TYPE_CHECKING, Literal
@@ -80,22 +81,87 @@ class AuditLogger:
 
 
 class AuditLogSink:
-    def __init__(self, task: "Actor") -> None:
-        self.task = task
+    """
+    Loguru sink sending audit records to be written in the database.
+
+    Records are buffered and sent in batches of at most `batch_size` records,
+    as soon as a batch is full or every `flush_interval_seconds`.
+    A background thread does the sending, so logging never waits on the broker.
+    Remaining records are sent when the sink is stopped,
+    which Loguru does when the sink is removed and on exit.
+    Records written afterwards are sent right away.
+    """
 
-    async def __call__(self, message: "Message"):
+    def __init__(
+        self,
+        task: "Actor",
+        *,
+        batch_size: int = settings.audit_log_batch_size,
+        flush_interval_seconds: float = settings.audit_log_flush_interval_seconds,
+    ) -> None:
+        self.task = task
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._records: list[str] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def write(self, message: "Message") -> None:
         record: Record = message.record
-        self.task.send(
-            json.dumps(
-                {
-                    "time": record["time"].astimezone(UTC).isoformat(),
-                    "level": record["level"].name,
-                    "message": record["message"],
-                    "extra": record["extra"],
-                },
-                cls=AuditLogSink.Encoder,
-            ),
+        serialized_record = json.dumps(
+            {
+                "time": record["time"].astimezone(UTC).isoformat(),
+                "level": record["level"].name,
+                "message": record["message"],
+                "extra": record["extra"],
+            },
+            cls=AuditLogSink.Encoder,
         )
+        with self._lock:
+            self._records.append(serialized_record)
+            pending = len(self._records)
+            stopped = self._stopped.is_set()
+            if not stopped:
+                self._start_thread()
+        # No background thread to send them anymore
+        if stopped:
+            self.send_records()
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+
+    def send_records(self) -> None:
+        with self._lock:
+            records, self._records = self._records, []
+
+        for i in range(0, len(records), self.batch_size):
+            batch = records[i : i + self.batch_size]
+            try:
+                self.task.send(batch)
+            except Exception:
+                logger.exception("Failed to send audit logs", count=len(batch))
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+        self.send_records()
+
+    def _start_thread(self) -> None:
+        # Threads don't survive a fork: start one in each process
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="fief-audit-log-sink", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            self.send_records()
 
     class Encoder(json.JSONEncoder):
         def default(self, obj):
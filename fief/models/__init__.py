@@ -14,6 +14,7 @@ from fief.models.oauth_account import OAuthAccount
 from fief.models.oauth_provider import OAuthProvider
 from fief.models.oauth_session import OAuthSession
 from fief.models.permission import Permission
+from fief.models.pooled_signing_key import PooledSigningKey
 from fief.models.refresh_token import RefreshToken
 from fief.models.registration_session import (
     RegistrationSession,
@@ -28,7 +29,7 @@ from fief.models.user_field import UserField, UserFieldConfiguration, UserFieldT
 from fief.models.user_field_value import UserFieldValue
 from fief.models.user_permission import UserPermission
 from fief.models.user_role import UserRole
-from fief.models.webhook import Webhook
+from fief.models.webhook import Webhook, WebhookSubscription
 from fief.models.webhook_log import WebhookLog
 
 __all__ = [
@@ -49,6 +50,7 @@ __all__ = [
     "OAuthProvider",
     "OAuthSession",
     "Permission",
+    "PooledSigningKey",
     "RefreshToken",
     "RegistrationSession",
     "RegistrationSessionFlow",
@@ -68,4 +70,5 @@ __all__ = [
     "UserRole",
     "Webhook",
     "WebhookLog",
+    "WebhookSubscription",
 ]
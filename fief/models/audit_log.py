@@ -30,7 +30,7 @@ class AuditLog(UUIDModel, Base):
     timestamp: Mapped[datetime] = mapped_column(
         TIMESTAMPAware(timezone=True), nullable=False, index=True
     )
-    level: Mapped[str] = mapped_column(String(length=255), nullable=False, index=True)
+    level: Mapped[str] = mapped_column(String(length=255), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     extra: Mapped[dict] = mapped_column(JSON, nullable=True)
 
@@ -39,14 +39,10 @@ class AuditLog(UUIDModel, Base):
     )
 
     object_id: Mapped[UUID4 | None] = mapped_column(GUID, nullable=True, index=True)
-    object_class: Mapped[str | None] = mapped_column(
-        String(length=255), nullable=True, index=True
-    )
+    object_class: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
 
-    admin_user_id: Mapped[UUID4 | None] = mapped_column(GUID, nullable=True, index=True)
-    admin_api_key_id: Mapped[UUID4 | None] = mapped_column(
-        GUID, nullable=True, index=True
-    )
+    admin_user_id: Mapped[UUID4 | None] = mapped_column(GUID, nullable=True)
+    admin_api_key_id: Mapped[UUID4 | None] = mapped_column(GUID, nullable=True)
 
     subject_user: Mapped[User | None] = relationship(
         "User",
@@ -8,7 +8,7 @@ from sqlalchemy import Boolean, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.sqltypes import JSON
 
-from fief.crypto.jwk import load_jwk
+from fief.crypto.jwk import jwk_cache
 from fief.models.base import TABLE_PREFIX, Base
 from fief.models.generics import GUID, CreatedUpdatedAt, UUIDModel
 from fief.models.tenant import Tenant
@@ -91,7 +91,7 @@ class Client(UUIDModel, CreatedUpdatedAt, Base):
     def get_encrypt_jwk(self) -> jwk.JWK | None:
         if self.encrypt_jwk is None:
             return None
-        return load_jwk(self.encrypt_jwk)
+        return jwk_cache.get(self.id, self.encrypt_jwk)
 
     def get_authorization_code_expires_at(self) -> datetime:
         return self._get_expires_at("authorization_code_lifetime_seconds")
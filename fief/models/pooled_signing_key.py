@@ -0,0 +1,19 @@
+from sqlalchemy import String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from fief.crypto.encryption import FernetEngine, StringEncryptedType
+from fief.crypto.jwk import SignatureAlgorithm
+from fief.models.base import Base
+from fief.models.generics import CreatedUpdatedAt, UUIDModel
+from fief.settings import settings
+
+
+class PooledSigningKey(UUIDModel, CreatedUpdatedAt, Base):
+    __tablename__ = "pooled_signing_keys"
+
+    algorithm: Mapped[SignatureAlgorithm] = mapped_column(
+        String(length=255), nullable=False, index=True
+    )
+    jwk: Mapped[str] = mapped_column(
+        StringEncryptedType(Text, settings.encryption_key, FernetEngine), nullable=False
+    )
@@ -1,14 +1,20 @@
-from typing import Any
+from datetime import UTC, datetime
+from typing import Any, TypedDict
 
 from fastapi import Request
 from jwcrypto import jwk
 from pydantic import UUID4
-from sqlalchemy import Boolean, Column, ForeignKey, String, Table, Text
+from sqlalchemy import JSON, Boolean, Column, ForeignKey, String, Table, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from starlette.datastructures import URL, URLPath
 from starlette.routing import Router
 
-from fief.crypto.jwk import generate_signature_jwk_string, load_jwk
+from fief.crypto.jwk import (
+    SignatureAlgorithm,
+    generate_signature_jwk_string,
+    get_signature_algorithm,
+    jwk_cache,
+)
 from fief.models.base import Base, get_prefixed_tablename
 from fief.models.email_domain import EmailDomain
 from fief.models.generics import GUID, CreatedUpdatedAt, PydanticUrlString, UUIDModel
@@ -34,6 +40,11 @@ TenantOAuthProvider = Table(
 )
 
 
+class PreviousSignJWK(TypedDict):
+    jwk: str
+    expires_at: int
+
+
 class Tenant(UUIDModel, CreatedUpdatedAt, Base):
     __tablename__ = "tenants"
 
@@ -43,6 +54,9 @@ class Tenant(UUIDModel, CreatedUpdatedAt, Base):
     sign_jwk: Mapped[str] = mapped_column(
         Text, nullable=False, default=generate_signature_jwk_string
     )
+    previous_sign_jwks: Mapped[list[PreviousSignJWK] | None] = mapped_column(
+        JSON, nullable=True, default=None
+    )
     registration_allowed: Mapped[bool] = mapped_column(
         Boolean, default=True, nullable=False
     )
@@ -76,7 +90,90 @@ class Tenant(UUIDModel, CreatedUpdatedAt, Base):
     email_domain: Mapped[EmailDomain | None] = relationship("EmailDomain")
 
     def get_sign_jwk(self) -> jwk.JWK:
-        return load_jwk(self.sign_jwk)
+        return jwk_cache.get(self.id, self.sign_jwk)
+
+    @property
+    def sign_algorithm(self) -> SignatureAlgorithm:
+        return get_signature_algorithm(self.get_sign_jwk())
+
+    @sign_algorithm.setter
+    def sign_algorithm(self, algorithm: SignatureAlgorithm) -> None:
+        if self.sign_jwk is None:
+            self.sign_jwk = generate_signature_jwk_string(algorithm)
+        elif algorithm != self.sign_algorithm:
+            self.rotate_sign_jwk(algorithm)
+
+    def get_previous_sign_jwks(self) -> list[jwk.JWK]:
+        """
+        Returns the retired signing keys still valid for verification.
+        """
+        now = int(datetime.now(UTC).timestamp())
+        return [
+            jwk_cache.get(self.id, previous_sign_jwk["jwk"])
+            for previous_sign_jwk in self.previous_sign_jwks or []
+            if previous_sign_jwk["expires_at"] > now
+        ]
+
+    def get_sign_jwk_set(self) -> jwk.JWKSet:
+        """
+        Returns the current signing key and the retired ones still valid.
+
+        Tokens signed with a retired key can still be verified,
+        allowing key rotation without invalidating issued tokens.
+        """
+        keyset = jwk.JWKSet()
+        keyset.add(self.get_sign_jwk())
+        for key in self.get_previous_sign_jwks():
+            keyset.add(key)
+        return keyset
+
+    def get_sign_algorithms(self) -> list[SignatureAlgorithm]:
+        algorithms = [self.sign_algorithm]
+        for key in self.get_previous_sign_jwks():
+            algorithm = get_signature_algorithm(key)
+            if algorithm not in algorithms:
+                algorithms.append(algorithm)
+        return algorithms
+
+    def rotate_sign_jwk(
+        self,
+        algorithm: SignatureAlgorithm | None = None,
+        overlap_seconds: int | None = None,
+        *,
+        sign_jwk: str | None = None,
+    ) -> None:
+        """
+        Replace the signing key by a new one.
+
+        The current one is kept for verification during `overlap_seconds`,
+        so tokens it signed remain valid until then.
+
+        :param algorithm: Algorithm of the new key. Defaults to the current one.
+        :param overlap_seconds: How long the current key remains published.
+            Defaults to the `SIGN_JWK_ROTATION_OVERLAP_SECONDS` setting.
+        :param sign_jwk: The new key. If not provided, it's generated.
+        """
+        if sign_jwk is None:
+            sign_jwk = generate_signature_jwk_string(
+                algorithm if algorithm is not None else self.sign_algorithm
+            )
+
+        if overlap_seconds is None:
+            overlap_seconds = settings.sign_jwk_rotation_overlap_seconds
+
+        now = int(datetime.now(UTC).timestamp())
+        previous_sign_jwks = [
+            previous_sign_jwk
+            for previous_sign_jwk in self.previous_sign_jwks or []
+            if previous_sign_jwk["expires_at"] > now
+        ]
+        if overlap_seconds > 0:
+            previous_sign_jwks.append(
+                {"jwk": self.sign_jwk, "expires_at": now + overlap_seconds}
+            )
+
+        self.previous_sign_jwks = previous_sign_jwks
+        self.sign_jwk = sign_jwk
 
     def get_host(self) -> str:
         host = f"https://{settings.fief_domain}"
@@ -1,5 +1,5 @@
 from pydantic import UUID4
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.schema import UniqueConstraint
 
@@ -12,7 +12,10 @@ from fief.models.user import User
 
 class UserPermission(UUIDModel, CreatedUpdatedAt, Base):
     __tablename__ = "user_permissions"
-    __table_args__ = (UniqueConstraint("user_id", "permission_id", "from_role_id"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "permission_id", "from_role_id"),
+        Index(None, "from_role_id", "permission_id"),
+    )
 
     user_id: Mapped[UUID4] = mapped_column(
         GUID, ForeignKey(User.id, ondelete="CASCADE"), nullable=False
@@ -1,5 +1,5 @@
 from pydantic import UUID4
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.schema import UniqueConstraint
 
@@ -11,7 +11,10 @@ from fief.models.user import User
 
 class UserRole(UUIDModel, CreatedUpdatedAt, Base):
     __tablename__ = "user_roles"
-    __table_args__ = (UniqueConstraint("user_id", "role_id"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "role_id"),
+        Index(None, "role_id", "user_id"),
+    )
 
     user_id: Mapped[UUID4] = mapped_column(
         GUID, ForeignKey(User.id, ondelete="CASCADE"), nullable=False
@@ -1,10 +1,11 @@
 import secrets
 
-from sqlalchemy import JSON, String
-from sqlalchemy.orm import Mapped, mapped_column
+from pydantic import UUID4
+from sqlalchemy import JSON, Boolean, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from fief.models.base import Base
-from fief.models.generics import CreatedUpdatedAt, PydanticUrlString, UUIDModel
+from fief.models.generics import GUID, CreatedUpdatedAt, PydanticUrlString, UUIDModel
 
 
 class Webhook(UUIDModel, CreatedUpdatedAt, Base):
@@ -17,7 +18,40 @@ class Webhook(UUIDModel, CreatedUpdatedAt, Base):
         String(length=255), default=secrets.token_urlsafe, nullable=False
     )
     events: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    batch: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    subscriptions: Mapped[list["WebhookSubscription"]] = relationship(
+        "WebhookSubscription", cascade="all, delete-orphan", lazy="selectin"
+    )
 
     def regenerate_secret(self) -> str:
         self.secret = secrets.token_urlsafe()
         return self.secret
+
+    @validates("events")
+    def _sync_subscriptions(self, key: str, events: list[str]) -> list[str]:
+        """
+        Keep the indexed subscriptions in sync with the `events` list,
+        so webhooks can be looked up by event type without scanning them all.
+        """
+        subscriptions = {
+            subscription.event: subscription for subscription in self.subscriptions
+        }
+        self.subscriptions = [
+            subscriptions.get(event, WebhookSubscription(event=event))
+            for event in dict.fromkeys(events)
+        ]
+        return events
+
+
+class WebhookSubscription(UUIDModel, CreatedUpdatedAt, Base):
+    __tablename__ = "webhook_subscriptions"
+    __table_args__ = (UniqueConstraint("event", "webhook_id"),)
+
+    event: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    webhook_id: Mapped[UUID4] = mapped_column(
+        GUID, ForeignKey(Webhook.id, ondelete="CASCADE"), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"WebhookSubscription(id={self.id}, event={self.event}, webhook_id={self.webhook_id})"
@@ -23,6 +23,7 @@ class WebhookLog(UUIDModel, CreatedUpdatedAt, Base):
     response: Mapped[str | None] = mapped_column(Text, nullable=True)
     error_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    batch_id: Mapped[UUID4 | None] = mapped_column(GUID, nullable=True)
 
     webhook: Mapped[Webhook] = relationship("Webhook")
 
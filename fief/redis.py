@@ -0,0 +1,51 @@
+import asyncio
+import weakref
+from typing import Any
+from urllib.parse import urlparse
+
+from redis.asyncio import Redis
+
+from fief.settings import settings
+
+
+def get_redis_connection_parameters() -> dict[str, Any]:
+    redis_parameters = urlparse(settings.redis_url)
+    return {
+        "host": redis_parameters.hostname,
+        "port": redis_parameters.port,
+        "username": redis_parameters.username,
+        "password": redis_parameters.password,
+        # Heroku Redis with TLS use self-signed certs, so we need to tinker a bit
+        "ssl": redis_parameters.scheme == "rediss",
+        "ssl_cert_reqs": None,
+    }
+
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_redis() -> Redis:
+    """
+    Returns an asynchronous Redis client for the running event loop.
+
+    Connections can't be shared between event loops,
+    and each worker runtime runs its own, besides the one of the server.
+    The client should be closed with `close_redis` before the loop is.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = Redis(**get_redis_connection_parameters())
+        _clients[loop] = client
+    return client
+
+
+async def close_redis() -> None:
+    """
+    Close the Redis client of the running event loop, if any.
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -13,6 +13,7 @@ from fief.repositories.oauth_account import OAuthAccountRepository
 from fief.repositories.oauth_provider import OAuthProviderRepository
 from fief.repositories.oauth_session import OAuthSessionRepository
 from fief.repositories.permission import PermissionRepository
+from fief.repositories.pooled_signing_key import PooledSigningKeyRepository
 from fief.repositories.refresh_token import RefreshTokenRepository
 from fief.repositories.registration_session import RegistrationSessionRepository
 from fief.repositories.role import RoleRepository
@@ -41,6 +42,7 @@ __all__ = [
     "OAuthProviderRepository",
     "OAuthSessionRepository",
     "PermissionRepository",
+    "PooledSigningKeyRepository",
     "RefreshTokenRepository",
     "RegistrationSessionRepository",
     "RoleRepository",
@@ -1,12 +1,33 @@
-from sqlalchemy import select
+from typing import Any
 
+from sqlalchemy import insert, select
+
+from fief.db.unit_of_work import commit
 from fief.models import AuditLog
-from fief.repositories.base import BaseRepository, UUIDRepositoryMixin
+from fief.repositories.base import (
+    BaseRepository,
+    LogRepositoryMixin,
+    UUIDRepositoryMixin,
+)
 
 
-class AuditLogRepository(BaseRepository[AuditLog], UUIDRepositoryMixin[AuditLog]):
+class AuditLogRepository(
+    BaseRepository[AuditLog],
+    UUIDRepositoryMixin[AuditLog],
+    LogRepositoryMixin[AuditLog],
+):
     model = AuditLog
+    timestamp_column = "timestamp"
 
     async def get_latest(self) -> AuditLog | None:
         statement = select(AuditLog).order_by(AuditLog.timestamp.desc()).limit(1)
         return await self.get_one_or_none(statement)
+
+    async def create_many_from_values(self, values: list[dict[str, Any]]) -> None:
+        """
+        Insert audit logs in bulk, in a single transaction.
+        """
+        if not values:
+            return
+        await self.session.execute(insert(AuditLog), values)
+        await commit(self.session)
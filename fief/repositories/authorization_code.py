@@ -20,6 +20,23 @@ class AuthorizationCodeRepository(
         )
         return await self.get_one_or_none(statement)
 
+    async def pop_valid_by_code(self, code: str) -> AuthorizationCode | None:
+        """
+        Get a valid authorization code and delete it, so it can be used only once.
+        """
+        statement = (
+            select(AuthorizationCode)
+            .where(
+                AuthorizationCode.code == code,
+                AuthorizationCode.expires_at > datetime.now(UTC),
+            )
+            .with_for_update()
+        )
+        authorization_code = await self.get_one_or_none(statement)
+        if authorization_code is not None:
+            await self.delete(authorization_code)
+        return authorization_code
+
     async def get_by_code(self, code: str) -> AuthorizationCode | None:
         statement = select(AuthorizationCode).where(AuthorizationCode.code == code)
         return await self.get_one_or_none(statement)
@@ -1,14 +1,16 @@
 from collections.abc import Sequence
+from datetime import datetime
 from typing import Any, Generic, Protocol, TypeVar, cast
 
 from fastapi import Depends
 from pydantic import UUID4
-from sqlalchemy import delete, func, over, select
+from sqlalchemy import and_, delete, func, inspect, or_, over, select
 from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute, RelationshipProperty, contains_eager
 from sqlalchemy.sql import Executable, Select
 
+from fief.db.unit_of_work import commit
 from fief.dependencies.db import get_main_async_session
 from fief.models.generics import M_EXPIRES_AT, M_UUID, M
 
@@ -58,7 +60,33 @@ class UUIDRepositoryProtocol(BaseRepositoryProtocol, Protocol[M_UUID]):
 class ExpiresAtRepositoryProtocol(BaseRepositoryProtocol, Protocol[M_EXPIRES_AT]):
     model: type[M_EXPIRES_AT]
 
-    async def delete_expired(self) -> None: ...  # pragma: no cover
+    async def delete_expired(self, limit: int) -> int: ...  # pragma: no cover
+
+
+class KeysetPaginationRepositoryProtocol(UUIDRepositoryProtocol, Protocol[M_UUID]):
+    model: type[M_UUID]
+
+    async def paginate_keyset(
+        self,
+        statement: Select,
+        limit: int,
+        key: tuple[datetime, UUID4] | None,
+        *,
+        backwards: bool = False,
+        descending: bool = False,
+        with_count: bool = True,
+    ) -> tuple[list[M_UUID], int | None, bool]: ...  # pragma: no cover
+
+    async def _count(self, statement: Select) -> int: ...  # pragma: no cover
+
+
+class LogRepositoryProtocol(UUIDRepositoryProtocol, Protocol[M_UUID]):
+    model: type[M_UUID]
+    timestamp_column: str
+
+    async def delete_before(
+        self, cutoff: datetime, limit: int
+    ) -> int: ...  # pragma: no cover
 
 
 class BaseRepository(BaseRepositoryProtocol, Generic[M]):
@@ -134,20 +162,20 @@ class BaseRepository(BaseRepositoryProtocol, Generic[M]):
 
     async def create(self, object: M) -> M:
         self.session.add(object)
-        await self.session.commit()
+        await commit(self.session)
         return object
 
     async def update(self, object: M) -> None:
         self.session.add(object)
-        await self.session.commit()
+        await commit(self.session)
 
     async def delete(self, object: M) -> None:
         await self.session.delete(object)
-        await self.session.commit()
+        await commit(self.session)
 
     async def create_many(self, objects: list[M]) -> list[M]:
         self.session.add_all(objects)
-        await self.session.commit()
+        await commit(self.session)
         return objects
 
     async def list(self, statement: Select) -> list[M]:
@@ -166,7 +194,7 @@ class BaseRepository(BaseRepositoryProtocol, Generic[M]):
 
     async def _execute_statement(self, statement: Executable) -> Result:
         result = await self.session.execute(statement)
-        await self.session.commit()
+        await commit(self.session)
         return result
 
 
@@ -184,10 +212,114 @@ class UUIDRepositoryMixin(Generic[M_UUID]):
         return await self.get_one_or_none(statement)
 
 
+class KeysetPaginationMixin(Generic[M_UUID]):
+    async def paginate_keyset(
+        self: KeysetPaginationRepositoryProtocol[M_UUID],
+        statement: Select,
+        limit: int,
+        key: tuple[datetime, UUID4] | None,
+        *,
+        backwards: bool = False,
+        descending: bool = False,
+        with_count: bool = True,
+    ) -> tuple[list[M_UUID], int | None, bool]:
+        """
+        Paginate by `(created_at, id)`, starting after the `key` object,
+        or ending before it if `backwards` is set.
+
+        Unlike `paginate`, the cost of a page doesn't depend on its position.
+
+        Returns the objects of the page, the total count if `with_count` is set,
+        and whether there are more objects beyond the page.
+        """
+        created_at = getattr(self.model, "created_at")
+        id = self.model.id
+        count = await self._count(statement) if with_count else None
+
+        reverse = descending != backwards
+        if key is not None:
+            key_created_at, key_id = key
+            # Written as a range on `created_at`, so its index can be used
+            if reverse:
+                statement = statement.where(
+                    and_(
+                        created_at <= key_created_at,
+                        or_(created_at < key_created_at, id < key_id),
+                    )
+                )
+            else:
+                statement = statement.where(
+                    and_(
+                        created_at >= key_created_at,
+                        or_(created_at > key_created_at, id > key_id),
+                    )
+                )
+        statement = (
+            statement.order_by(None)
+            .order_by(
+                *(
+                    column.desc() if reverse else column.asc()
+                    for column in (created_at, id)
+                )
+            )
+            .limit(limit + 1)
+        )
+
+        objects = await self.list(statement)
+        has_more = len(objects) > limit
+        objects = objects[:limit]
+        if backwards:
+            objects.reverse()
+        return objects, count, has_more
+
+
+class LogRepositoryMixin(Generic[M_UUID]):
+    async def delete_before(
+        self: LogRepositoryProtocol[M_UUID], cutoff: datetime, limit: int
+    ) -> int:
+        """
+        Delete at most `limit` rows older than `cutoff`.
+
+        Returns the number of deleted rows.
+        """
+        timestamp_column = getattr(self.model, self.timestamp_column)
+        statement = select(self.model.id).where(timestamp_column < cutoff).limit(limit)
+        result = await self._execute_query(statement)
+        ids = result.scalars().all()
+        if ids:
+            await self._execute_statement(
+                delete(self.model).where(self.model.id.in_(ids))
+            )
+        return len(ids)
+
+
 class ExpiresAtMixin(Generic[M_EXPIRES_AT]):
-    async def delete_expired(self: ExpiresAtRepositoryProtocol[M_EXPIRES_AT]):
-        statement = delete(self.model).where(self.model.is_expired.is_(True))
-        await self._execute_statement(statement)
+    async def delete_expired(
+        self: ExpiresAtRepositoryProtocol[M_EXPIRES_AT], limit: int
+    ) -> int:
+        """
+        Delete at most `limit` expired rows, by primary key.
+
+        Rows locked by another transaction are skipped,
+        so the deletion doesn't wait on rows being used.
+
+        Returns the number of deleted rows.
+        """
+        (primary_key,) = inspect(self.model, raiseerr=True).primary_key
+        statement = (
+            select(primary_key)
+            .where(self.model.is_expired.is_(True))
+            .order_by(self.model.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._execute_query(statement)
+        ids = result.scalars().all()
+        if ids:
+            await self._execute_statement(
+                delete(self.model).where(primary_key.in_(ids))
+            )
+        return len(ids)
 
 
 REPOSITORY = TypeVar("REPOSITORY", bound=BaseRepository)
@@ -0,0 +1,316 @@
+import json
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, Generic
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import RelationshipDirection
+
+from fief.ephemeral_store import (
+    EphemeralStore,
+    get_ephemeral_store,
+    get_session_token_store,
+)
+from fief.models import (
+    AdminSessionToken,
+    AuthorizationCode,
+    LoginSession,
+    OAuthSession,
+    RegistrationSession,
+    SessionToken,
+)
+from fief.models.generics import ExpiresAt, M
+from fief.repositories.admin_session_token import AdminSessionTokenRepository
+from fief.repositories.authorization_code import AuthorizationCodeRepository
+from fief.repositories.base import BaseRepository
+from fief.repositories.login_session import LoginSessionRepository
+from fief.repositories.oauth_session import OAuthSessionRepository
+from fief.repositories.registration_session import RegistrationSessionRepository
+from fief.repositories.session_token import SessionTokenRepository
+from fief.settings import settings
+
+# Values are serialized like they would be for SQLite, i.e. as JSON-friendly strings
+_dialect = sqlite.dialect()
+
+
+def dump_object(object: Any) -> str:
+    values: dict[str, Any] = {}
+    for column in object.__table__.columns:
+        value = getattr(object, column.key)
+        if isinstance(value, datetime):
+            value = value.astimezone(UTC)
+        processor = column.type.dialect_impl(_dialect).bind_processor(_dialect)
+        if value is not None and processor is not None:
+            value = processor(value)
+        values[column.key] = value
+    return json.dumps(values)
+
+
+def load_object(model: type[M], data: str) -> M:
+    values = json.loads(data)
+    object = model()
+    for column in model.__table__.columns:  # type: ignore[attr-defined]
+        value = values.get(column.key)
+        processor = column.type.dialect_impl(_dialect).result_processor(_dialect, None)
+        if value is not None and processor is not None:
+            value = processor(value)
+        setattr(object, column.key, value)
+    return object
+
+
+class EphemeralRepositoryMixin(Generic[M]):
+    """
+    Keep short-lived objects in an ephemeral store instead of the database.
+
+    Objects are stored under the value of their `key_attribute`,
+    until they expire.
+    Related objects, like the client, are loaded from the database.
+    Objects without expiration are kept for `lifetime_seconds`.
+    """
+
+    model: type[M]
+    session: AsyncSession
+    key_attribute: str
+    lifetime_seconds: int | None = None
+    store: EphemeralStore
+
+    async def _store(self, object: M) -> M:
+        for column in object.__table__.columns:  # type: ignore[attr-defined]
+            if getattr(object, column.key) is None and column.default is not None:
+                default = column.default
+                value = default.arg(None) if default.is_callable else default.arg
+                setattr(object, column.key, value)
+
+        # Foreign keys are only set from related objects when flushed
+        mapper = object.__mapper__  # type: ignore[attr-defined]
+        for relationship in mapper.relationships:
+            if relationship.direction != RelationshipDirection.MANYTOONE:
+                continue
+            related_object = object.__dict__.get(relationship.key)
+            if related_object is not None:
+                for local_column, remote_column in relationship.local_remote_pairs:
+                    setattr(
+                        object,
+                        local_column.key,
+                        getattr(related_object, remote_column.key),
+                    )
+
+        await self.store.set(
+            self._get_key(getattr(object, self.key_attribute)),
+            dump_object(object),
+            self._get_ttl_seconds(object),
+        )
+        return object
+
+    def _get_ttl_seconds(self, object: M) -> int:
+        if isinstance(object, ExpiresAt):
+            # Expired objects are kept as long as the cleanup task would keep them,
+            # so they can still be told apart from unknown ones.
+            expires_in = (object.expires_at - datetime.now(UTC)).total_seconds()
+            return max(int(expires_in), 0) + settings.cleanup_interval_minutes * 60
+        assert self.lifetime_seconds is not None
+        return self.lifetime_seconds
+
+    async def _load(self, data: str | None) -> M | None:
+        if data is None:
+            return None
+        object = load_object(self.model, data)
+        mapper = object.__mapper__  # type: ignore[attr-defined]
+        for relationship in mapper.relationships:
+            if relationship.direction != RelationshipDirection.MANYTOONE:
+                continue
+            (local_column,) = relationship.local_columns
+            related_id = getattr(object, local_column.key)
+            if related_id is None:
+                continue
+            related_object = await self.session.get(
+                relationship.mapper.class_, related_id
+            )
+            if related_object is None:
+                return None
+            setattr(object, relationship.key, related_object)
+        return object
+
+    def _get_key(self, value: str) -> str:
+        return f"{self.model.__tablename__}:{value}"  # type: ignore[attr-defined]
+
+
+class EphemeralAuthorizationCodeRepository(
+    EphemeralRepositoryMixin[AuthorizationCode], AuthorizationCodeRepository
+):
+    key_attribute = "code"
+
+    def __init__(self, session: AsyncSession, store: EphemeralStore) -> None:
+        super().__init__(session)
+        self.store = store
+
+    async def create(self, object: AuthorizationCode) -> AuthorizationCode:
+        return await self._store(object)
+
+    async def get_by_code(self, code: str) -> AuthorizationCode | None:
+        return await self._load(await self.store.get(self._get_key(code)))
+
+    async def get_valid_by_code(self, code: str) -> AuthorizationCode | None:
+        authorization_code = await self.get_by_code(code)
+        if authorization_code is None or authorization_code.is_expired:
+            return None
+        return authorization_code
+
+    async def pop_valid_by_code(self, code: str) -> AuthorizationCode | None:
+        authorization_code = await self._load(await self.store.pop(self._get_key(code)))
+        if authorization_code is None or authorization_code.is_expired:
+            return None
+        return authorization_code
+
+    async def delete(self, object: AuthorizationCode) -> None:
+        await self.store.delete(self._get_key(object.code))
+
+
+class EphemeralLoginSessionRepository(
+    EphemeralRepositoryMixin[LoginSession], LoginSessionRepository
+):
+    key_attribute = "token"
+
+    def __init__(self, session: AsyncSession, store: EphemeralStore) -> None:
+        super().__init__(session)
+        self.store = store
+
+    async def create(self, object: LoginSession) -> LoginSession:
+        return await self._store(object)
+
+    async def get_by_token(
+        self, token: str, *, fresh: bool = True
+    ) -> LoginSession | None:
+        login_session = await self._load(await self.store.get(self._get_key(token)))
+        if login_session is None or (fresh and login_session.is_expired):
+            return None
+        return login_session
+
+    async def delete(self, object: LoginSession) -> None:
+        await self.store.delete(self._get_key(object.token))
+
+
+class EphemeralOAuthSessionRepository(
+    EphemeralRepositoryMixin[OAuthSession], OAuthSessionRepository
+):
+    key_attribute = "token"
+
+    def __init__(self, session: AsyncSession, store: EphemeralStore) -> None:
+        super().__init__(session)
+        self.store = store
+
+    async def create(self, object: OAuthSession) -> OAuthSession:
+        return await self._store(object)
+
+    async def update(self, object: OAuthSession) -> None:
+        await self._store(object)
+
+    async def get_by_token(
+        self, token: str, *, fresh: bool = True
+    ) -> OAuthSession | None:
+        oauth_session = await self._load(await self.store.get(self._get_key(token)))
+        if oauth_session is None or (fresh and oauth_session.is_expired):
+            return None
+        return oauth_session
+
+    async def delete(self, object: OAuthSession) -> None:
+        await self.store.delete(self._get_key(object.token))
+
+
+class EphemeralRegistrationSessionRepository(
+    EphemeralRepositoryMixin[RegistrationSession], RegistrationSessionRepository
+):
+    key_attribute = "token"
+
+    def __init__(self, session: AsyncSession, store: EphemeralStore) -> None:
+        super().__init__(session)
+        self.store = store
+
+    async def create(self, object: RegistrationSession) -> RegistrationSession:
+        return await self._store(object)
+
+    async def update(self, object: RegistrationSession) -> None:
+        await self._store(object)
+
+    async def get_by_token(
+        self, token: str, *, fresh: bool = True
+    ) -> RegistrationSession | None:
+        registration_session = await self._load(
+            await self.store.get(self._get_key(token))
+        )
+        if registration_session is None or (fresh and registration_session.is_expired):
+            return None
+        return registration_session
+
+    async def delete(self, object: RegistrationSession) -> None:
+        await self.store.delete(self._get_key(object.token))
+
+
+class EphemeralSessionTokenRepository(
+    EphemeralRepositoryMixin[SessionToken], SessionTokenRepository
+):
+    key_attribute = "token"
+
+    def __init__(self, session: AsyncSession, store: EphemeralStore) -> None:
+        super().__init__(session)
+        self.store = store
+
+    async def create(self, object: SessionToken) -> SessionToken:
+        return await self._store(object)
+
+    async def get_by_token(
+        self, token: str, *, fresh: bool = True
+    ) -> SessionToken | None:
+        session_token = await self._load(await self.store.get(self._get_key(token)))
+        if session_token is None or (fresh and session_token.is_expired):
+            return None
+        return session_token
+
+    async def delete(self, object: SessionToken) -> None:
+        await self.store.delete(self._get_key(object.token))
+
+
+class EphemeralAdminSessionTokenRepository(
+    EphemeralRepositoryMixin[AdminSessionToken], AdminSessionTokenRepository
+):
+    key_attribute = "token"
+    lifetime_seconds = settings.session_lifetime_seconds
+
+    def __init__(self, session: AsyncSession, store: EphemeralStore) -> None:
+        super().__init__(session)
+        self.store = store
+
+    async def create(self, object: AdminSessionToken) -> AdminSessionToken:
+        return await self._store(object)
+
+    async def get_by_token(self, token: str) -> AdminSessionToken | None:
+        return await self._load(await self.store.get(self._get_key(token)))
+
+    async def delete(self, object: AdminSessionToken) -> None:
+        await self.store.delete(self._get_key(object.token))
+
+
+ephemeral_repository_classes: dict[
+    type[BaseRepository],
+    tuple[type[BaseRepository], Callable[[], EphemeralStore | None]],
+] = {
+    AuthorizationCodeRepository: (
+        EphemeralAuthorizationCodeRepository,
+        get_ephemeral_store,
+    ),
+    LoginSessionRepository: (EphemeralLoginSessionRepository, get_ephemeral_store),
+    OAuthSessionRepository: (EphemeralOAuthSessionRepository, get_ephemeral_store),
+    RegistrationSessionRepository: (
+        EphemeralRegistrationSessionRepository,
+        get_ephemeral_store,
+    ),
+    SessionTokenRepository: (
+        EphemeralSessionTokenRepository,
+        get_session_token_store,
+    ),
+    AdminSessionTokenRepository: (
+        EphemeralAdminSessionTokenRepository,
+        get_session_token_store,
+    ),
+}
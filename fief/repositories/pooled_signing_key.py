@@ -0,0 +1,46 @@
+from typing import cast
+
+from sqlalchemy import CursorResult, delete, select
+
+from fief.crypto.jwk import SignatureAlgorithm
+from fief.models import PooledSigningKey
+from fief.repositories.base import BaseRepository, UUIDRepositoryMixin
+
+
+class PooledSigningKeyRepository(
+    BaseRepository[PooledSigningKey], UUIDRepositoryMixin[PooledSigningKey]
+):
+    model = PooledSigningKey
+
+    async def count_by_algorithm(self, algorithm: SignatureAlgorithm) -> int:
+        statement = select(PooledSigningKey).where(
+            PooledSigningKey.algorithm == algorithm
+        )
+        return await self._count(statement)
+
+    async def pop(self, algorithm: SignatureAlgorithm) -> str | None:
+        """
+        Remove the oldest pooled key for the algorithm and return it.
+
+        The key is claimed by deleting its row: if a concurrent request
+        deleted it first, we try with the next one.
+        """
+        statement = (
+            select(PooledSigningKey)
+            .where(PooledSigningKey.algorithm == algorithm)
+            .order_by(PooledSigningKey.created_at)
+            .limit(1)
+        )
+        while (pooled_signing_key := await self.get_one_or_none(statement)) is not None:
+            self.session.expunge(pooled_signing_key)
+            result = cast(
+                CursorResult,
+                await self._execute_statement(
+                    delete(PooledSigningKey).where(
+                        PooledSigningKey.id == pooled_signing_key.id
+                    )
+                ),
+            )
+            if result.rowcount == 1:
+                return pooled_signing_key.jwk
+        return None
@@ -2,10 +2,16 @@ from pydantic import UUID4
 from sqlalchemy import select
 
 from fief.models import User
-from fief.repositories.base import BaseRepository, UUIDRepositoryMixin
+from fief.repositories.base import (
+    BaseRepository,
+    KeysetPaginationMixin,
+    UUIDRepositoryMixin,
+)
 
 
-class UserRepository(BaseRepository[User], UUIDRepositoryMixin[User]):
+class UserRepository(
+    BaseRepository[User], UUIDRepositoryMixin[User], KeysetPaginationMixin[User]
+):
     model = User
 
     async def list_by_ids(self, ids: list[UUID4]) -> list[User]:
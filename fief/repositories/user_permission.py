@@ -1,8 +1,11 @@
+from collections.abc import Sequence
+
 from pydantic import UUID4
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import joinedload
 from sqlalchemy.sql import Select
 
+from fief.db.unit_of_work import commit
 from fief.models import UserPermission
 from fief.repositories.base import BaseRepository, UUIDRepositoryMixin
 
@@ -49,20 +52,71 @@ class UserPermissionRepository(
 
         return await self.get_one_or_none(statement)
 
-    async def delete_by_user_and_role(self, user: UUID4, from_role: UUID4) -> None:
-        statement = delete(UserPermission).where(
-            UserPermission.user_id == user, UserPermission.from_role_id == from_role
-        )
-        await self._execute_statement(statement)
+    async def create_from_role(
+        self, from_role: UUID4, users: Sequence[UUID4], permissions: Sequence[UUID4]
+    ) -> int:
+        """
+        Grant permissions from a role to users in a single bulk insert.
 
-    async def delete_by_permission_and_role(
-        self, permission: UUID4, from_role: UUID4
-    ) -> None:
-        statement = delete(UserPermission).where(
-            UserPermission.permission_id == permission,
+        Permissions the users already have from this role are skipped,
+        so it's safe to run it again on the same users.
+        Returns the number of created user permissions.
+        """
+        if not users or not permissions:
+            return 0
+
+        existing_statement = select(
+            UserPermission.user_id, UserPermission.permission_id
+        ).where(
             UserPermission.from_role_id == from_role,
+            UserPermission.user_id.in_(users),
+            UserPermission.permission_id.in_(permissions),
         )
-        await self._execute_statement(statement)
+        existing = set((await self._execute_query(existing_statement)).tuples())
+
+        values = [
+            {"user_id": user, "permission_id": permission, "from_role_id": from_role}
+            for user in users
+            for permission in permissions
+            if (user, permission) not in existing
+        ]
+        if values:
+            await self.session.execute(insert(UserPermission), values)
+            await commit(self.session)
+
+        return len(values)
+
+    async def delete_from_role(
+        self,
+        from_role: UUID4,
+        *,
+        users: Sequence[UUID4] | None = None,
+        permissions: Sequence[UUID4] | None = None,
+        limit: int,
+    ) -> int:
+        """
+        Delete at most `limit` user permissions granted from a role.
+
+        Returns the number of deleted user permissions:
+        call it until it returns `0` to delete them all.
+        """
+        statement = (
+            select(UserPermission.id)
+            .where(UserPermission.from_role_id == from_role)
+            .limit(limit)
+        )
+        if users is not None:
+            statement = statement.where(UserPermission.user_id.in_(users))
+        if permissions is not None:
+            statement = statement.where(UserPermission.permission_id.in_(permissions))
+
+        ids = (await self._execute_query(statement)).scalars().all()
+        if ids:
+            await self._execute_statement(
+                delete(UserPermission).where(UserPermission.id.in_(ids))
+            )
+
+        return len(ids)
 
     async def delete_by_role(self, from_role: UUID4) -> None:
         statement = delete(UserPermission).where(
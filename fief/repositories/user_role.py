@@ -26,5 +26,18 @@ class UserRoleRepository(BaseRepository[UserRole], UUIDRepositoryMixin[UserRole]
             .options(joinedload(UserRole.role))
         )
 
-    async def get_by_role(self, role: UUID4) -> list[UserRole]:
-        return await self.list(select(UserRole).where(UserRole.role_id == role))
+    async def get_user_ids_by_role(
+        self, role: UUID4, *, after: UUID4 | None = None, limit: int
+    ) -> list[UUID4]:
+        statement = (
+            select(UserRole.user_id)
+            .where(UserRole.role_id == role)
+            .order_by(UserRole.user_id)
+            .limit(limit)
+        )
+
+        if after is not None:
+            statement = statement.where(UserRole.user_id > after)
+
+        result = await self._execute_query(statement)
+        return list(result.scalars().all())
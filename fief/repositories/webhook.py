@@ -1,6 +1,25 @@
-from fief.models import Webhook
+from pydantic import UUID4
+from sqlalchemy import select
+
+from fief.models import Webhook, WebhookSubscription
 from fief.repositories.base import BaseRepository, UUIDRepositoryMixin
 
 
 class WebhookRepository(BaseRepository[Webhook], UUIDRepositoryMixin[Webhook]):
     model = Webhook
+
+    async def list_by_ids(self, ids: list[UUID4]) -> list[Webhook]:
+        statement = select(Webhook).where(Webhook.id.in_(ids))
+        return await self.list(statement)
+
+    async def get_subscribers_by_event(self, event: str) -> list[tuple[UUID4, bool]]:
+        """
+        Returns the id and batch mode of the webhooks subscribed to an event.
+        """
+        statement = (
+            select(Webhook.id, Webhook.batch)
+            .join(WebhookSubscription, WebhookSubscription.webhook_id == Webhook.id)
+            .where(WebhookSubscription.event == event)
+        )
+        result = await self._execute_query(statement)
+        return [(id, batch) for id, batch in result.tuples()]
@@ -3,11 +3,22 @@ import uuid
 from sqlalchemy import select
 
 from fief.models import WebhookLog
-from fief.repositories.base import BaseRepository, UUIDRepositoryMixin
+from fief.repositories.base import (
+    BaseRepository,
+    KeysetPaginationMixin,
+    LogRepositoryMixin,
+    UUIDRepositoryMixin,
+)
 
 
-class WebhookLogRepository(BaseRepository[WebhookLog], UUIDRepositoryMixin[WebhookLog]):
+class WebhookLogRepository(
+    BaseRepository[WebhookLog],
+    UUIDRepositoryMixin[WebhookLog],
+    LogRepositoryMixin[WebhookLog],
+    KeysetPaginationMixin[WebhookLog],
+):
     model = WebhookLog
+    timestamp_column = "created_at"
 
     async def get_by_id_and_webhook(
         self, id: uuid.UUID, webhook: uuid.UUID
@@ -1,14 +1,20 @@
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from fief import tasks
+from fief.settings import settings
 
 
 def schedule():
     scheduler = BlockingScheduler()
     scheduler.add_job(
         tasks.cleanup.send,
-        CronTrigger.from_crontab("0 0 * * *"),
+        IntervalTrigger(minutes=settings.cleanup_interval_minutes),
+    )
+    scheduler.add_job(
+        tasks.replenish_signing_keys.send,
+        CronTrigger.from_crontab("*/15 * * * *"),
     )
     scheduler.add_job(
         tasks.heartbeat.send,
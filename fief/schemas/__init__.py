@@ -3,6 +3,7 @@ from fief.schemas import (
     client,
     email_template,
     generics,
+    metrics,
     oauth_account,
     oauth_provider,
     permission,
@@ -22,6 +23,7 @@ __all__ = [
     "client",
     "email_template",
     "generics",
+    "metrics",
     "oauth_account",
     "oauth_provider",
     "permission",
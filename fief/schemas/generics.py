@@ -26,8 +26,10 @@ class CreatedUpdatedAt(BaseModel):
 
 
 class PaginatedResults(BaseModel, Generic[PM]):
-    count: int
+    count: int | None
     results: list[PM]
+    next: str | None = None
+    prev: str | None = None
 
 
 NonEmptyString = Annotated[str, StringConstraints(min_length=1)]
@@ -0,0 +1,25 @@
+from fief.schemas.generics import BaseModel
+
+
+class ExecutorMetrics(BaseModel):
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    in_flight: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    run_seconds_total: float
+    run_seconds_max: float
+
+
+class Executor(BaseModel):
+    name: str
+    mode: str
+    max_workers: int | None
+    max_pending: int
+    metrics: ExecutorMetrics
+
+
+class Metrics(BaseModel):
+    executors: list[Executor]
@@ -1,5 +1,6 @@
-from pydantic import UUID4, HttpUrl
+from pydantic import UUID4, Field, HttpUrl
 
+from fief.crypto.jwk import SignatureAlgorithm
 from fief.schemas.generics import BaseModel, CreatedUpdatedAt, UUIDSchema
 from fief.schemas.oauth_provider import OAuthProviderEmbedded
 
@@ -11,6 +12,7 @@ class TenantCreate(BaseModel):
     logo_url: HttpUrl | None = None
     application_url: HttpUrl | None = None
     oauth_providers: list[UUID4] | None = None
+    sign_algorithm: SignatureAlgorithm = SignatureAlgorithm.RS256
 
 
 class TenantUpdate(BaseModel):
@@ -32,8 +34,14 @@ class BaseTenant(UUIDSchema, CreatedUpdatedAt):
     application_url: HttpUrl | None = None
 
 
+class TenantSigningKeyCreate(BaseModel):
+    algorithm: SignatureAlgorithm | None = None
+    overlap_seconds: int | None = Field(default=None, ge=0)
+
+
 class Tenant(BaseTenant):
     oauth_providers: list[OAuthProviderEmbedded]
+    sign_algorithm: SignatureAlgorithm
 
 
 class TenantEmbedded(BaseTenant):
@@ -14,16 +14,19 @@ WebhookEventType = StrEnum(  # type: ignore
 class WebhookCreate(BaseModel):
     url: HttpUrl
     events: list[WebhookEventType]
+    batch: bool = False
 
 
 class WebhookUpdate(BaseModel):
     url: HttpUrl | None = None
     events: list[WebhookEventType] | None = None
+    batch: bool | None = None
 
 
 class BaseWebhook(UUIDSchema, CreatedUpdatedAt):
     url: HttpUrl
     events: list[WebhookEventType]
+    batch: bool
 
 
 class Webhook(BaseWebhook):
@@ -13,6 +13,7 @@ class BaseWebhookLog(UUIDSchema, CreatedUpdatedAt):
     response: str | None = None
     error_type: str | None = None
     error_message: str | None = None
+    batch_id: UUID4 | None = None
 
 
 class WebhookLog(BaseWebhookLog):
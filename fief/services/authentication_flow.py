@@ -195,7 +195,7 @@ class AuthenticationFlow:
 
         if login_session.response_type in ["code token", "code id_token token"]:
             permissions = await self.get_user_permissions(user)
-            access_token = generate_access_token(
+            access_token = await generate_access_token(
                 tenant.get_sign_jwk(),
                 tenant_host,
                 client,
@@ -210,7 +210,7 @@ class AuthenticationFlow:
             params["token_type"] = "bearer"
 
         if login_session.response_type in ["code id_token", "code id_token token"]:
-            id_token = generate_id_token(
+            id_token = await generate_id_token(
                 tenant.get_sign_jwk(),
                 tenant_host,
                 client,
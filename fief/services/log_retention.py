@@ -0,0 +1,182 @@
+import re
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from fief.logger import logger
+from fief.repositories import AuditLogRepository, WebhookLogRepository
+from fief.repositories.base import LogRepositoryProtocol
+from fief.settings import settings
+
+PREMADE_PARTITIONS = 3
+"""Number of monthly partitions, including the current one, created ahead of time."""
+
+
+def get_month_start(value: datetime, months: int = 0) -> datetime:
+    """
+    Returns the start of the month of `value`, shifted by `months`.
+    """
+    month_index = value.year * 12 + value.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=UTC)
+
+
+def get_partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def parse_partition_bounds(
+    expression: str,
+) -> tuple[datetime | None, datetime | None] | None:
+    """
+    Parse the bounds of a range partition, as returned by PostgreSQL.
+
+    Returns `None` for the default partition
+    and `None` bounds for `MINVALUE` and `MAXVALUE`.
+    """
+    match = re.fullmatch(
+        r"FOR VALUES FROM \((?:MINVALUE|'([^']+)')\) TO \((?:MAXVALUE|'([^']+)')\)",
+        expression,
+    )
+    if match is None:
+        return None
+    lower, upper = match.groups()
+    return (
+        datetime.fromisoformat(lower) if lower is not None else None,
+        datetime.fromisoformat(upper) if upper is not None else None,
+    )
+
+
+class LogRetentionService:
+    """
+    Prune audit logs and webhook logs older than their retention period.
+
+    On PostgreSQL, log tables are partitioned by month:
+    expired partitions are dropped as a whole
+    and partitions for the upcoming months are created ahead of time.
+    Logs are thus kept until their whole partition is expired.
+
+    On other databases, expired logs are deleted in chunks of `chunk_size` rows,
+    each committed separately, until the `deadline`, a `time.monotonic()` value:
+    the next run picks up where it left off.
+
+    A retention period of `0` days keeps logs forever.
+    """
+
+    def __init__(
+        self,
+        audit_log_repository: AuditLogRepository,
+        webhook_log_repository: WebhookLogRepository,
+        *,
+        audit_logs_retention_days: int = settings.audit_logs_retention_days,
+        webhook_logs_retention_days: int = settings.webhook_logs_retention_days,
+        chunk_size: int = settings.logs_retention_chunk_size,
+        deadline: float | None = None,
+    ) -> None:
+        self.repositories: list[tuple[LogRepositoryProtocol, int]] = [
+            (audit_log_repository, audit_logs_retention_days),
+            (webhook_log_repository, webhook_logs_retention_days),
+        ]
+        self.chunk_size = chunk_size
+        self.deadline = deadline
+
+    async def run(self, now: datetime | None = None) -> None:
+        if now is None:
+            now = datetime.now(UTC)
+
+        for repository, retention_days in self.repositories:
+            cutoff = (
+                now - timedelta(days=retention_days) if retention_days > 0 else None
+            )
+            if await self._is_partitioned(repository):
+                await self._maintain_partitions(repository, now, cutoff)
+            elif cutoff is not None:
+                await self._delete_expired(repository, cutoff)
+
+    async def _delete_expired(
+        self, repository: LogRepositoryProtocol, cutoff: datetime
+    ) -> None:
+        table = repository.model.__table__.name
+        deleted = 0
+        while True:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                logger.info("Expired logs deletion interrupted", table=table)
+                break
+            chunk_deleted = await repository.delete_before(cutoff, self.chunk_size)
+            deleted += chunk_deleted
+            if chunk_deleted < self.chunk_size:
+                break
+
+        if deleted > 0:
+            logger.info("Expired logs deleted", table=table, deleted=deleted)
+
+    async def _maintain_partitions(
+        self,
+        repository: LogRepositoryProtocol,
+        now: datetime,
+        cutoff: datetime | None,
+    ) -> None:
+        table = repository.model.__table__.name
+        connection = await repository.session.connection()
+        partitions = await self._get_partitions(connection, table)
+
+        if cutoff is not None:
+            for partition, (_, upper) in partitions.items():
+                if upper is not None and upper <= cutoff:
+                    await connection.exec_driver_sql(f"DROP TABLE {partition}")
+                    logger.info("Expired logs partition dropped", partition=partition)
+
+        # Months already covered by a partition can't get a new one
+        upper_bounds = [upper for _, upper in partitions.values() if upper is not None]
+        start = max([get_month_start(now), *upper_bounds])
+        end = get_month_start(now, PREMADE_PARTITIONS)
+        while start < end:
+            next_start = get_month_start(start, 1)
+            partition = get_partition_name(table, start)
+            await connection.exec_driver_sql(
+                f"CREATE TABLE {partition} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') "
+                f"TO ('{next_start.isoformat()}')"
+            )
+            logger.info("Logs partition created", partition=partition)
+            start = next_start
+
+        await repository.session.commit()
+
+    async def _get_partitions(
+        self, connection: AsyncConnection, table: str
+    ) -> dict[str, tuple[datetime | None, datetime | None]]:
+        """
+        Returns the range partitions of a table, with their bounds.
+        """
+        result = await connection.execute(
+            text(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = :table"
+            ),
+            {"table": table},
+        )
+        partitions: dict[str, tuple[datetime | None, datetime | None]] = {}
+        for partition, expression in result.all():
+            bounds = parse_partition_bounds(expression)
+            if bounds is not None:
+                partitions[partition] = bounds
+        return partitions
+
+    async def _is_partitioned(self, repository: LogRepositoryProtocol) -> bool:
+        connection = await repository.session.connection()
+        if connection.dialect.name != "postgresql":
+            return False
+        result = await connection.execute(
+            text(
+                "SELECT COUNT(*) FROM pg_partitioned_table "
+                "JOIN pg_class ON pg_partitioned_table.partrelid = pg_class.oid "
+                "WHERE pg_class.relname = :table"
+            ),
+            {"table": repository.model.__table__.name},
+        )
+        return result.scalar_one() > 0
@@ -0,0 +1,36 @@
+import asyncio
+
+from fief.crypto.jwk import SignatureAlgorithm, generate_signature_jwk_string
+from fief.crypto.jwt import crypto_executor
+from fief.executor import ExecutorMode
+from fief.repositories import PooledSigningKeyRepository
+from fief.tasks import SendTask, replenish_signing_keys
+
+
+async def get_signing_key(
+    repository: PooledSigningKeyRepository,
+    send_task: SendTask,
+    algorithm: SignatureAlgorithm = SignatureAlgorithm.RS256,
+) -> str:
+    """
+    Returns a new signing key, in JWK JSON format.
+
+    The key is drawn from the pool pre-generated by the worker.
+    If the pool is empty, it's generated outside of the event loop.
+    Either way, the worker is asked to replenish the pool.
+    """
+    signing_key = await repository.pop(algorithm)
+
+    if signing_key is None:
+        if crypto_executor.mode == ExecutorMode.INLINE:
+            signing_key = await asyncio.to_thread(
+                generate_signature_jwk_string, algorithm
+            )
+        else:
+            signing_key = await crypto_executor.run(
+                generate_signature_jwk_string, algorithm
+            )
+
+    send_task(replenish_signing_keys)
+
+    return signing_key
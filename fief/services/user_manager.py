@@ -7,8 +7,11 @@ from jwcrypto import jwt
 from pydantic import UUID4
 
 from fief import schemas
-from fief.crypto.password import PasswordHelper
+from fief.crypto.access_token import ClaimsCache
+from fief.crypto.jwt import crypto_executor, sign_jwt
+from fief.crypto.password import PasswordHelper, password_executor
 from fief.crypto.verify_code import generate_verify_code, get_verify_code_hash
+from fief.db.unit_of_work import after_commit
 from fief.dependencies.webhooks import TriggerWebhooks
 from fief.logger import AuditLogger
 from fief.models import (
@@ -38,6 +41,10 @@ from fief.tasks import (
 
 RESET_PASSWORD_TOKEN_AUDIENCE = "fief:reset"
 
+user_claims_cache = ClaimsCache(
+    settings.access_token_cache_size, settings.user_claims_cache_ttl_seconds
+)
+
 
 class UserManagerError(Exception):
     pass
@@ -122,7 +129,9 @@ class UserManager:
         except UserDoesNotExistError:
             pass
 
-        hashed_password = self.password_helper.hash(user_create.password)
+        hashed_password = await password_executor.run(
+            self.password_helper.hash, user_create.password
+        )
         user = User(
             **user_create.model_dump(exclude={"password", "fields", "tenant_id"}),
             hashed_password=hashed_password,
@@ -192,6 +201,10 @@ class UserManager:
         user.email = email_verification.email
         user.email_verified = True
         await self.user_repository.update(user)
+        await after_commit(
+            self.user_repository.session,
+            lambda: user_claims_cache.delete((user.tenant_id, user.id)),
+        )
 
         await self.email_verification_repository.delete(email_verification)
 
@@ -203,18 +216,17 @@ class UserManager:
         if not user.is_active:
             raise UserInactiveError()
 
+        password_fingerprint = await password_executor.run(
+            self.password_helper.hash, user.hashed_password
+        )
         claims = {
             "sub": str(user.id),
-            "password_fgpt": self.password_helper.hash(user.hashed_password),
+            "password_fgpt": password_fingerprint,
             "aud": RESET_PASSWORD_TOKEN_AUDIENCE,
         }
-        signing_key = user.tenant.get_sign_jwk()
-        token = jwt.JWT(
-            header={"alg": "RS256", "kid": signing_key["kid"]}, claims=claims
-        )
-        token.make_signed_token(signing_key)
+        token = await crypto_executor.run(sign_jwt, user.tenant.get_sign_jwk(), claims)
 
-        await self.on_after_forgot_password(user, token.serialize(), request=request)
+        await self.on_after_forgot_password(user, token, request=request)
 
     async def reset_password(
         self,
@@ -227,14 +239,15 @@ class UserManager:
         try:
             decoded_token = jwt.JWT(
                 jwt=token,
-                algs=["RS256"],
-                key=tenant.get_sign_jwk(),
+                algs=tenant.get_sign_algorithms(),
+                key=tenant.get_sign_jwk_set(),
                 check_claims={"aud": RESET_PASSWORD_TOKEN_AUDIENCE},
             )
             claims = json.loads(decoded_token.claims)
         except (
             ValueError,
             jwt.JWTExpired,
+            jwt.JWTMissingKey,
             jwt.JWTMissingClaim,
             jwt.JWTInvalidClaimValue,
         ) as e:
@@ -253,8 +266,10 @@ class UserManager:
 
         user = await self.get(parsed_id, tenant.id)
 
-        valid_password_fingerprint, _ = self.password_helper.verify_and_update(
-            user.hashed_password, password_fingerprint
+        valid_password_fingerprint, _ = await password_executor.run(
+            self.password_helper.verify_and_update,
+            user.hashed_password,
+            password_fingerprint,
         )
         if not valid_password_fingerprint:
             raise InvalidResetPasswordTokenError()
@@ -329,6 +344,10 @@ class UserManager:
         self.send_task(on_after_register, str(user.id))
 
     async def on_after_update(self, user: User, *, request: Request | None = None):
+        await after_commit(
+            self.user_repository.session,
+            lambda: user_claims_cache.delete((user.tenant_id, user.id)),
+        )
         self.audit_logger(AuditLogMessage.USER_UPDATED, subject_user_id=user.id)
         self.trigger_webhooks(UserUpdated, user, schemas.user.UserRead)
 
@@ -383,11 +402,11 @@ class UserManager:
         except UserDoesNotExistError:
             # Run the hasher to mitigate timing attack
             # Inspired from Django: https://code.djangoproject.com/ticket/20760
-            self.password_helper.hash(password)
+            await password_executor.run(self.password_helper.hash, password)
             return None
 
-        verified, updated_password_hash = self.password_helper.verify_and_update(
-            password, user.hashed_password
+        verified, updated_password_hash = await password_executor.run(
+            self.password_helper.verify_and_update, password, user.hashed_password
         )
         if not verified:
             return None
@@ -426,7 +445,9 @@ class UserManager:
 
         if password is not None:
             await self.validate_password(password, user)
-            user.hashed_password = self.password_helper.hash(password)
+            user.hashed_password = await password_executor.run(
+                self.password_helper.hash, password
+            )
 
         for field, value in kwargs.items():
             setattr(user, field, value)
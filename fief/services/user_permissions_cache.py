@@ -0,0 +1,198 @@
+import json
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from fief.logger import logger
+from fief.redis import get_redis
+from fief.settings import settings
+
+
+class UserPermissionsCache:
+    """
+    Two-level cache of the permission codenames granted to users.
+
+    Entries are kept in a bounded per-process LRU and, when Redis is available,
+    in Redis so other processes can reuse them.
+
+    Each user has a version, stored in Redis and combined with a global version.
+    Invalidating bumps the version: entries stored under a previous one
+    are never read again and expire on their own.
+    Without Redis, versions are local to the process,
+    which is only suitable for single-process deployments and tests.
+
+    :param maxsize: Maximum number of users to keep in the process.
+    :param ttl_seconds: Lifetime of an entry. `0` disables the cache.
+    :param get_redis: Function returning the Redis client to use, if any.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: int,
+        *,
+        get_redis: Callable[[], Redis] | None = None,
+        key_prefix: str = "fief:user_permissions",
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.get_redis = get_redis
+        self.key_prefix = key_prefix
+        self._entries: OrderedDict[uuid.UUID, tuple[str, float, list[str]]] = (
+            OrderedDict()
+        )
+        self._local_generation = 0
+
+    async def get_or_load(
+        self, user_id: uuid.UUID, load: Callable[[], Awaitable[list[str]]]
+    ) -> list[str]:
+        version = await self._get_version(user_id)
+        if version is None:
+            return await load()
+
+        permissions = await self.get(user_id, version)
+        if permissions is None:
+            permissions = await load()
+            await self.set(user_id, version, permissions)
+
+        return list(permissions)
+
+    async def get(self, user_id: uuid.UUID, version: str) -> list[str] | None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            entry_version, expires_at, permissions = entry
+            # Without Redis, invalidated entries are directly removed
+            up_to_date = self.get_redis is None or entry_version == version
+            if up_to_date and expires_at > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return permissions
+            del self._entries[user_id]
+
+        if self.get_redis is None:
+            return None
+
+        try:
+            data = await self.get_redis().get(self._get_data_key(user_id, version))
+        except RedisError as e:
+            logger.warning("Permissions cache unavailable", error=str(e))
+            return None
+
+        if data is None:
+            return None
+
+        permissions = json.loads(data)
+        self._set_local(user_id, version, permissions)
+        return permissions
+
+    async def set(
+        self, user_id: uuid.UUID, version: str, permissions: list[str]
+    ) -> None:
+        if self.get_redis is None:
+            # Permissions changed while they were loaded: don't cache a stale value
+            if version != self._get_local_version():
+                return
+            self._set_local(user_id, version, permissions)
+            return
+
+        self._set_local(user_id, version, permissions)
+        try:
+            await self.get_redis().set(
+                self._get_data_key(user_id, version),
+                json.dumps(permissions),
+                ex=self.ttl_seconds,
+            )
+        except RedisError as e:
+            logger.warning("Permissions cache unavailable", error=str(e))
+
+    async def invalidate(self, *user_ids: uuid.UUID) -> None:
+        for user_id in user_ids:
+            self._entries.pop(user_id, None)
+
+        if self.get_redis is None:
+            self._local_generation += 1
+            return
+
+        try:
+            async with self.get_redis().pipeline(transaction=False) as pipeline:
+                for user_id in user_ids:
+                    # Outlive the entries stored under the previous version
+                    pipeline.set(
+                        self._get_version_key(user_id),
+                        uuid.uuid4().hex,
+                        ex=self.ttl_seconds * 2,
+                    )
+                await pipeline.execute()
+        except RedisError as e:
+            logger.error("Permissions cache invalidation failed", error=str(e))
+
+    async def invalidate_all(self) -> None:
+        self._entries.clear()
+
+        if self.get_redis is None:
+            self._local_generation += 1
+            return
+
+        try:
+            await self.get_redis().set(self._get_version_key(None), uuid.uuid4().hex)
+        except RedisError as e:
+            logger.error("Permissions cache invalidation failed", error=str(e))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _get_version(self, user_id: uuid.UUID) -> str | None:
+        if self.ttl_seconds <= 0:
+            return None
+
+        if self.get_redis is None:
+            return self._get_local_version()
+
+        try:
+            global_version, user_version = await self.get_redis().mget(
+                self._get_version_key(None), self._get_version_key(user_id)
+            )
+        except RedisError as e:
+            logger.warning("Permissions cache unavailable", error=str(e))
+            return None
+
+        return f"{_decode(global_version)}.{_decode(user_version)}"
+
+    def _get_local_version(self) -> str:
+        return str(self._local_generation)
+
+    def _set_local(
+        self, user_id: uuid.UUID, version: str, permissions: list[str]
+    ) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        self._entries[user_id] = (version, expires_at, permissions)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _get_version_key(self, user_id: uuid.UUID | None) -> str:
+        if user_id is None:
+            return f"{self.key_prefix}:version"
+        return f"{self.key_prefix}:version:{user_id}"
+
+    def _get_data_key(self, user_id: uuid.UUID, version: str) -> str:
+        return f"{self.key_prefix}:{user_id}:{version}"
+
+
+def _decode(value: bytes | None) -> str:
+    return "0" if value is None else value.decode()
+
+
+user_permissions_cache = UserPermissionsCache(
+    settings.user_permissions_cache_size,
+    settings.user_permissions_cache_ttl_seconds,
+    get_redis=get_redis,
+)
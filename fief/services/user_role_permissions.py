@@ -1,22 +1,109 @@
-from fief.models import Role, User, UserPermission
-from fief.repositories import UserPermissionRepository
+from collections.abc import Sequence
+
+from pydantic import UUID4
+
+from fief.db.unit_of_work import after_commit
+from fief.logger import logger
+from fief.models import Role, User
+from fief.repositories import UserPermissionRepository, UserRoleRepository
+from fief.services.user_permissions_cache import user_permissions_cache
+from fief.settings import settings
 
 
 class UserRolePermissionsService:
-    def __init__(self, user_permission_repository: UserPermissionRepository) -> None:
+    """
+    Maintain the user permissions granted from roles.
+
+    Writes are done in chunks of `chunk_size` rows, each committed separately,
+    so roles with very large memberships don't end up in a single huge transaction.
+    Every operation can be run again safely, e.g. when a task is retried:
+    chunks which were already processed are skipped.
+    """
+
+    def __init__(
+        self,
+        user_permission_repository: UserPermissionRepository,
+        user_role_repository: UserRoleRepository,
+        *,
+        chunk_size: int = settings.role_permissions_chunk_size,
+    ) -> None:
         self.user_permission_repository = user_permission_repository
+        self.user_role_repository = user_role_repository
+        self.chunk_size = chunk_size
 
     async def add_role_permissions(self, user: User, role: Role) -> None:
-        user_permissions: list[UserPermission] = []
-        for permission in role.permissions:
-            user_permissions.append(
-                UserPermission(
-                    user_id=user.id,
-                    permission_id=permission.id,
-                    from_role_id=role.id,
-                )
-            )
-        await self.user_permission_repository.create_many(user_permissions)
+        await self.user_permission_repository.create_from_role(
+            role.id, [user.id], [permission.id for permission in role.permissions]
+        )
+        await after_commit(
+            self.user_permission_repository.session,
+            lambda: user_permissions_cache.invalidate(user.id),
+        )
 
     async def delete_role_permissions(self, user: User, role: Role) -> None:
-        await self.user_permission_repository.delete_by_user_and_role(user.id, role.id)
+        await self._delete_from_role(role.id, users=[user.id])
+        await after_commit(
+            self.user_permission_repository.session,
+            lambda: user_permissions_cache.invalidate(user.id),
+        )
+
+    async def update_role_permissions(
+        self,
+        role: Role,
+        added_permissions: Sequence[UUID4],
+        deleted_permissions: Sequence[UUID4],
+    ) -> None:
+        """
+        Propagate permissions added to or removed from a role to all its users.
+        """
+        if deleted_permissions:
+            deleted = await self._delete_from_role(
+                role.id, permissions=deleted_permissions
+            )
+            logger.info(
+                "Role permissions revoked", role_id=str(role.id), deleted=deleted
+            )
+
+        if added_permissions:
+            users = 0
+            created = 0
+            after: UUID4 | None = None
+            while True:
+                user_ids = await self.user_role_repository.get_user_ids_by_role(
+                    role.id, after=after, limit=self.chunk_size
+                )
+                if not user_ids:
+                    break
+                created += await self.user_permission_repository.create_from_role(
+                    role.id, user_ids, added_permissions
+                )
+                users += len(user_ids)
+                after = user_ids[-1]
+                logger.info(
+                    "Role permissions granted",
+                    role_id=str(role.id),
+                    users=users,
+                    created=created,
+                )
+
+        # Permissions of every user with this role changed
+        await after_commit(
+            self.user_permission_repository.session,
+            user_permissions_cache.invalidate_all,
+        )
+
+    async def _delete_from_role(
+        self,
+        role_id: UUID4,
+        *,
+        users: Sequence[UUID4] | None = None,
+        permissions: Sequence[UUID4] | None = None,
+    ) -> int:
+        deleted = 0
+        while True:
+            chunk_deleted = await self.user_permission_repository.delete_from_role(
+                role_id, users=users, permissions=permissions, limit=self.chunk_size
+            )
+            if chunk_deleted == 0:
+                return deleted
+            deleted += chunk_deleted
@@ -38,7 +38,7 @@ class UserRolesService:
         self.trigger_webhooks = trigger_webhooks
         self.send_task = send_task
         self.user_role_permissions = UserRolePermissionsService(
-            user_permission_repository
+            user_permission_repository, user_role_repository
         )
 
     async def add_role(
@@ -0,0 +1,51 @@
+import uuid
+from collections.abc import Callable
+
+from redis.asyncio import Redis
+
+from fief.redis import get_redis
+
+
+class WebhookBatchBuffer:
+    """
+    Queue of events waiting to be delivered in batch to a webhook.
+
+    Events are stored in a Redis list per webhook,
+    so they are shared by every process triggering webhooks.
+
+    :param get_redis: Function returning the Redis client to use.
+    """
+
+    def __init__(
+        self,
+        get_redis: Callable[[], Redis] = get_redis,
+        *,
+        key_prefix: str = "fief:webhook_batches",
+    ) -> None:
+        self.get_redis = get_redis
+        self.key_prefix = key_prefix
+
+    async def push(self, webhook_id: uuid.UUID, event: str) -> int:
+        """
+        Add a serialized event to the queue of a webhook.
+
+        Returns the number of events waiting in the queue.
+        """
+        return await self.get_redis().rpush(self._get_key(webhook_id), event)  # type: ignore[misc]
+
+    async def pop(self, webhook_id: uuid.UUID, count: int) -> tuple[list[str], int]:
+        """
+        Atomically take at most `count` events from the queue of a webhook.
+
+        Returns the events and the number of events still waiting in the queue.
+        """
+        key = self._get_key(webhook_id)
+        async with self.get_redis().pipeline(transaction=True) as pipeline:
+            pipeline.lrange(key, 0, count - 1)
+            pipeline.ltrim(key, count, -1)
+            pipeline.llen(key)
+            events, _, remaining = await pipeline.execute()
+        return [event.decode("utf-8") for event in events], remaining
+
+    def _get_key(self, webhook_id: uuid.UUID) -> str:
+        return f"{self.key_prefix}:{webhook_id}"
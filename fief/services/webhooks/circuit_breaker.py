@@ -0,0 +1,268 @@
+import dataclasses
+import math
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from enum import StrEnum
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from fief.logger import logger
+from fief.redis import get_redis
+from fief.settings import settings
+
+
+class WebhookCircuitStatus(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def get_display_name(self) -> str:
+        display_names = {
+            WebhookCircuitStatus.CLOSED: "Closed",
+            WebhookCircuitStatus.OPEN: "Open",
+            WebhookCircuitStatus.HALF_OPEN: "Half-open",
+        }
+        return display_names[self]
+
+
+@dataclasses.dataclass
+class WebhookCircuit:
+    failures: int = 0
+    """Number of consecutive failed deliveries."""
+    openings: int = 0
+    """Number of times the circuit opened since the last successful delivery."""
+    open_until: float | None = None
+    """Timestamp until which deliveries are deferred."""
+
+    @property
+    def open_until_datetime(self) -> datetime | None:
+        if self.open_until is None:
+            return None
+        return datetime.fromtimestamp(self.open_until, UTC)
+
+    def get_status(self, now: float | None = None) -> WebhookCircuitStatus:
+        if self.open_until is None:
+            return WebhookCircuitStatus.CLOSED
+        if now is None:
+            now = time.time()
+        if now < self.open_until:
+            return WebhookCircuitStatus.OPEN
+        return WebhookCircuitStatus.HALF_OPEN
+
+
+class WebhookCircuitBreaker:
+    """
+    Stop delivering to webhooks whose receiver keeps failing.
+
+    After `failure_threshold` consecutive failures, the circuit opens:
+    deliveries are deferred until the open period is over.
+    Then, a single delivery is let through to probe the receiver.
+    If it succeeds, the circuit closes; otherwise, it opens again,
+    for twice as long, up to `max_open_seconds`.
+
+    The state is stored in Redis so it's shared by every worker.
+    Without Redis, it's local to the process,
+    which is only suitable for single-process deployments and tests.
+    If Redis is unavailable, deliveries are let through.
+
+    :param failure_threshold: Consecutive failures opening the circuit. `0` disables it.
+    :param open_seconds: Duration of the first open period.
+    :param max_open_seconds: Maximum duration of an open period.
+    :param probe_timeout_seconds: Time to wait for the probe before letting another one through.
+    :param get_redis: Function returning the Redis client to use, if any.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        open_seconds: int,
+        max_open_seconds: int,
+        probe_timeout_seconds: int,
+        *,
+        get_redis: Callable[[], Redis] | None = None,
+        key_prefix: str = "fief:webhook_circuits",
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.get_redis = get_redis
+        self.key_prefix = key_prefix
+        self._local_circuits: dict[uuid.UUID, WebhookCircuit] = {}
+        self._local_probes: dict[uuid.UUID, float] = {}
+
+    async def get_circuit(self, webhook_id: uuid.UUID) -> WebhookCircuit | None:
+        """
+        Returns the circuit of a webhook, or `None` if it's unavailable.
+        """
+        if self.get_redis is None:
+            return self._local_circuits.get(webhook_id, WebhookCircuit())
+
+        try:
+            circuit = await self.get_redis().hgetall(self._get_key(webhook_id))  # type: ignore[misc]
+        except RedisError as e:
+            logger.warning("Webhook circuit breaker unavailable", error=str(e))
+            return None
+
+        open_until = circuit.get(b"open_until")
+        return WebhookCircuit(
+            failures=int(circuit.get(b"failures", 0)),
+            openings=int(circuit.get(b"openings", 0)),
+            open_until=float(open_until) if open_until is not None else None,
+        )
+
+    async def get_deferral(self, webhook_id: uuid.UUID) -> float | None:
+        """
+        Check if a delivery can be attempted.
+
+        Returns the number of seconds to wait before trying again
+        or `None` if the delivery can be attempted now.
+        """
+        if self.failure_threshold <= 0:
+            return None
+
+        circuit = await self.get_circuit(webhook_id)
+        if circuit is None:
+            return None
+
+        now = time.time()
+        if circuit.open_until is None:
+            return None
+        if now < circuit.open_until:
+            return circuit.open_until - now
+
+        # Open period is over: let a single delivery probe the receiver
+        if await self._acquire_probe(webhook_id):
+            logger.info("Webhook circuit half-open", webhook_id=str(webhook_id))
+            return None
+        return self.probe_timeout_seconds
+
+    async def record_success(self, webhook_id: uuid.UUID) -> None:
+        if self.failure_threshold <= 0:
+            return
+
+        if self.get_redis is None:
+            circuit = self._local_circuits.pop(webhook_id, None)
+            self._local_probes.pop(webhook_id, None)
+            open_until = circuit.open_until if circuit is not None else None
+        else:
+            key = self._get_key(webhook_id)
+            try:
+                async with self.get_redis().pipeline(transaction=True) as pipeline:
+                    pipeline.hget(key, "open_until")
+                    pipeline.delete(key, self._get_probe_key(webhook_id))
+                    open_until, _ = await pipeline.execute()
+            except RedisError as e:
+                logger.warning("Webhook circuit breaker unavailable", error=str(e))
+                return
+
+        if open_until is not None:
+            logger.info("Webhook circuit closed", webhook_id=str(webhook_id))
+
+    async def record_failure(self, webhook_id: uuid.UUID) -> None:
+        if self.failure_threshold <= 0:
+            return
+
+        try:
+            circuit = await self._increment_failures(webhook_id)
+            now = time.time()
+            if (
+                circuit.failures >= self.failure_threshold
+                and circuit.get_status(now) != WebhookCircuitStatus.OPEN
+            ):
+                circuit.openings += 1
+                open_seconds = min(
+                    self.open_seconds * 2 ** (circuit.openings - 1),
+                    self.max_open_seconds,
+                )
+                circuit.open_until = now + open_seconds
+                await self._open(webhook_id, circuit)
+                logger.warning(
+                    "Webhook circuit opened",
+                    webhook_id=str(webhook_id),
+                    failures=circuit.failures,
+                    open_seconds=open_seconds,
+                )
+        except RedisError as e:
+            logger.warning("Webhook circuit breaker unavailable", error=str(e))
+
+    def clear(self) -> None:
+        self._local_circuits.clear()
+        self._local_probes.clear()
+
+    async def _increment_failures(self, webhook_id: uuid.UUID) -> WebhookCircuit:
+        if self.get_redis is None:
+            circuit = self._local_circuits.setdefault(webhook_id, WebhookCircuit())
+            circuit.failures += 1
+            return dataclasses.replace(circuit)
+
+        key = self._get_key(webhook_id)
+        async with self.get_redis().pipeline(transaction=True) as pipeline:
+            pipeline.hincrby(key, "failures", 1)
+            pipeline.hmget(key, ["openings", "open_until"])
+            # Forget about failures which are too old to be consecutive
+            pipeline.expire(key, self.max_open_seconds * 2)
+            failures, (openings, open_until), _ = await pipeline.execute()
+        return WebhookCircuit(
+            failures=failures,
+            openings=int(openings or 0),
+            open_until=float(open_until) if open_until is not None else None,
+        )
+
+    async def _open(self, webhook_id: uuid.UUID, circuit: WebhookCircuit) -> None:
+        if self.get_redis is None:
+            self._local_circuits[webhook_id] = circuit
+            self._local_probes.pop(webhook_id, None)
+            return
+
+        key = self._get_key(webhook_id)
+        async with self.get_redis().pipeline(transaction=True) as pipeline:
+            pipeline.hset(
+                key,
+                mapping={
+                    "openings": circuit.openings,
+                    "open_until": str(circuit.open_until),
+                },
+            )
+            pipeline.expire(key, self.max_open_seconds * 2)
+            pipeline.delete(self._get_probe_key(webhook_id))
+            await pipeline.execute()
+
+    async def _acquire_probe(self, webhook_id: uuid.UUID) -> bool:
+        if self.get_redis is None:
+            now = time.monotonic()
+            if self._local_probes.get(webhook_id, 0.0) > now:
+                return False
+            self._local_probes[webhook_id] = now + self.probe_timeout_seconds
+            return True
+
+        try:
+            acquired = await self.get_redis().set(
+                self._get_probe_key(webhook_id),
+                "1",
+                nx=True,
+                ex=self.probe_timeout_seconds,
+            )
+        except RedisError as e:
+            logger.warning("Webhook circuit breaker unavailable", error=str(e))
+            return True
+        return bool(acquired)
+
+    def _get_key(self, webhook_id: uuid.UUID) -> str:
+        return f"{self.key_prefix}:{webhook_id}"
+
+    def _get_probe_key(self, webhook_id: uuid.UUID) -> str:
+        return f"{self.key_prefix}:{webhook_id}:probe"
+
+
+webhook_circuit_breaker = WebhookCircuitBreaker(
+    settings.webhooks_circuit_breaker_failure_threshold,
+    settings.webhooks_circuit_breaker_open_seconds,
+    settings.webhooks_circuit_breaker_max_open_seconds,
+    # Connect, write and read timeouts apply separately to the probe request
+    math.ceil(settings.webhooks_timeout_seconds * 3),
+    get_redis=get_redis,
+)
@@ -1,13 +1,18 @@
+import contextlib
 import hmac
 import time
+import uuid
+from collections.abc import Callable, Sequence
 from hashlib import sha256
 
 import httpx
 
 from fief import __version__
+from fief.db import AsyncSession
 from fief.models import Webhook, WebhookLog
 from fief.repositories import WebhookLogRepository
-from fief.services.webhooks.models import WebhookEvent
+from fief.services.webhooks.http_client import get_webhook_http_client
+from fief.services.webhooks.models import WebhookEvent, webhook_events_adapter
 
 
 class WebhookDeliveryError(Exception):
@@ -16,43 +21,89 @@ class WebhookDeliveryError(Exception):
 
 
 class WebhookDelivery:
-    def __init__(self, webhook_log_repository: WebhookLogRepository) -> None:
-        self.webhook_log_repository = webhook_log_repository
+    """
+    Deliver webhook events and log the attempts.
+
+    No database connection is held while waiting on the receiver:
+    the log is written afterwards, in its own short transaction.
+    """
+
+    def __init__(
+        self,
+        get_main_session: Callable[
+            ..., contextlib.AbstractAsyncContextManager[AsyncSession]
+        ],
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        self.get_main_session = get_main_session
+        self.http_client = http_client
 
     async def deliver(self, webhook: Webhook, event: WebhookEvent, attempt: int = 1):
-        async with httpx.AsyncClient() as client:
-            payload = event.model_dump_json()
-            signature, ts = self._get_signature(payload, webhook.secret)
+        payload = event.model_dump_json()
+        webhook_log = WebhookLog(
+            webhook_id=webhook.id,
+            event=event.type,
+            attempt=attempt,
+            payload=payload,
+            success=False,
+        )
+        await self._send(webhook, payload, [webhook_log])
 
-            webhook_log = WebhookLog(
+    async def deliver_batch(
+        self, webhook: Webhook, events: Sequence[WebhookEvent], attempt: int = 1
+    ):
+        """
+        Deliver several events in a single request, as a JSON array.
+
+        Each event gets its own log, linked to the others by a common `batch_id`.
+        """
+        payload = webhook_events_adapter.dump_json(list(events)).decode("utf-8")
+        batch_id = uuid.uuid4()
+        webhook_logs = [
+            WebhookLog(
                 webhook_id=webhook.id,
                 event=event.type,
                 attempt=attempt,
-                payload=payload,
+                payload=event.model_dump_json(),
                 success=False,
+                batch_id=batch_id,
             )
+            for event in events
+        ]
+        await self._send(webhook, payload, webhook_logs)
+
+    async def _send(
+        self, webhook: Webhook, payload: str, webhook_logs: list[WebhookLog]
+    ):
+        client = self.http_client or get_webhook_http_client()
+        signature, ts = self._get_signature(payload, webhook.secret)
 
-            try:
-                response = await client.post(
-                    webhook.url,
-                    content=payload,
-                    headers={
-                        "User-Agent": f"fief-server-webhooks/{__version__}",
-                        "Content-Type": "application/json",
-                        "X-Fief-Webhook-Signature": signature,
-                        "X-Fief-Webhook-Timestamp": str(ts),
-                    },
-                    follow_redirects=False,
-                )
+        try:
+            response = await client.post(
+                webhook.url,
+                content=payload,
+                headers={
+                    "User-Agent": f"fief-server-webhooks/{__version__}",
+                    "Content-Type": "application/json",
+                    "X-Fief-Webhook-Signature": signature,
+                    "X-Fief-Webhook-Timestamp": str(ts),
+                },
+                follow_redirects=False,
+            )
+            for webhook_log in webhook_logs:
                 webhook_log.response = response.text
-                response.raise_for_status()
+            response.raise_for_status()
+            for webhook_log in webhook_logs:
                 webhook_log.success = True
-            except httpx.HTTPError as e:
+        except httpx.HTTPError as e:
+            for webhook_log in webhook_logs:
                 webhook_log.error_type = type(e).__name__
                 webhook_log.error_message = str(e)
-                raise WebhookDeliveryError(str(e)) from e
-            finally:
-                await self.webhook_log_repository.create(webhook_log)
+            raise WebhookDeliveryError(str(e)) from e
+        finally:
+            async with self.get_main_session() as session:
+                webhook_log_repository = WebhookLogRepository(session)
+                await webhook_log_repository.create_many(webhook_logs)
 
     def _get_signature(self, payload: str, secret: str) -> tuple[str, int]:
         ts = int(time.time())
@@ -0,0 +1,44 @@
+import asyncio
+import weakref
+
+import httpx
+
+from fief.settings import settings
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def create_webhook_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=settings.webhooks_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.webhooks_max_connections,
+            max_keepalive_connections=settings.webhooks_max_keepalive_connections,
+            keepalive_expiry=settings.webhooks_keepalive_expiry_seconds,
+        ),
+        http2=settings.webhooks_http2,
+        follow_redirects=False,
+    )
+
+
+def get_webhook_http_client() -> httpx.AsyncClient:
+    """
+    Returns the webhook HTTP client of the running event loop.
+
+    It's reused across deliveries, so connections to the receivers are kept alive
+    instead of paying for a new TCP and TLS handshake each time.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = create_webhook_http_client()
+        _clients[loop] = client
+    return client
+
+
+async def close_webhook_http_client() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -1,6 +1,6 @@
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class WebhookEventType:
@@ -252,3 +252,6 @@ WEBHOOK_EVENTS: list[type[WebhookEventType]] = [
 class WebhookEvent(BaseModel):
     type: str
     data: dict[str, Any]
+
+
+webhook_events_adapter = TypeAdapter(list[WebhookEvent])
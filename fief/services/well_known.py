@@ -0,0 +1,95 @@
+import dataclasses
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Hashable
+from datetime import UTC, datetime
+from typing import Any
+
+from fief.crypto.jwk import get_jwk_fingerprint
+from fief.models import Tenant
+from fief.settings import settings
+
+
+@dataclasses.dataclass(frozen=True)
+class WellKnownDocument:
+    version: str
+    content: bytes
+    etag: str
+
+
+def get_tenant_well_known_version(tenant: Tenant) -> str:
+    """
+    Returns a fingerprint of the tenant data published in the well-known documents.
+
+    It changes whenever the tenant is renamed, or when a signing key
+    is rotated or expires.
+    """
+    now = int(datetime.now(UTC).timestamp())
+    previous_sign_jwks = [
+        previous_sign_jwk["jwk"]
+        for previous_sign_jwk in tenant.previous_sign_jwks or []
+        if previous_sign_jwk["expires_at"] > now
+    ]
+    version = json.dumps(
+        [
+            str(tenant.id),
+            tenant.slug,
+            tenant.default,
+            get_jwk_fingerprint(tenant.sign_jwk),
+            [get_jwk_fingerprint(jwk) for jwk in previous_sign_jwks],
+        ]
+    )
+    return hashlib.sha256(version.encode("utf-8")).hexdigest()
+
+
+class WellKnownDocumentCache:
+    """
+    Bounded, process-wide LRU cache of serialized well-known documents.
+
+    Each document is stored with the tenant version it was built from,
+    so it's rebuilt as soon as the tenant changes.
+    The last document is also kept to be served when the database is unavailable.
+
+    :param maxsize: Maximum number of documents to keep. `0` disables the cache.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._documents: OrderedDict[Hashable, WellKnownDocument] = OrderedDict()
+
+    def get(self, key: Hashable) -> WellKnownDocument | None:
+        document = self._documents.get(key)
+        if document is not None:
+            self._documents.move_to_end(key)
+        return document
+
+    def set(
+        self, key: Hashable, version: str, data: dict[str, Any]
+    ) -> WellKnownDocument:
+        # Same serialization as FastAPI's default JSONResponse
+        content = json.dumps(
+            data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        document = WellKnownDocument(
+            version=version,
+            content=content,
+            etag=f'"{hashlib.sha256(content).hexdigest()}"',
+        )
+
+        if self.maxsize > 0:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+
+        return document
+
+    def clear(self) -> None:
+        self._documents.clear()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+
+well_known_cache = WellKnownDocumentCache(settings.well_known_cache_size)
@@ -20,10 +20,22 @@ from fief.db.types import (
     DatabaseType,
     create_database_connection_parameters,
 )
+from fief.executor import ExecutorMode
 from fief.paths import TEMPLATES_DIRECTORY
 from fief.services.email import EMAIL_PROVIDERS, AvailableEmailProvider, EmailProvider
 
 
+class PasswordHashAlgorithm(StrEnum):
+    BCRYPT = "bcrypt"
+    ARGON2 = "argon2"
+
+
+class EphemeralStoreBackend(StrEnum):
+    DATABASE = "DATABASE"
+    REDIS = "REDIS"
+    MEMORY = "MEMORY"
+
+
 class Environment(StrEnum):
     DEVELOPMENT = "development"
     STAGING = "staging"
@@ -46,6 +58,11 @@ initial_settings = InitialSettings()
 class Settings(BaseSettings):
     environment: Environment = Environment.PRODUCTION
     log_level: str = "INFO"
+    audit_log_batch_size: int = Field(default=500, ge=1)
+    audit_log_flush_interval_seconds: float = Field(default=1.0, gt=0)
+    audit_logs_retention_days: int = Field(default=0, ge=0)
+    webhook_logs_retention_days: int = Field(default=0, ge=0)
+    logs_retention_chunk_size: int = Field(default=1000, ge=1)
     sentry_dsn_server: str | None = None
     sentry_dsn_worker: str | None = None
     telemetry_enabled: bool = True
@@ -56,6 +73,37 @@ class Settings(BaseSettings):
     encryption_key: bytes
 
     generated_jwk_size: int = 4096
+    jwk_cache_size: int = 128
+    sign_jwk_rotation_overlap_seconds: int = 3600 * 24
+    signing_key_pool_size: int = 10
+
+    crypto_executor_mode: ExecutorMode = ExecutorMode.INLINE
+    crypto_executor_max_workers: int | None = None
+    crypto_executor_max_pending: int = 128
+
+    password_hash_algorithm: PasswordHashAlgorithm = PasswordHashAlgorithm.BCRYPT
+    password_bcrypt_rounds: int = Field(default=12, ge=4, le=31)
+    password_argon2_time_cost: int = Field(default=3, ge=1)
+    password_argon2_memory_cost: int = Field(default=65536, ge=8)
+    password_argon2_parallelism: int = Field(default=4, ge=1)
+
+    password_executor_mode: ExecutorMode = ExecutorMode.THREAD
+    password_executor_max_workers: int | None = None
+    password_executor_max_pending: int = 64
+
+    access_token_cache_size: int = 1024
+    access_token_cache_ttl_seconds: int = 60
+    # Claims are kept in the memory of each process during this time,
+    # without checking the user is still active: a user deactivated or deleted
+    # from another process can still get their claims until then.
+    user_claims_cache_ttl_seconds: int = 0
+
+    well_known_cache_size: int = 256
+    well_known_cache_max_age_seconds: int = 300
+
+    user_permissions_cache_size: int = 4096
+    user_permissions_cache_ttl_seconds: int = 600
+    role_permissions_chunk_size: int = 1000
 
     database_type: DatabaseType = DatabaseType.SQLITE
     database_url: str | None = None
@@ -71,9 +119,24 @@ class Settings(BaseSettings):
     database_pool_size: int = 5
     database_pool_max_overflow: int = 10
     database_table_prefix: str = "fief_"
+    database_unit_of_work: bool = False
 
     redis_url: str = "redis://localhost:6379"
 
+    ephemeral_store: EphemeralStoreBackend = EphemeralStoreBackend.DATABASE
+    session_token_store: EphemeralStoreBackend = EphemeralStoreBackend.DATABASE
+    session_token_near_cache_ttl_seconds: float = Field(default=5.0, ge=0)
+    session_token_near_cache_size: int = Field(default=10000, ge=1)
+
+    # Tasks run in the background of the worker threads, which only wait for a slot:
+    # those still running are lost if the worker is killed.
+    worker_async_concurrency: int = Field(default=0, ge=0)
+    worker_async_threads: int = Field(default=4, ge=1)
+
+    cleanup_interval_minutes: int = Field(default=5, ge=1)
+    cleanup_chunk_size: int = Field(default=1000, ge=1)
+    cleanup_max_duration_seconds: float = Field(default=60.0, gt=0)
+
     email_provider: AvailableEmailProvider = AvailableEmailProvider.NULL
     email_provider_params: dict[str, Any] = Field(default_factory=dict)
     default_from_email: str = "contact@fief.dev"
@@ -125,6 +188,19 @@ class Settings(BaseSettings):
     default_refresh_token_lifetime_seconds: int = 3600 * 24 * 30
 
     webhooks_max_attempts: int = 5
+    webhooks_timeout_seconds: float = 5.0
+    webhooks_max_connections: int = 100
+    webhooks_max_keepalive_connections: int = 20
+    webhooks_keepalive_expiry_seconds: float = 30.0
+    webhooks_http2: bool = False
+    # Deliver to the subscribers of an event directly from the trigger task,
+    # with this number of concurrent requests. `0` enqueues a task per webhook.
+    webhooks_fanout_concurrency: int = Field(default=0, ge=0)
+    webhooks_batch_max_events: int = Field(default=100, ge=1)
+    webhooks_batch_max_wait_ms: int = Field(default=1000, ge=0)
+    webhooks_circuit_breaker_failure_threshold: int = Field(default=5, ge=0)
+    webhooks_circuit_breaker_open_seconds: int = Field(default=30, ge=1)
+    webhooks_circuit_breaker_max_open_seconds: int = Field(default=600, ge=1)
 
     fief_domain: str = "localhost:8000"
     fief_client_id: str
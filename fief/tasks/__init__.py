@@ -6,8 +6,14 @@ from fief.tasks.forgot_password import on_after_forgot_password
 from fief.tasks.heartbeat import heartbeat
 from fief.tasks.register import on_after_register
 from fief.tasks.roles import on_role_updated
+from fief.tasks.signing_keys import replenish_signing_keys
 from fief.tasks.user_roles import on_user_role_created, on_user_role_deleted
-from fief.tasks.webhooks import deliver_webhook, trigger_webhooks
+from fief.tasks.webhooks import (
+    deliver_webhook,
+    deliver_webhook_batch,
+    flush_webhook_batch,
+    trigger_webhooks,
+)
 
 __all__ = [
     "send_task",
@@ -18,9 +24,12 @@ __all__ = [
     "on_after_register",
     "on_email_verification_requested",
     "on_role_updated",
+    "replenish_signing_keys",
     "on_user_role_created",
     "on_user_role_deleted",
     "deliver_webhook",
+    "deliver_webhook_batch",
+    "flush_webhook_batch",
     "trigger_webhooks",
     "write_audit_log",
 ]
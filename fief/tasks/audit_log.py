@@ -4,7 +4,6 @@ from typing import Any
 
 import dramatiq
 
-from fief.models import AuditLog
 from fief.repositories import AuditLogRepository
 from fief.tasks.base import TaskBase
 
@@ -12,30 +11,31 @@ from fief.tasks.base import TaskBase
 class WriteAuditLog(TaskBase):
     __name__ = "write_audit_log"
 
-    async def run(self, record: str):
-        parsed_record: dict[str, Any] = json.loads(record)
-        extra = parsed_record["extra"]
+    async def run(self, records: list[str] | str):
+        # Messages sent before batching carry a single record
+        if isinstance(records, str):
+            records = [records]
 
+        values = [self._get_audit_log_values(record) for record in records]
         async with self.get_main_session() as session:
             audit_log_repository = AuditLogRepository(session)
-            extra.pop("audit")
-            subject_user_id = extra.pop("subject_user_id", None)
-            object_id = extra.pop("object_id", None)
-            object_class = extra.pop("object_class", None)
-            admin_user_id = extra.pop("admin_user_id", None)
-            admin_api_key_id = extra.pop("admin_api_key_id", None)
-            audit_log = AuditLog(
-                timestamp=datetime.fromisoformat(parsed_record["time"]),
-                level=parsed_record["level"],
-                message=parsed_record["message"],
-                subject_user_id=subject_user_id,
-                object_id=object_id,
-                object_class=object_class,
-                admin_user_id=admin_user_id,
-                admin_api_key_id=admin_api_key_id,
-                extra=extra,
-            )
-            await audit_log_repository.create(audit_log)
+            await audit_log_repository.create_many_from_values(values)
+
+    def _get_audit_log_values(self, record: str) -> dict[str, Any]:
+        parsed_record: dict[str, Any] = json.loads(record)
+        extra = parsed_record["extra"]
+        extra.pop("audit")
+        return {
+            "timestamp": datetime.fromisoformat(parsed_record["time"]),
+            "level": parsed_record["level"],
+            "message": parsed_record["message"],
+            "subject_user_id": extra.pop("subject_user_id", None),
+            "object_id": extra.pop("object_id", None),
+            "object_class": extra.pop("object_class", None),
+            "admin_user_id": extra.pop("admin_user_id", None),
+            "admin_api_key_id": extra.pop("admin_api_key_id", None),
+            "extra": extra,
+        }
 
 
 write_audit_log = dramatiq.actor(WriteAuditLog())
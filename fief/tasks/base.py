@@ -1,23 +1,28 @@
 import asyncio
 import contextlib
-from collections.abc import AsyncGenerator, Callable
-from typing import ClassVar
-from urllib.parse import urlparse
+import contextvars
+import threading
+from collections.abc import AsyncGenerator, Callable, Coroutine
+from typing import Any, ClassVar, TypeVar, cast
 
 import dramatiq
 import jinja2
+from dramatiq.asyncio import EventLoopThread, get_event_loop_thread
 from dramatiq.brokers.redis import RedisBroker
-from dramatiq.middleware import CurrentMessage
+from dramatiq.message import Message
+from dramatiq.middleware import AsyncIO, CurrentMessage, Middleware, Retries
 from pydantic import UUID4
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import selectinload
 
-from fief.db import AsyncSession
-from fief.db.main import get_single_main_async_session
+from fief.db import AsyncEngine, AsyncSession
+from fief.db.main import create_main_async_session_maker, create_main_engine
 from fief.logger import logger
 from fief.middlewares.locale import BabelMiddleware, get_babel_middleware_kwargs
 from fief.models import Tenant, User
 from fief.models.generics import BaseModel
 from fief.paths import EMAIL_TEMPLATES_DIRECTORY
+from fief.redis import close_redis, get_redis_connection_parameters
 from fief.repositories import (
     EmailTemplateRepository,
     TenantRepository,
@@ -28,28 +33,194 @@ from fief.services.email_template.renderers import (
     EmailSubjectRenderer,
     EmailTemplateRenderer,
 )
+from fief.services.webhooks.http_client import close_webhook_http_client
 from fief.settings import settings
 
-redis_parameters = urlparse(settings.redis_url)
-redis_broker = RedisBroker(
-    host=redis_parameters.hostname,
-    port=redis_parameters.port,
-    username=redis_parameters.username,
-    password=redis_parameters.password,
-    # Heroku Redis with TLS use self-signed certs, so we need to tinker a bit
-    ssl=redis_parameters.scheme == "rediss",
-    ssl_cert_reqs=None,
-)
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """
+    Long-lived event loop and database engine of a worker.
+
+    They are reused across messages, so tasks don't pay for a new event loop,
+    connection pool and database handshakes each time.
+
+    By default, each worker thread has its own runtime and runs one task at a time.
+    When given the dramatiq event loop thread, a single runtime per process runs
+    the tasks of all worker threads on the same loop, up to `concurrency` at a time.
+    Tasks are then submitted in the background: worker threads only wait
+    for a free slot, so a few of them are enough to keep the loop busy.
+    Background tasks still running when the runtime is closed are waited for.
+    """
+
+    def __init__(
+        self,
+        event_loop_thread: EventLoopThread | None = None,
+        *,
+        concurrency: int = 0,
+    ) -> None:
+        self._event_loop_thread = event_loop_thread
+        self._runner = asyncio.Runner() if event_loop_thread is None else None
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+        self._tasks: set[asyncio.Task] = set()
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        BabelMiddleware(app=None, **get_babel_middleware_kwargs())  # type: ignore[arg-type]
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        if self._runner is not None:
+            # Each task gets a fresh context, so context variables don't leak between them
+            return self._runner.run(coroutine, context=contextvars.copy_context())
+
+        # The task is scheduled with a copy of the calling thread context
+        event_loop_thread = cast(EventLoopThread, self._event_loop_thread)
+        return event_loop_thread.run_coroutine(self._run_limited(coroutine))
+
+    @property
+    def background(self) -> bool:
+        return self._event_loop_thread is not None
+
+    def submit(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        """
+        Run a coroutine in the background, on the shared event loop.
+
+        Only waits for a free slot.
+        """
+        event_loop_thread = cast(EventLoopThread, self._event_loop_thread)
+        event_loop_thread.run_coroutine(self._submit(coroutine))
+
+    @contextlib.asynccontextmanager
+    async def get_main_session(self) -> AsyncGenerator[AsyncSession, None]:
+        if self._session_maker is None:
+            self._engine = create_main_engine()
+            self._session_maker = create_main_async_session_maker(self._engine)
+        async with self._session_maker() as session:
+            yield session
+
+    def close(self) -> None:
+        self.run(self._dispose())
+        if self._runner is not None:
+            self._runner.close()
+
+    async def _dispose(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await close_webhook_http_client()
+        await close_redis()
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._session_maker = None
+
+    async def _run_limited(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        if self._semaphore is None:
+            return await coroutine
+        async with self._semaphore:
+            return await coroutine
+
+    async def _submit(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        # The task gets a copy of the context, i.e. of the calling thread one
+        task = asyncio.create_task(self._run_released(coroutine))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_released(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        try:
+            await coroutine
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+
+_worker_runtimes = threading.local()
+_async_worker_runtime: WorkerRuntime | None = None
+_async_worker_runtime_lock = threading.Lock()
+
+
+def get_worker_runtime() -> WorkerRuntime:
+    global _async_worker_runtime
+
+    event_loop_thread = get_event_loop_thread()
+    if event_loop_thread is not None:
+        with _async_worker_runtime_lock:
+            if _async_worker_runtime is None:
+                _async_worker_runtime = WorkerRuntime(
+                    event_loop_thread, concurrency=settings.worker_async_concurrency
+                )
+            return _async_worker_runtime
+
+    runtime: WorkerRuntime | None = getattr(_worker_runtimes, "runtime", None)
+    if runtime is None:
+        runtime = WorkerRuntime()
+        _worker_runtimes.runtime = runtime
+    return runtime
+
+
+def close_worker_runtime() -> None:
+    runtime: WorkerRuntime | None = getattr(_worker_runtimes, "runtime", None)
+    if runtime is not None:
+        runtime.close()
+        _worker_runtimes.runtime = None
+
+
+def close_async_worker_runtime() -> None:
+    global _async_worker_runtime
+
+    with _async_worker_runtime_lock:
+        if _async_worker_runtime is not None:
+            _async_worker_runtime.close()
+            _async_worker_runtime = None
+
+
+@contextlib.asynccontextmanager
+async def get_worker_main_session() -> AsyncGenerator[AsyncSession, None]:
+    async with get_worker_runtime().get_main_session() as session:
+        yield session
+
+
+class WorkerRuntimeMiddleware(Middleware):
+    """
+    Dispose the worker runtimes when the worker shuts down.
+    """
+
+    def before_worker_thread_shutdown(self, broker, thread):
+        close_worker_runtime()
+
+    def after_worker_shutdown(self, broker, worker):
+        # Called before the AsyncIO middleware stops the event loop
+        close_async_worker_runtime()
+
+
+redis_broker = RedisBroker(**get_redis_connection_parameters())
 redis_broker.add_middleware(CurrentMessage())
+if settings.worker_async_concurrency > 0:
+    redis_broker.add_middleware(AsyncIO())
+redis_broker.add_middleware(WorkerRuntimeMiddleware())
 dramatiq.set_broker(redis_broker)
 
 
 SendTask = Callable[..., None]
 
 
-def send_task(task: dramatiq.Actor, *args, **kwargs):
+def send_task(
+    task: dramatiq.Actor,
+    *args,
+    delay: int | None = None,
+    retries: int = 0,
+    **kwargs,
+):
+    """
+    Enqueue a task.
+
+    :param delay: Number of milliseconds to wait before running the task.
+    :param retries: Number of attempts already made, counted by the retry policy.
+    """
     logger.debug("Send task", task=task.actor_name)
-    task.send(*args, **kwargs)
+    options = {"retries": retries} if retries else {}
+    task.send_with_options(args=args, kwargs=kwargs, delay=delay, **options)
 
 
 email_provider = settings.get_email_provider()
@@ -71,7 +242,7 @@ class TaskBase:
         self,
         get_main_session: Callable[
             ..., contextlib.AbstractAsyncContextManager[AsyncSession]
-        ] = get_single_main_async_session,
+        ] = get_worker_main_session,
         email_provider: EmailProvider = email_provider,
         send_task: SendTask = send_task,
     ) -> None:
@@ -85,12 +256,51 @@ class TaskBase:
         self.jinja_env.add_extension("jinja2.ext.i18n")
 
     def __call__(self, *args, **kwargs):
-        with asyncio.Runner() as runner:
-            BabelMiddleware(app=None, **get_babel_middleware_kwargs())
-            logger.info("Start task", task=self.__name__)
-            result = runner.run(self.run(*args, **kwargs))
+        runtime = get_worker_runtime()
+        if runtime.background:
+            message = CurrentMessage.get_current_message()
+            runtime.submit(self._run_in_background(message, *args, **kwargs))
+            return None
+
+        logger.info("Start task", task=self.__name__)
+        result = runtime.run(self.run(*args, **kwargs))
+        logger.info("Done task", task=self.__name__)
+        return result
+
+    async def _run_in_background(self, message: Message | None, *args, **kwargs):
+        logger.info("Start task", task=self.__name__)
+        try:
+            await self.run(*args, **kwargs)  # type: ignore[attr-defined]
+        except Exception as e:
+            logger.exception("Task failed", task=self.__name__)
+            # The message is already acknowledged: retry it like dramatiq would
+            if message is not None:
+                broker = dramatiq.get_broker()
+                for middleware in broker.middleware:
+                    if isinstance(middleware, Retries):
+                        middleware.after_process_message(broker, message, exception=e)
+        else:
             logger.info("Done task", task=self.__name__)
-            return result
+
+    async def _send_email(
+        self,
+        *,
+        sender: tuple[str, str | None],
+        recipient: tuple[str, str | None],
+        subject: str,
+        html: str | None = None,
+        text: str | None = None,
+    ) -> None:
+        # Email providers block on network I/O:
+        # don't stall the other tasks running on the event loop.
+        await asyncio.to_thread(
+            self.email_provider.send_email,
+            sender=sender,
+            recipient=recipient,
+            subject=subject,
+            html=html,
+            text=text,
+        )
 
     async def _get_user(self, user_id: UUID4) -> User:
         async with self.get_main_session() as session:
@@ -1,6 +1,10 @@
+import time
+
 import dramatiq
 
+from fief.logger import logger
 from fief.repositories import (
+    AuditLogRepository,
     AuthorizationCodeRepository,
     EmailVerificationRepository,
     LoginSessionRepository,
@@ -8,8 +12,11 @@ from fief.repositories import (
     RefreshTokenRepository,
     RegistrationSessionRepository,
     SessionTokenRepository,
+    WebhookLogRepository,
 )
 from fief.repositories.base import ExpiresAtRepositoryProtocol
+from fief.services.log_retention import LogRetentionService
+from fief.settings import settings
 from fief.tasks.base import TaskBase
 
 repository_classes: list[type[ExpiresAtRepositoryProtocol]] = [
@@ -24,13 +31,61 @@ repository_classes: list[type[ExpiresAtRepositoryProtocol]] = [
 
 
 class CleanupTask(TaskBase):
+    """
+    Delete expired rows.
+
+    Rows are deleted in chunks of `chunk_size` rows, each committed separately,
+    taking turns between tables.
+    The run stops after `max_duration_seconds`:
+    it's scheduled frequently, so the next run picks up where it left off.
+    """
+
     __name__ = "cleanup"
 
+    def __init__(
+        self,
+        *args,
+        chunk_size: int = settings.cleanup_chunk_size,
+        max_duration_seconds: float = settings.cleanup_max_duration_seconds,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.chunk_size = chunk_size
+        self.max_duration_seconds = max_duration_seconds
+
     async def run(self):
+        deadline = time.monotonic() + self.max_duration_seconds
         async with self.get_main_session() as session:
-            for repository_class in repository_classes:
-                repository = repository_class(session)
-                await repository.delete_expired()
+            repositories = [
+                repository_class(session) for repository_class in repository_classes
+            ]
+            deleted = {repository.model.__tablename__: 0 for repository in repositories}
+            while repositories and time.monotonic() < deadline:
+                for repository in list(repositories):
+                    chunk_deleted = await repository.delete_expired(self.chunk_size)
+                    deleted[repository.model.__tablename__] += chunk_deleted
+                    if chunk_deleted < self.chunk_size:
+                        repositories.remove(repository)
+
+            for table, table_deleted in deleted.items():
+                if table_deleted > 0:
+                    logger.info(
+                        "Expired rows deleted", table=table, deleted=table_deleted
+                    )
+            if repositories:
+                logger.info(
+                    "Cleanup interrupted",
+                    remaining_tables=[
+                        repository.model.__tablename__ for repository in repositories
+                    ],
+                )
+
+            log_retention = LogRetentionService(
+                AuditLogRepository(session),
+                WebhookLogRepository(session),
+                deadline=deadline,
+            )
+            await log_retention.run()
 
 
 cleanup = dramatiq.actor(CleanupTask())
@@ -46,7 +46,7 @@ class OnEmailVerificationRequestedTask(TaskBase):
                     EmailTemplateType.VERIFY_EMAIL, context
                 )
 
-            self.email_provider.send_email(
+            await self._send_email(
                 sender=tenant.get_email_sender(),
                 recipient=(email_verification.email, None),
                 subject=subject,
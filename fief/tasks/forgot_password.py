@@ -31,7 +31,7 @@ class OnAfterForgotPasswordTask(TaskBase):
                 EmailTemplateType.FORGOT_PASSWORD, context
             )
 
-        self.email_provider.send_email(
+        await self._send_email(
             sender=tenant.get_email_sender(),
             recipient=(user.email, None),
             subject=subject,
@@ -30,7 +30,7 @@ class OnAfterRegisterTask(TaskBase):
                 EmailTemplateType.WELCOME, context
             )
 
-        self.email_provider.send_email(
+        await self._send_email(
             sender=tenant.get_email_sender(),
             recipient=(user.email, None),
             subject=subject,
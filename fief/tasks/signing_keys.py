@@ -0,0 +1,70 @@
+import asyncio
+from collections.abc import Callable
+
+import dramatiq
+from redis.asyncio import Redis
+
+from fief.crypto.jwk import SignatureAlgorithm, generate_signature_jwk_string
+from fief.logger import logger
+from fief.models import PooledSigningKey
+from fief.redis import get_redis
+from fief.repositories import PooledSigningKeyRepository
+from fief.settings import settings
+from fief.tasks.base import TaskBase
+
+LOCK_KEY = "fief:replenish_signing_keys"
+LOCK_TIMEOUT_SECONDS = 300
+
+
+class ReplenishSigningKeysTask(TaskBase):
+    """
+    Generate the keys missing from the signing keys pool.
+
+    A replenishment is enqueued each time a key is drawn from the pool,
+    so runs are serialized with a Redis lock:
+    otherwise, concurrent runs would all generate the same missing keys.
+    Runs finding the lock held are skipped, since the pool is being replenished.
+    """
+
+    __name__ = "replenish_signing_keys"
+
+    def __init__(
+        self, *args, get_redis: Callable[[], Redis] = get_redis, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.get_redis = get_redis
+
+    async def run(self):
+        lock = self.get_redis().lock(LOCK_KEY, timeout=LOCK_TIMEOUT_SECONDS)
+        if not await lock.acquire(blocking=False):
+            logger.debug("Signing keys pool already being replenished")
+            return
+
+        try:
+            await self._replenish()
+        finally:
+            await lock.release()
+
+    async def _replenish(self):
+        async with self.get_main_session() as session:
+            repository = PooledSigningKeyRepository(session)
+            for algorithm in SignatureAlgorithm:
+                count = await repository.count_by_algorithm(algorithm)
+                missing = settings.signing_key_pool_size - count
+                for _ in range(missing):
+                    # Key generation is CPU-bound: don't block the event loop
+                    jwk = await asyncio.to_thread(
+                        generate_signature_jwk_string, algorithm
+                    )
+                    await repository.create(
+                        PooledSigningKey(algorithm=algorithm, jwk=jwk)
+                    )
+                if missing > 0:
+                    logger.debug(
+                        "Signing keys pool replenished",
+                        algorithm=algorithm,
+                        generated=missing,
+                    )
+
+
+replenish_signing_keys = dramatiq.actor(ReplenishSigningKeysTask())
@@ -3,7 +3,12 @@ import uuid
 import dramatiq
 
 from fief.models import Role, User
-from fief.repositories import RoleRepository, UserPermissionRepository, UserRepository
+from fief.repositories import (
+    RoleRepository,
+    UserPermissionRepository,
+    UserRepository,
+    UserRoleRepository,
+)
 from fief.services.user_role_permissions import UserRolePermissionsService
 from fief.tasks.base import ObjectDoesNotExistTaskError, TaskBase
 
@@ -24,9 +29,8 @@ class OnUserRoleCreated(TaskBase):
             if user is None:
                 raise ObjectDoesNotExistTaskError(User, user_id)
 
-            user_permission_repository = UserPermissionRepository(session)
             user_role_permissions = UserRolePermissionsService(
-                user_permission_repository
+                UserPermissionRepository(session), UserRoleRepository(session)
             )
             await user_role_permissions.add_role_permissions(user, role)
 
@@ -47,9 +51,8 @@ class OnUserRoleDeleted(TaskBase):
             if user is None:
                 raise ObjectDoesNotExistTaskError(User, user_id)
 
-            user_permission_repository = UserPermissionRepository(session)
             user_role_permissions = UserRolePermissionsService(
-                user_permission_repository
+                UserPermissionRepository(session), UserRoleRepository(session)
             )
             await user_role_permissions.delete_role_permissions(user, role)
 
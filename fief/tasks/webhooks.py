@@ -1,35 +1,90 @@
+import asyncio
+import random
 import uuid
+from collections.abc import Awaitable
 
 import dramatiq
+from dramatiq.common import compute_backoff
 from dramatiq.middleware import CurrentMessage
+from dramatiq.middleware.retries import DEFAULT_MAX_BACKOFF, DEFAULT_MIN_BACKOFF
 
+from fief.logger import logger
 from fief.models import Webhook
-from fief.repositories import WebhookLogRepository, WebhookRepository
+from fief.repositories import WebhookRepository
+from fief.services.webhooks.batch import WebhookBatchBuffer
+from fief.services.webhooks.circuit_breaker import webhook_circuit_breaker
 from fief.services.webhooks.delivery import WebhookDelivery, WebhookDeliveryError
 from fief.services.webhooks.models import WebhookEvent
 from fief.settings import settings
 from fief.tasks.base import ObjectDoesNotExistTaskError, TaskBase
 
 
-class DeliverWebhookTask(TaskBase):
-    __name__ = "deliver_webhook"
-
-    async def run(self, webhook_id: str, event: str):
+class DeliverWebhookTaskBase(TaskBase):
+    async def _get_webhook(self, webhook_id: str) -> Webhook:
         async with self.get_main_session() as session:
             webhook_repository = WebhookRepository(session)
             webhook = await webhook_repository.get_by_id(uuid.UUID(webhook_id))
 
-            if webhook is None:
-                raise ObjectDoesNotExistTaskError(Webhook, webhook_id)
+        if webhook is None:
+            raise ObjectDoesNotExistTaskError(Webhook, webhook_id)
 
-            retries = 0
-            if (message := CurrentMessage.get_current_message()) is not None:
-                retries = message.options.get("retries", 0)
+        return webhook
 
-            webhook_log_repository = WebhookLogRepository(session)
-            webhook_delivery = WebhookDelivery(webhook_log_repository)
-            parsed_event = WebhookEvent.model_validate_json(event)
-            await webhook_delivery.deliver(webhook, parsed_event, attempt=retries + 1)
+    def _get_retries(self) -> int:
+        if (message := CurrentMessage.get_current_message()) is not None:
+            return message.options.get("retries", 0)
+        return 0
+
+    def _get_attempt(self) -> int:
+        return self._get_retries() + 1
+
+    async def _get_deferral_delay(self, webhook_id: str) -> int | None:
+        """
+        Returns the number of milliseconds to defer the delivery by
+        if the circuit of the webhook is open.
+        """
+        deferral = await webhook_circuit_breaker.get_deferral(uuid.UUID(webhook_id))
+        if deferral is None:
+            return None
+
+        # Spread deferred deliveries, so the backlog doesn't hit the receiver at once
+        delay = int((deferral + random.uniform(0, deferral * 0.1 + 1.0)) * 1000)
+        logger.info("Webhook delivery deferred", webhook_id=webhook_id, delay=delay)
+        return delay
+
+    async def _deliver(self, webhook: Webhook, delivery: Awaitable[None]) -> None:
+        try:
+            await delivery
+        except WebhookDeliveryError:
+            await webhook_circuit_breaker.record_failure(webhook.id)
+            raise
+        await webhook_circuit_breaker.record_success(webhook.id)
+
+
+class DeliverWebhookTask(DeliverWebhookTaskBase):
+    __name__ = "deliver_webhook"
+
+    async def run(self, webhook_id: str, event: str):
+        if (delay := await self._get_deferral_delay(webhook_id)) is not None:
+            # Keep counting the attempts made so far
+            self.send_task(
+                deliver_webhook,
+                webhook_id=webhook_id,
+                event=event,
+                delay=delay,
+                retries=self._get_retries(),
+            )
+            return
+
+        webhook = await self._get_webhook(webhook_id)
+        webhook_delivery = WebhookDelivery(self.get_main_session)
+        parsed_event = WebhookEvent.model_validate_json(event)
+        await self._deliver(
+            webhook,
+            webhook_delivery.deliver(
+                webhook, parsed_event, attempt=self._get_attempt()
+            ),
+        )
 
 
 def should_retry_deliver_webhook(retries_so_far, exception):
@@ -43,19 +98,172 @@ deliver_webhook = dramatiq.actor(
 )
 
 
-class TriggerWebhooksTask(TaskBase):
+class DeliverWebhookBatchTask(DeliverWebhookTaskBase):
+    __name__ = "deliver_webhook_batch"
+
+    async def run(self, webhook_id: str, events: list[str]):
+        if (delay := await self._get_deferral_delay(webhook_id)) is not None:
+            self.send_task(
+                deliver_webhook_batch,
+                webhook_id=webhook_id,
+                events=events,
+                delay=delay,
+                retries=self._get_retries(),
+            )
+            return
+
+        webhook = await self._get_webhook(webhook_id)
+        webhook_delivery = WebhookDelivery(self.get_main_session)
+        parsed_events = [WebhookEvent.model_validate_json(event) for event in events]
+        await self._deliver(
+            webhook,
+            webhook_delivery.deliver_batch(
+                webhook, parsed_events, attempt=self._get_attempt()
+            ),
+        )
+
+
+deliver_webhook_batch = dramatiq.actor(
+    DeliverWebhookBatchTask(), retry_when=should_retry_deliver_webhook
+)
+
+
+class WebhookBatchTaskBase(TaskBase):
+    def __init__(
+        self, *args, webhook_batch_buffer: WebhookBatchBuffer | None = None, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.webhook_batch_buffer = webhook_batch_buffer or WebhookBatchBuffer()
+
+    def _schedule_flush(self, webhook_id: str, *, immediate: bool) -> None:
+        self.send_task(
+            flush_webhook_batch,
+            webhook_id=webhook_id,
+            delay=None if immediate else settings.webhooks_batch_max_wait_ms,
+        )
+
+
+class FlushWebhookBatchTask(WebhookBatchTaskBase):
+    """
+    Take the events waiting for a webhook and deliver them in a single request.
+
+    The delivery is done by another task, holding the events,
+    so failed deliveries are retried with the same batch.
+    """
+
+    __name__ = "flush_webhook_batch"
+
+    async def run(self, webhook_id: str):
+        max_events = settings.webhooks_batch_max_events
+        events, remaining = await self.webhook_batch_buffer.pop(
+            uuid.UUID(webhook_id), max_events
+        )
+        if events:
+            self.send_task(deliver_webhook_batch, webhook_id=webhook_id, events=events)
+
+        # Events queued while we were flushing: make sure they're not left behind
+        if remaining > 0:
+            self._schedule_flush(webhook_id, immediate=remaining >= max_events)
+
+
+flush_webhook_batch = dramatiq.actor(FlushWebhookBatchTask())
+
+
+class TriggerWebhooksTask(WebhookBatchTaskBase, DeliverWebhookTaskBase):
+    """
+    Dispatch an event to the webhooks subscribed to it.
+
+    By default, a delivery task is enqueued for each webhook.
+    When `webhooks_fanout_concurrency` is set, deliveries are made directly,
+    concurrently; only the failed ones are enqueued to be retried.
+    """
+
     __name__ = "trigger_webhooks"
 
     async def run(self, event: str):
         async with self.get_main_session() as session:
             webhook_repository = WebhookRepository(session)
-            webhooks = await webhook_repository.all()
             parsed_event = WebhookEvent.model_validate_json(event)
-            for webhook in webhooks:
-                if parsed_event.type in webhook.events:
-                    self.send_task(
-                        deliver_webhook, webhook_id=str(webhook.id), event=event
+            subscribers = await webhook_repository.get_subscribers_by_event(
+                parsed_event.type
+            )
+
+        webhook_ids: list[uuid.UUID] = []
+        for webhook_id, batch in subscribers:
+            if batch:
+                await self._queue_event(webhook_id, event)
+            else:
+                webhook_ids.append(webhook_id)
+
+        if settings.webhooks_fanout_concurrency > 0:
+            await self._fan_out(webhook_ids, parsed_event, event)
+        else:
+            for webhook_id in webhook_ids:
+                self.send_task(deliver_webhook, webhook_id=str(webhook_id), event=event)
+
+    async def _fan_out(
+        self, webhook_ids: list[uuid.UUID], parsed_event: WebhookEvent, event: str
+    ):
+        if not webhook_ids:
+            return
+
+        async with self.get_main_session() as session:
+            webhook_repository = WebhookRepository(session)
+            webhooks = await webhook_repository.list_by_ids(webhook_ids)
+
+        semaphore = asyncio.Semaphore(settings.webhooks_fanout_concurrency)
+        webhook_delivery = WebhookDelivery(self.get_main_session)
+
+        async def _deliver(webhook: Webhook):
+            webhook_id = str(webhook.id)
+            async with semaphore:
+                try:
+                    delay = await self._get_deferral_delay(webhook_id)
+                    if delay is not None:
+                        self.send_task(
+                            deliver_webhook,
+                            webhook_id=webhook_id,
+                            event=event,
+                            delay=delay,
+                        )
+                        return
+
+                    await self._deliver(
+                        webhook, webhook_delivery.deliver(webhook, parsed_event)
+                    )
+                except WebhookDeliveryError as e:
+                    # Retry as if it was the first attempt of a delivery task
+                    if should_retry_deliver_webhook(0, e):
+                        _, delay = compute_backoff(
+                            1,
+                            factor=DEFAULT_MIN_BACKOFF,
+                            max_backoff=DEFAULT_MAX_BACKOFF,
+                        )
+                        self.send_task(
+                            deliver_webhook,
+                            webhook_id=webhook_id,
+                            event=event,
+                            delay=delay,
+                            retries=1,
+                        )
+                # A failing webhook must not prevent the delivery to the others
+                except Exception:
+                    logger.exception(
+                        "Webhook fan-out delivery failed", webhook_id=webhook_id
                     )
+                    self.send_task(deliver_webhook, webhook_id=webhook_id, event=event)
+
+        await asyncio.gather(*(_deliver(webhook) for webhook in webhooks))
+
+    async def _queue_event(self, webhook_id: uuid.UUID, event: str):
+        max_events = settings.webhooks_batch_max_events
+        queued = await self.webhook_batch_buffer.push(webhook_id, event)
+        # Flush a full batch right away,
+        # otherwise wait for more events after the first one of a batch.
+        if queued % max_events == 0:
+            self._schedule_flush(str(webhook_id), immediate=True)
+        elif queued == 1:
+            self._schedule_flush(str(webhook_id), immediate=False)
 
 
 trigger_webhooks = dramatiq.actor(TriggerWebhooksTask())
@@ -27,10 +27,20 @@ from fief.dependencies.fief import get_fief
 from fief.dependencies.tasks import get_send_task
 from fief.dependencies.tenant_email_domain import get_tenant_email_domain
 from fief.dependencies.theme import get_theme_preview
+from fief.ephemeral_store import MemoryEphemeralStore, memory_ephemeral_store
 from fief.models import AdminAPIKey, AdminSessionToken, User
 from fief.services.tenant_email_domain import TenantEmailDomain
 from fief.services.theme_preview import ThemePreview
+from fief.services.user_permissions_cache import (
+    UserPermissionsCache,
+    user_permissions_cache,
+)
+from fief.services.webhooks.circuit_breaker import (
+    WebhookCircuitBreaker,
+    webhook_circuit_breaker,
+)
 from fief.settings import settings
+from fief.settings_class import EphemeralStoreBackend
 from tests.data import ModelMapping, TestData, data_mapping, session_token_tokens
 from tests.types import GetTestDatabase, HTTPClientGeneratorType, TenantParams
 
@@ -129,6 +139,39 @@ def main_session_manager(main_session: AsyncSession):
     return _main_session_manager
 
 
+@pytest.fixture(autouse=True)
+def local_user_permissions_cache() -> Generator[UserPermissionsCache, None, None]:
+    # No Redis in tests, and the database is rolled back after each test
+    user_permissions_cache.clear()
+    with patch.object(user_permissions_cache, "get_redis", None):
+        yield user_permissions_cache
+    user_permissions_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def local_webhook_circuit_breaker() -> Generator[WebhookCircuitBreaker, None, None]:
+    webhook_circuit_breaker.clear()
+    with patch.object(webhook_circuit_breaker, "get_redis", None):
+        yield webhook_circuit_breaker
+    webhook_circuit_breaker.clear()
+
+
+@pytest.fixture
+def memory_store() -> Generator[MemoryEphemeralStore, None, None]:
+    memory_ephemeral_store.clear()
+    with patch.object(settings, "ephemeral_store", EphemeralStoreBackend.MEMORY):
+        yield memory_ephemeral_store
+    memory_ephemeral_store.clear()
+
+
+@pytest.fixture
+def session_token_memory_store() -> Generator[MemoryEphemeralStore, None, None]:
+    memory_ephemeral_store.clear()
+    with patch.object(settings, "session_token_store", EphemeralStoreBackend.MEMORY):
+        yield memory_ephemeral_store
+    memory_ephemeral_store.clear()
+
+
 @pytest.fixture
 def not_existing_uuid() -> uuid.UUID:
     return uuid.uuid4()
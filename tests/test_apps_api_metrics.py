@@ -0,0 +1,28 @@
+import httpx
+import pytest
+from fastapi import status
+
+from tests.helpers import HTTPXResponseAssertion
+
+
+@pytest.mark.asyncio
+class TestGetMetrics:
+    async def test_unauthorized(
+        self,
+        unauthorized_api_assertions: HTTPXResponseAssertion,
+        test_client_api: httpx.AsyncClient,
+    ):
+        response = await test_client_api.get("/metrics/")
+
+        unauthorized_api_assertions(response)
+
+    @pytest.mark.authenticated_admin
+    async def test_valid(self, test_client_api: httpx.AsyncClient):
+        response = await test_client_api.get("/metrics/")
+
+        assert response.status_code == status.HTTP_200_OK
+
+        json = response.json()
+        executor_names = [executor["name"] for executor in json["executors"]]
+        assert "crypto" in executor_names
+        assert "password" in executor_names
@@ -1,14 +1,21 @@
 import uuid
+from unittest.mock import MagicMock
 
 import httpx
 import pytest
 from fastapi import status
 from sqlalchemy import select
 
+from fief.crypto.jwk import SignatureAlgorithm, generate_signature_jwk_string
 from fief.db import AsyncSession
 from fief.errors import APIErrorCode
-from fief.models import Client
-from fief.repositories import ClientRepository
+from fief.models import Client, PooledSigningKey
+from fief.repositories import (
+    ClientRepository,
+    PooledSigningKeyRepository,
+    TenantRepository,
+)
+from fief.tasks import replenish_signing_keys
 from tests.data import TestData
 from tests.helpers import HTTPXResponseAssertion
 
@@ -119,6 +126,45 @@ class TestCreateTenant:
         assert client.first_party is True
         assert client.redirect_uris == ["http://localhost:8000/docs/oauth2-redirect"]
 
+    @pytest.mark.parametrize("sign_algorithm", list(SignatureAlgorithm))
+    @pytest.mark.authenticated_admin
+    async def test_sign_algorithm(
+        self,
+        sign_algorithm: SignatureAlgorithm,
+        test_client_api: httpx.AsyncClient,
+        send_task_mock: MagicMock,
+    ):
+        response = await test_client_api.post(
+            "/tenants/", json={"name": "Tertiary", "sign_algorithm": sign_algorithm}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+        json = response.json()
+        assert json["sign_algorithm"] == sign_algorithm
+
+        send_task_mock.assert_any_call(replenish_signing_keys)
+
+    @pytest.mark.authenticated_admin
+    async def test_pooled_signing_key(
+        self, test_client_api: httpx.AsyncClient, main_session: AsyncSession
+    ):
+        pooled_signing_key_repository = PooledSigningKeyRepository(main_session)
+        pooled_jwk = generate_signature_jwk_string(SignatureAlgorithm.RS256)
+        await pooled_signing_key_repository.create(
+            PooledSigningKey(algorithm=SignatureAlgorithm.RS256, jwk=pooled_jwk)
+        )
+
+        response = await test_client_api.post("/tenants/", json={"name": "Tertiary"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+        json = response.json()
+        tenant_repository = TenantRepository(main_session)
+        tenant = await tenant_repository.get_by_id(uuid.UUID(json["id"]))
+        assert tenant is not None
+        assert tenant.sign_jwk == pooled_jwk
+
     @pytest.mark.authenticated_admin
     async def test_slug_collision(self, test_client_api: httpx.AsyncClient):
         response = await test_client_api.post("/tenants/", json={"name": "Secondary"})
@@ -312,6 +358,82 @@ class TestUpdateTenant:
         assert json["oauth_providers"][0]["id"] == str(oauth_provider_id)
 
 
+@pytest.mark.asyncio
+class TestCreateTenantSigningKey:
+    async def test_unauthorized(
+        self,
+        unauthorized_api_assertions: HTTPXResponseAssertion,
+        test_client_api: httpx.AsyncClient,
+        test_data: TestData,
+    ):
+        tenant = test_data["tenants"]["default"]
+        response = await test_client_api.post(
+            f"/tenants/{tenant.id}/signing-key", json={}
+        )
+
+        unauthorized_api_assertions(response)
+
+    @pytest.mark.authenticated_admin
+    async def test_not_existing(
+        self, test_client_api: httpx.AsyncClient, not_existing_uuid: uuid.UUID
+    ):
+        response = await test_client_api.post(
+            f"/tenants/{not_existing_uuid}/signing-key", json={}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.authenticated_admin
+    async def test_valid(
+        self,
+        test_client_api: httpx.AsyncClient,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        tenant = test_data["tenants"]["default"]
+        previous_kid = tenant.get_sign_jwk()["kid"]
+        response = await test_client_api.post(
+            f"/tenants/{tenant.id}/signing-key",
+            json={"algorithm": SignatureAlgorithm.ES256},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+        json = response.json()
+        assert json["sign_algorithm"] == SignatureAlgorithm.ES256
+
+        repository = TenantRepository(main_session)
+        updated_tenant = await repository.get_by_id(tenant.id)
+        assert updated_tenant is not None
+        assert updated_tenant.get_sign_jwk()["kid"] != previous_kid
+        keyset = updated_tenant.get_sign_jwk_set()
+        assert keyset.get_key(previous_kid) is not None
+
+    @pytest.mark.authenticated_admin
+    async def test_no_overlap(
+        self,
+        test_client_api: httpx.AsyncClient,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        tenant = test_data["tenants"]["default"]
+        previous_kid = tenant.get_sign_jwk()["kid"]
+        response = await test_client_api.post(
+            f"/tenants/{tenant.id}/signing-key", json={"overlap_seconds": 0}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+        json = response.json()
+        assert json["sign_algorithm"] == SignatureAlgorithm.RS256
+
+        repository = TenantRepository(main_session)
+        updated_tenant = await repository.get_by_id(tenant.id)
+        assert updated_tenant is not None
+        keyset = updated_tenant.get_sign_jwk_set()
+        assert keyset.get_key(previous_kid) is None
+
+
 @pytest.mark.asyncio
 class TestDeleteTenant:
     async def test_unauthorized(
@@ -1,6 +1,6 @@
 import uuid
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
@@ -10,6 +10,8 @@ from fief.db import AsyncSession
 from fief.errors import APIErrorCode
 from fief.models import User
 from fief.repositories import UserPermissionRepository, UserRoleRepository
+from fief.services.user_manager import user_claims_cache
+from fief.services.user_permissions_cache import UserPermissionsCache
 from fief.tasks import on_after_register, on_user_role_created, on_user_role_deleted
 from tests.data import TestData, tenants, users
 from tests.helpers import HTTPXResponseAssertion
@@ -90,6 +92,88 @@ class TestListUsers:
             [result.id for result in results]
         )
 
+    @pytest.mark.authenticated_admin
+    async def test_cursor(
+        self, test_client_api: httpx.AsyncClient, test_data: TestData
+    ):
+        pages: list[list[str]] = []
+        cursor: str | None = ""
+        while cursor is not None:
+            response = await test_client_api.get(
+                "/users/", params={"cursor": cursor, "limit": 2}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            json = response.json()
+            assert json["count"] == len(test_data["users"])
+            assert len(json["results"]) <= 2
+            assert (json["prev"] is None) == (len(pages) == 0)
+            pages.append([result["id"] for result in json["results"]])
+            cursor = json["next"]
+
+        ids = [id for page in pages for id in page]
+        assert len(ids) == len(set(ids))
+        assert set(ids) == {str(user.id) for user in test_data["users"].values()}
+
+        # Go back from the last page
+        response = await test_client_api.get(
+            "/users/", params={"cursor": json["prev"], "limit": 2}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        json = response.json()
+        assert [result["id"] for result in json["results"]] == pages[-2]
+        assert json["next"] is not None
+
+    @pytest.mark.authenticated_admin
+    async def test_cursor_without_count(self, test_client_api: httpx.AsyncClient):
+        response = await test_client_api.get(
+            "/users/", params={"cursor": "", "count": False}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+        json = response.json()
+        assert json["count"] is None
+        assert len(json["results"]) > 0
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            pytest.param("INVALID_CURSOR", id="Not base64"),
+            pytest.param("WzEsIDIsIDNd", id="Invalid types"),
+            pytest.param(
+                "WyIyMDI0LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwgMSwgZmFsc2Vd",
+                id="Invalid id type",
+            ),
+            pytest.param(
+                "eyJjcmVhdGVkX2F0IjogIjIwMjQtMDEtMDFUMDA6MDA6MDArMDA6MDAifQ==",
+                id="Not a list",
+            ),
+        ],
+    )
+    @pytest.mark.authenticated_admin
+    async def test_invalid_cursor(
+        self, cursor: str, test_client_api: httpx.AsyncClient
+    ):
+        response = await test_client_api.get("/users/", params={"cursor": cursor})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        json = response.json()
+        assert json["detail"] == APIErrorCode.PAGINATION_INVALID_CURSOR
+
+    @pytest.mark.authenticated_admin
+    async def test_cursor_unsupported_ordering(
+        self, test_client_api: httpx.AsyncClient
+    ):
+        response = await test_client_api.get(
+            "/users/", params={"cursor": "", "ordering": "email"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        json = response.json()
+        assert json["detail"] == APIErrorCode.PAGINATION_CURSOR_UNSUPPORTED_ORDERING
+
 
 @pytest.mark.asyncio
 class TestCreateUser:
@@ -364,9 +448,16 @@ class TestDeleteUser:
     @pytest.mark.authenticated_admin
     async def test_valid(self, test_client_api: httpx.AsyncClient, test_data: TestData):
         user = test_data["users"]["regular"]
-        response = await test_client_api.delete(f"/users/{user.id}")
+        cache_key = (user.tenant_id, user.id)
+        with patch.object(user_claims_cache, "ttl_seconds", 60):
+            user_claims_cache.set(cache_key, user.get_claims())
+            try:
+                response = await test_client_api.delete(f"/users/{user.id}")
 
-        assert response.status_code == status.HTTP_204_NO_CONTENT
+                assert response.status_code == status.HTTP_204_NO_CONTENT
+                assert user_claims_cache.get(cache_key) is None
+            finally:
+                user_claims_cache.clear()
 
 
 @pytest.mark.asyncio
@@ -584,6 +675,26 @@ class TestCreateUserPermission:
             user_permission.permission_id for user_permission in user_permissions
         ]
 
+    @pytest.mark.authenticated_admin
+    async def test_invalidate_permissions_cache(
+        self,
+        test_client_api: httpx.AsyncClient,
+        test_data: TestData,
+        local_user_permissions_cache: UserPermissionsCache,
+    ):
+        permission = test_data["permissions"]["castles:create"]
+        user = test_data["users"]["regular"]
+        await local_user_permissions_cache.get_or_load(
+            user.id, AsyncMock(return_value=["castles:read"])
+        )
+
+        response = await test_client_api.post(
+            f"/users/{user.id}/permissions", json={"id": str(permission.id)}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(local_user_permissions_cache) == 0
+
 
 @pytest.mark.asyncio
 class TestDeleteUserPermission:
@@ -1,9 +1,13 @@
 import uuid
+from datetime import UTC, datetime, timedelta
 
 import httpx
 import pytest
 from fastapi import status
 
+from fief.db import AsyncSession
+from fief.models import WebhookLog
+from fief.repositories import WebhookLogRepository
 from tests.data import TestData
 from tests.helpers import HTTPXResponseAssertion
 
@@ -105,8 +109,25 @@ class TestCreateWebhook:
         json = response.json()
         assert json["url"] == "https://internal.bretagne.duchy/webhook"
         assert json["events"] == ["user.created", "user.forgot_password_requested"]
+        assert json["batch"] is False
         assert "secret" in json
 
+    @pytest.mark.authenticated_admin
+    async def test_batch(self, test_client_api: httpx.AsyncClient, test_data: TestData):
+        response = await test_client_api.post(
+            "/webhooks/",
+            json={
+                "url": "https://internal.bretagne.duchy/webhook",
+                "events": ["user.created"],
+                "batch": True,
+            },
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+        json = response.json()
+        assert json["batch"] is True
+
 
 @pytest.mark.asyncio
 class TestUpdateWebhook:
@@ -252,3 +273,48 @@ class TestListWebhookLogs:
                 if log.webhook_id == webhook.id
             ]
         )
+
+    @pytest.mark.authenticated_admin
+    async def test_cursor(
+        self,
+        test_client_api: httpx.AsyncClient,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        webhook = test_data["webhooks"]["all"]
+        webhook_logs = [
+            log
+            for log in test_data["webhook_logs"].values()
+            if log.webhook_id == webhook.id
+        ]
+        now = datetime.now(UTC)
+        webhook_logs += await WebhookLogRepository(main_session).create_many(
+            [
+                WebhookLog(
+                    webhook_id=webhook.id,
+                    event="user.created",
+                    attempt=1,
+                    payload="{}",
+                    success=True,
+                    created_at=now - timedelta(days=days),
+                )
+                for days in [1, 1, 2]
+            ]
+        )
+
+        results = []
+        cursor: str | None = ""
+        while cursor is not None:
+            response = await test_client_api.get(
+                f"/webhooks/{webhook.id}/logs", params={"cursor": cursor, "limit": 1}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            json = response.json()
+            results.extend(json["results"])
+            cursor = json["next"]
+
+        assert len(results) == len(webhook_logs)
+        # Latest first
+        assert [result["created_at"] for result in results] == sorted(
+            [result["created_at"] for result in results], reverse=True
+        )
@@ -1,13 +1,17 @@
 import urllib.parse
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
 from bs4 import BeautifulSoup
 from fastapi import status
 
-from fief.crypto.token import get_token_hash
+from fief.crypto.password import password_executor
+from fief.crypto.token import generate_token, get_token_hash
 from fief.db import AsyncSession
+from fief.ephemeral_store import MemoryEphemeralStore
+from fief.errors import APIErrorCode
+from fief.models import SessionToken
 from fief.repositories import (
     EmailVerificationRepository,
     GrantRepository,
@@ -15,6 +19,7 @@ from fief.repositories import (
     SessionTokenRepository,
     UserRepository,
 )
+from fief.repositories.ephemeral import EphemeralSessionTokenRepository
 from fief.services.acr import ACR
 from fief.services.response_type import DEFAULT_RESPONSE_MODE, HYBRID_RESPONSE_TYPES
 from fief.settings import settings
@@ -602,6 +607,38 @@ class TestAuthPostLogin:
         headers = response.headers
         assert headers["X-Fief-Error"] == "bad_credentials"
 
+    async def test_password_executor_busy(
+        self,
+        test_client_auth_csrf: httpx.AsyncClient,
+        csrf_token: str,
+        test_data: TestData,
+    ):
+        login_session = test_data["login_sessions"]["default"]
+        client = login_session.client
+        tenant = client.tenant
+        path_prefix = tenant.slug if not tenant.default else ""
+
+        cookies = {}
+        cookies[settings.login_session_cookie_name] = login_session.token
+
+        with (
+            patch.object(password_executor, "max_pending", 1),
+            patch.object(password_executor.metrics, "in_flight", 1),
+        ):
+            response = await test_client_auth_csrf.post(
+                f"{path_prefix}/login",
+                data={
+                    "email": "anne@bretagne.duchy",
+                    "password": "herminetincture",
+                    "csrf_token": csrf_token,
+                },
+                cookies=cookies,
+            )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["detail"] == APIErrorCode.SERVER_BUSY
+        assert response.headers["Retry-After"] == "1"
+
     async def test_valid(
         self,
         test_client_auth_csrf: httpx.AsyncClient,
@@ -1454,3 +1491,35 @@ class TestAuthLogout:
             session_token_tokens["regular"][1]
         )
         assert deleted_session_token is None
+
+    async def test_session_token_store(
+        self,
+        test_client_auth: httpx.AsyncClient,
+        test_data: TestData,
+        main_session: AsyncSession,
+        session_token_memory_store: MemoryEphemeralStore,
+    ):
+        user = test_data["users"]["regular"]
+        tenant = user.tenant
+        path_prefix = tenant.slug if not tenant.default else ""
+
+        token, token_hash = generate_token()
+        session_token_repository = EphemeralSessionTokenRepository(
+            main_session, session_token_memory_store
+        )
+        await session_token_repository.create(
+            SessionToken(token=token_hash, user_id=user.id)
+        )
+
+        cookies = {}
+        cookies[settings.session_cookie_name] = token
+
+        redirect_uri = "https://www.bretagne.duchy/"
+        response = await test_client_auth.get(
+            f"{path_prefix}/logout",
+            params={"redirect_uri": redirect_uri},
+            cookies=cookies,
+        )
+
+        assert response.status_code == status.HTTP_302_FOUND
+        assert await session_token_repository.get_by_token(token_hash) is None
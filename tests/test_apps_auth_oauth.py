@@ -12,7 +12,8 @@ from pytest_mock import MockerFixture
 
 from fief.crypto.token import get_token_hash
 from fief.db import AsyncSession
-from fief.models import RegistrationSessionFlow
+from fief.ephemeral_store import MemoryEphemeralStore
+from fief.models import OAuthSession, RegistrationSessionFlow
 from fief.repositories import (
     OAuthAccountRepository,
     OAuthSessionRepository,
@@ -20,6 +21,10 @@ from fief.repositories import (
     SessionTokenRepository,
     TenantRepository,
 )
+from fief.repositories.ephemeral import (
+    EphemeralOAuthSessionRepository,
+    EphemeralRegistrationSessionRepository,
+)
 from fief.settings import settings
 from tests.data import TestData
 
@@ -635,6 +640,70 @@ class TestOAuthCallback:
         assert registration_session.oauth_account_id == oauth_account.id
         assert registration_session.email == oauth_account.account_email
 
+    async def test_new_account_ephemeral_store(
+        self,
+        mocker: MockerFixture,
+        test_client_auth: httpx.AsyncClient,
+        test_data: TestData,
+        main_session: AsyncSession,
+        memory_store: MemoryEphemeralStore,
+    ):
+        tenant = test_data["tenants"]["default"]
+        oauth_session_repository = EphemeralOAuthSessionRepository(
+            main_session, memory_store
+        )
+        oauth_session = await oauth_session_repository.create(
+            OAuthSession(
+                redirect_uri="http://api.fief.dev/oauth/callback",
+                oauth_provider=test_data["oauth_providers"]["google"],
+                tenant=tenant,
+            )
+        )
+
+        oauth_provider_service_mock = MagicMock(spec=BaseOAuth2)
+        oauth_provider_service_mock.get_access_token.side_effect = AsyncMock(
+            return_value={"access_token": "ACCESS_TOKEN"}
+        )
+        oauth_provider_service_mock.get_id_email.side_effect = AsyncMock(
+            return_value=("NEW_ACCOUNT", "louis@bretagne.duchy")
+        )
+        mocker.patch(
+            "fief.apps.auth.routers.oauth.get_oauth_provider_service"
+        ).return_value = oauth_provider_service_mock
+
+        response = await test_client_auth.get(
+            "/oauth/callback",
+            params={
+                "code": "CODE",
+                "redirect_uri": oauth_session.redirect_uri,
+                "state": oauth_session.token,
+            },
+        )
+
+        assert response.status_code == status.HTTP_302_FOUND
+
+        oauth_account_repository = OAuthAccountRepository(main_session)
+        oauth_account = await oauth_account_repository.get_by_provider_and_account_id(
+            oauth_session.oauth_provider_id, "NEW_ACCOUNT"
+        )
+        assert oauth_account is not None
+
+        updated_oauth_session = await oauth_session_repository.get_by_token(
+            oauth_session.token
+        )
+        assert updated_oauth_session is not None
+        assert updated_oauth_session.oauth_account_id == oauth_account.id
+
+        registration_session_repository = EphemeralRegistrationSessionRepository(
+            main_session, memory_store
+        )
+        registration_session = await registration_session_repository.get_by_token(
+            response.cookies[settings.registration_session_cookie_name]
+        )
+        assert registration_session is not None
+        assert registration_session.oauth_account_id == oauth_account.id
+        assert registration_session.email == oauth_account.account_email
+
     async def test_secondary_tenant_invalid_login_session(
         self, test_client_auth: httpx.AsyncClient, test_data: TestData
     ):
@@ -1,13 +1,17 @@
 import base64
+from datetime import UTC, datetime
 
 import httpx
 import pytest
 from fastapi import status
 
-from fief.crypto.token import get_token_hash
+from fief.crypto.id_token import get_validation_hash
+from fief.crypto.token import generate_token, get_token_hash
 from fief.db import AsyncSession
-from fief.models import Client
+from fief.ephemeral_store import MemoryEphemeralStore
+from fief.models import AuthorizationCode, Client
 from fief.repositories import AuthorizationCodeRepository, RefreshTokenRepository
+from fief.repositories.ephemeral import EphemeralAuthorizationCodeRepository
 from fief.services.acr import ACR
 from tests.data import (
     TestData,
@@ -547,6 +551,52 @@ class TestAuthTokenAuthorizationCode:
             access_token=json["access_token"],
         )
 
+    async def test_ephemeral_store(
+        self,
+        test_client_auth: httpx.AsyncClient,
+        test_data: TestData,
+        main_session: AsyncSession,
+        memory_store: MemoryEphemeralStore,
+    ):
+        client = test_data["clients"]["default_tenant"]
+        code, code_hash = generate_token()
+        authorization_code_repository = EphemeralAuthorizationCodeRepository(
+            main_session, memory_store
+        )
+        await authorization_code_repository.create(
+            AuthorizationCode(
+                code=code_hash,
+                c_hash=get_validation_hash(code),
+                redirect_uri="https://bretagne.duchy/callback",
+                user_id=test_data["users"]["regular"].id,
+                client_id=client.id,
+                scope=["openid"],
+                authenticated_at=datetime.now(UTC),
+                expires_at=client.get_authorization_code_expires_at(),
+            )
+        )
+
+        headers, data = get_authenticated_request_headers_data(
+            "client_secret_basic", client
+        )
+        request_data = {
+            **data,
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": "https://bretagne.duchy/callback",
+        }
+        response = await test_client_auth.post(
+            "/api/token", headers=headers, data=request_data
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        # Authorization codes can be used only once
+        response = await test_client_auth.post(
+            "/api/token", headers=headers, data=request_data
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["error"] == "invalid_grant"
+
 
 @pytest.mark.asyncio
 class TestAuthTokenRefreshToken:
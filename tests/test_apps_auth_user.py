@@ -1,6 +1,6 @@
-from collections.abc import AsyncGenerator, Callable
+from collections.abc import AsyncGenerator, Callable, Coroutine
 from datetime import UTC, datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
@@ -12,6 +12,7 @@ from fief.db import AsyncSession
 from fief.errors import APIErrorCode
 from fief.repositories import EmailVerificationRepository, UserRepository
 from fief.services.acr import ACR
+from fief.services.user_manager import user_claims_cache
 from tests.data import TestData, email_verification_codes
 from tests.helpers import email_verification_requested_assertions
 from tests.types import TenantParams
@@ -20,8 +21,8 @@ from tests.types import TenantParams
 @pytest.fixture
 def access_token(
     request: pytest.FixtureRequest, test_data: TestData, tenant_params: TenantParams
-) -> Callable[[httpx.AsyncClient], httpx.AsyncClient]:
-    def _access_token(http_client: httpx.AsyncClient) -> httpx.AsyncClient:
+) -> Callable[[httpx.AsyncClient], Coroutine[None, None, httpx.AsyncClient]]:
+    async def _access_token(http_client: httpx.AsyncClient) -> httpx.AsyncClient:
         marker = request.node.get_closest_marker("access_token")
         if marker:
             from_tenant_params: bool = marker.kwargs.get("from_tenant_params", False)
@@ -45,7 +46,7 @@ def access_token(
                 for permission in test_data["user_permissions"].values()
             ]
 
-            access_token = generate_access_token(
+            access_token = await generate_access_token(
                 user_tenant.get_sign_jwk(),
                 user_tenant.get_host(),
                 client,
@@ -66,9 +67,11 @@ def access_token(
 @pytest_asyncio.fixture
 async def test_client_auth_access_token(
     test_client_auth: httpx.AsyncClient,
-    access_token: Callable[[httpx.AsyncClient], httpx.AsyncClient],
+    access_token: Callable[
+        [httpx.AsyncClient], Coroutine[None, None, httpx.AsyncClient]
+    ],
 ) -> AsyncGenerator[httpx.AsyncClient, None]:
-    test_client_auth_access_token = access_token(test_client_auth)
+    test_client_auth_access_token = await access_token(test_client_auth)
     yield test_client_auth_access_token
 
 
@@ -119,6 +122,29 @@ class TestUserUserinfo:
         json = response.json()
         assert json == user.get_claims()
 
+    @pytest.mark.access_token(from_tenant_params=True)
+    async def test_cached_user_claims(
+        self,
+        method: str,
+        tenant_params: TenantParams,
+        test_client_auth_access_token: httpx.AsyncClient,
+    ):
+        user = tenant_params.user
+        cached_claims = {**user.get_claims(), "email": "cached@bretagne.duchy"}
+        with patch.object(user_claims_cache, "ttl_seconds", 60):
+            user_claims_cache.set((user.tenant_id, user.id), cached_claims)
+            try:
+                response = await test_client_auth_access_token.request(
+                    method, f"{tenant_params.path_prefix}/api/userinfo"
+                )
+            finally:
+                user_claims_cache.clear()
+
+        assert response.status_code == status.HTTP_200_OK
+
+        json = response.json()
+        assert json == cached_claims
+
 
 @pytest.mark.asyncio
 class TestUserUpdateProfile:
@@ -1,9 +1,17 @@
+from unittest.mock import patch
+
 import httpx
 import pytest
 from fastapi import status
 from jwcrypto import jwk
+from sqlalchemy.exc import OperationalError
 
+from fief.crypto.jwk import SignatureAlgorithm
+from fief.db import AsyncSession
+from fief.errors import APIErrorCode
+from fief.repositories import TenantRepository
 from fief.services.response_type import ALLOWED_RESPONSE_TYPES
+from fief.services.well_known import well_known_cache
 from tests.types import TenantParams
 
 
@@ -39,6 +47,7 @@ class TestWellKnownOpenIDConfiguration:
             "client_secret_post",
         ]
         assert json["code_challenge_methods_supported"] == ["plain", "S256"]
+        assert json["id_token_signing_alg_values_supported"] == ["RS256"]
 
         endpoint: str = json["authorization_endpoint"]
         if x_forwarded_host is not None:
@@ -65,3 +74,124 @@ class TestWellKnownJWKS:
         key: jwk.JWK | None = keyset.get_key(tenant_params.tenant.get_sign_jwk()["kid"])
         assert key is not None
         assert key.has_private is False
+
+    async def test_return_previous_public_keys(
+        self,
+        tenant_params: TenantParams,
+        test_client_auth: httpx.AsyncClient,
+        main_session: AsyncSession,
+    ):
+        repository = TenantRepository(main_session)
+        tenant = await repository.get_by_id(tenant_params.tenant.id)
+        assert tenant is not None
+        previous_kid = tenant.get_sign_jwk()["kid"]
+        tenant.rotate_sign_jwk(SignatureAlgorithm.ES256, 3600)
+        await repository.update(tenant)
+
+        response = await test_client_auth.get(
+            f"{tenant_params.path_prefix}/.well-known/jwks.json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+        keyset = jwk.JWKSet.from_json(response.text)
+        assert len(keyset["keys"]) == 2
+        for kid in (tenant.get_sign_jwk()["kid"], previous_kid):
+            key: jwk.JWK | None = keyset.get_key(kid)
+            assert key is not None
+            assert key.has_private is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("document", ["openid-configuration", "jwks.json"])
+class TestWellKnownCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        well_known_cache.clear()
+        yield
+        well_known_cache.clear()
+
+    async def test_caching_headers(
+        self,
+        document: str,
+        tenant_params: TenantParams,
+        test_client_auth: httpx.AsyncClient,
+    ):
+        response = await test_client_auth.get(
+            f"{tenant_params.path_prefix}/.well-known/{document}"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/json"
+        assert response.headers["Cache-Control"] == "public, max-age=300"
+        etag = response.headers["ETag"]
+
+        response = await test_client_auth.get(
+            f"{tenant_params.path_prefix}/.well-known/{document}",
+            headers={"If-None-Match": f'"foo", W/{etag}'},
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    async def test_invalidated_on_key_rotation(
+        self,
+        document: str,
+        tenant_params: TenantParams,
+        test_client_auth: httpx.AsyncClient,
+        main_session: AsyncSession,
+    ):
+        response = await test_client_auth.get(
+            f"{tenant_params.path_prefix}/.well-known/{document}"
+        )
+        etag = response.headers["ETag"]
+
+        repository = TenantRepository(main_session)
+        tenant = await repository.get_by_id(tenant_params.tenant.id)
+        assert tenant is not None
+        tenant.rotate_sign_jwk(SignatureAlgorithm.ES256, 3600)
+        await repository.update(tenant)
+
+        response = await test_client_auth.get(
+            f"{tenant_params.path_prefix}/.well-known/{document}",
+            headers={"If-None-Match": etag},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    async def test_database_unavailable(
+        self,
+        document: str,
+        tenant_params: TenantParams,
+        test_client_auth: httpx.AsyncClient,
+    ):
+        error = OperationalError("SELECT", {}, Exception("Database is down"))
+        with patch(
+            "fief.apps.auth.routers.well_known.get_current_tenant",
+            side_effect=error,
+        ):
+            response = await test_client_auth.get(
+                f"{tenant_params.path_prefix}/.well-known/{document}"
+            )
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert response.json()["detail"] == (
+                APIErrorCode.SERVER_DATABASE_NOT_AVAILABLE
+            )
+
+        response = await test_client_auth.get(
+            f"{tenant_params.path_prefix}/.well-known/{document}"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        content = response.content
+
+        with patch(
+            "fief.apps.auth.routers.well_known.get_current_tenant",
+            side_effect=error,
+        ):
+            response = await test_client_auth.get(
+                f"{tenant_params.path_prefix}/.well-known/{document}"
+            )
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == content
@@ -7,6 +7,7 @@ from bs4 import BeautifulSoup
 from fastapi import status
 from sqlalchemy import select
 
+from fief.crypto.jwk import SignatureAlgorithm
 from fief.db import AsyncSession
 from fief.models import Client
 from fief.repositories import ClientRepository, TenantRepository
@@ -431,6 +432,7 @@ class TestCreateTenant:
             data={
                 "name": "Tertiary",
                 "registration_allowed": True,
+                "sign_algorithm": "RS256",
                 "logo_url": "INVALID_URL",
                 "csrf_token": csrf_token,
             },
@@ -451,6 +453,7 @@ class TestCreateTenant:
             data={
                 "name": "Tertiary",
                 "registration_allowed": True,
+                "sign_algorithm": "RS256",
                 "theme": not_existing_uuid,
                 "csrf_token": csrf_token,
             },
@@ -472,6 +475,7 @@ class TestCreateTenant:
             data={
                 "name": "Tertiary",
                 "registration_allowed": True,
+                "sign_algorithm": "RS256",
                 "oauth_providers": [str(not_existing_uuid)],
                 "csrf_token": csrf_token,
             },
@@ -502,6 +506,7 @@ class TestCreateTenant:
             data={
                 "name": "Tertiary",
                 "registration_allowed": True,
+                "sign_algorithm": "RS256",
                 "theme": theme_id,
                 "oauth_providers": [str(oauth_provider.id)],
                 "logo_url": "https://bretagne.duchy/logo.svg",
@@ -521,6 +526,7 @@ class TestCreateTenant:
         assert tenant.slug == "tertiary"
         assert tenant.default is False
         assert tenant.logo_url == "https://bretagne.duchy/logo.svg"
+        assert tenant.sign_algorithm == SignatureAlgorithm.RS256
         if theme_id is None:
             assert tenant.theme_id is None
         else:
@@ -7,6 +7,7 @@ from fastapi import status
 
 from fief.db import AsyncSession
 from fief.repositories import WebhookRepository
+from fief.services.webhooks.circuit_breaker import WebhookCircuitBreaker
 from tests.data import TestData
 from tests.helpers import HTTPXResponseAssertion
 
@@ -74,6 +75,23 @@ class TestGetWebhook:
         title = html.find("h2")
         assert webhook.url in title.text
 
+    @pytest.mark.authenticated_admin(mode="session")
+    @pytest.mark.htmx(target="aside")
+    async def test_circuit_open(
+        self,
+        test_client_dashboard: httpx.AsyncClient,
+        test_data: TestData,
+        local_webhook_circuit_breaker: WebhookCircuitBreaker,
+    ):
+        webhook = test_data["webhooks"]["all"]
+        for _ in range(local_webhook_circuit_breaker.failure_threshold):
+            await local_webhook_circuit_breaker.record_failure(webhook.id)
+
+        response = await test_client_dashboard.get(f"/webhooks/{webhook.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "Deliveries deferred until" in response.text
+
 
 @pytest.mark.asyncio
 class TestCreateWebhook:
@@ -0,0 +1,128 @@
+import time
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+
+from fief.crypto import access_token
+from fief.crypto.access_token import (
+    ClaimsCache,
+    InvalidAccessToken,
+    read_tenant_access_token,
+)
+from fief.crypto.jwk import SignatureAlgorithm
+from fief.crypto.jwt import sign_jwt
+from fief.models import Tenant
+
+
+class TestClaimsCache:
+    def test_cache_hit(self):
+        cache = ClaimsCache(10, 60)
+        claims = {"sub": "anne"}
+
+        cache.set("key", claims)
+        assert cache.get("key") == claims
+        assert len(cache) == 1
+
+    def test_copy(self):
+        cache = ClaimsCache(10, 60)
+        claims = {"sub": "anne", "permissions": ["castles:read"]}
+
+        cache.set("key", claims)
+        claims["permissions"].append("castles:write")
+        cached_claims = cache.get("key")
+        assert cached_claims is not None
+        cached_claims["permissions"].append("castles:delete")
+
+        assert cache.get("key") == {"sub": "anne", "permissions": ["castles:read"]}
+
+    def test_expired(self):
+        cache = ClaimsCache(10, 60)
+
+        cache.set("key", {"sub": "anne"}, time.time() - 1)
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_ttl(self):
+        cache = ClaimsCache(10, 60)
+
+        cache.set("key", {"sub": "anne"}, time.time() + 3600)
+        with patch.object(time, "time", return_value=time.time() + 61):
+            assert cache.get("key") is None
+
+    def test_bounded(self):
+        cache = ClaimsCache(2, 60)
+
+        for key in range(3):
+            cache.set(key, {"sub": str(key)})
+
+        assert len(cache) == 2
+        assert cache.get(0) is None
+
+    def test_delete(self):
+        cache = ClaimsCache(10, 60)
+
+        cache.set("key", {"sub": "anne"})
+        cache.delete("key")
+        cache.delete("key")
+        assert cache.get("key") is None
+
+    @pytest.mark.parametrize("maxsize,ttl_seconds", [(0, 60), (10, 0)])
+    def test_disabled(self, maxsize: int, ttl_seconds: int):
+        cache = ClaimsCache(maxsize, ttl_seconds)
+
+        cache.set("key", {"sub": "anne"})
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+class TestReadTenantAccessToken:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        access_token.access_token_cache.clear()
+        yield
+        access_token.access_token_cache.clear()
+
+    def _get_token(self, tenant: Tenant, lifetime_seconds: int = 3600) -> str:
+        exp = int(datetime.now(UTC).timestamp()) + lifetime_seconds
+        return sign_jwt(tenant.get_sign_jwk(), {"sub": "anne", "exp": exp})
+
+    async def test_cache_hit(self):
+        tenant = Tenant(
+            id=uuid.uuid4(), name="Default", sign_algorithm=SignatureAlgorithm.RS256
+        )
+        token = self._get_token(tenant)
+
+        claims = await read_tenant_access_token(tenant, token)
+        with patch.object(access_token, "read_access_token") as read_access_token:
+            assert await read_tenant_access_token(tenant, token) == claims
+            read_access_token.assert_not_called()
+
+    async def test_invalid_not_cached(self):
+        tenant = Tenant(
+            id=uuid.uuid4(), name="Default", sign_algorithm=SignatureAlgorithm.RS256
+        )
+
+        other_tenant = Tenant(
+            id=uuid.uuid4(), name="Other", sign_algorithm=SignatureAlgorithm.RS256
+        )
+        token = self._get_token(other_tenant)
+
+        for _ in range(2):
+            with pytest.raises(InvalidAccessToken):
+                await read_tenant_access_token(tenant, token)
+        assert len(access_token.access_token_cache) == 0
+
+    async def test_key_rotation(self):
+        tenant = Tenant(
+            id=uuid.uuid4(), name="Default", sign_algorithm=SignatureAlgorithm.RS256
+        )
+        token = self._get_token(tenant)
+
+        await read_tenant_access_token(tenant, token)
+        tenant.rotate_sign_jwk(overlap_seconds=0)
+
+        with pytest.raises(InvalidAccessToken):
+            await read_tenant_access_token(tenant, token)
@@ -0,0 +1,44 @@
+import uuid
+
+from fief.crypto.jwk import JWKCache, generate_signature_jwk_string
+
+
+class TestJWKCache:
+    def test_cache_hit(self):
+        cache = JWKCache(10)
+        owner_id = uuid.uuid4()
+        key_json = generate_signature_jwk_string()
+
+        key = cache.get(owner_id, key_json)
+        assert cache.get(owner_id, key_json) is key
+        assert len(cache) == 1
+
+    def test_key_rotation(self):
+        cache = JWKCache(10)
+        owner_id = uuid.uuid4()
+
+        key = cache.get(owner_id, generate_signature_jwk_string())
+        rotated_key = cache.get(owner_id, generate_signature_jwk_string())
+
+        assert rotated_key is not key
+        assert rotated_key["kid"] != key["kid"]
+
+    def test_bounded(self):
+        cache = JWKCache(2)
+        key_json = generate_signature_jwk_string()
+        owner_ids = [uuid.uuid4() for _ in range(3)]
+
+        first_key = cache.get(owner_ids[0], key_json)
+        for owner_id in owner_ids[1:]:
+            cache.get(owner_id, key_json)
+
+        assert len(cache) == 2
+        assert cache.get(owner_ids[0], key_json) is not first_key
+
+    def test_disabled(self):
+        cache = JWKCache(0)
+        owner_id = uuid.uuid4()
+        key_json = generate_signature_jwk_string()
+
+        assert cache.get(owner_id, key_json) is not cache.get(owner_id, key_json)
+        assert len(cache) == 0
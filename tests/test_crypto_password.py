@@ -0,0 +1,84 @@
+from fief.crypto.password import (
+    ARGON2_MIN_MEMORY_COST,
+    BCRYPT_MIN_ROUNDS,
+    PasswordHelper,
+    calibrate_argon2,
+    calibrate_bcrypt,
+)
+from fief.settings_class import PasswordHashAlgorithm
+
+ARGON2_TEST_PARAMETERS = {
+    "argon2_time_cost": 1,
+    "argon2_memory_cost": ARGON2_MIN_MEMORY_COST,
+    "argon2_parallelism": 1,
+}
+
+
+class TestPasswordHelper:
+    def test_same_parameters(self):
+        password_helper = PasswordHelper(bcrypt_rounds=4)
+        hashed_password = password_helper.hash("herminetincture")
+
+        verified, updated_hash = password_helper.verify_and_update(
+            "herminetincture", hashed_password
+        )
+        assert verified is True
+        assert updated_hash is None
+
+    def test_invalid_password(self):
+        password_helper = PasswordHelper(bcrypt_rounds=4)
+        hashed_password = password_helper.hash("herminetincture")
+
+        verified, updated_hash = password_helper.verify_and_update(
+            "nymeria", hashed_password
+        )
+        assert verified is False
+        assert updated_hash is None
+
+    def test_rehash_on_bcrypt_rounds_change(self):
+        hashed_password = PasswordHelper(bcrypt_rounds=4).hash("herminetincture")
+
+        password_helper = PasswordHelper(bcrypt_rounds=5)
+        verified, updated_hash = password_helper.verify_and_update(
+            "herminetincture", hashed_password
+        )
+        assert verified is True
+        assert updated_hash is not None
+        assert updated_hash.startswith("$2b$05$")
+
+    def test_rehash_on_algorithm_change(self):
+        hashed_password = PasswordHelper(
+            PasswordHashAlgorithm.BCRYPT, bcrypt_rounds=4
+        ).hash("herminetincture")
+
+        password_helper = PasswordHelper(
+            PasswordHashAlgorithm.ARGON2, bcrypt_rounds=4, **ARGON2_TEST_PARAMETERS
+        )
+        verified, updated_hash = password_helper.verify_and_update(
+            "herminetincture", hashed_password
+        )
+        assert verified is True
+        assert updated_hash is not None
+        assert updated_hash.startswith("$argon2id$")
+
+        verified, updated_hash = password_helper.verify_and_update(
+            "herminetincture", updated_hash
+        )
+        assert verified is True
+        assert updated_hash is None
+
+
+def test_calibrate_bcrypt():
+    calibration = calibrate_bcrypt(0, iterations=1)
+    assert calibration.rounds == BCRYPT_MIN_ROUNDS
+    assert calibration.seconds > 0
+
+
+def test_calibrate_argon2():
+    calibration = calibrate_argon2(
+        0, memory_cost=ARGON2_MIN_MEMORY_COST * 2, parallelism=1, iterations=1
+    )
+    assert calibration.time_cost == 1
+    assert calibration.memory_cost == ARGON2_MIN_MEMORY_COST
+    assert calibration.parallelism == 1
+    assert calibration.seconds > 0
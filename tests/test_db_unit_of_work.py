@@ -0,0 +1,277 @@
+import contextlib
+from collections.abc import Callable, Generator
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, status
+
+from fief.apps import api_app, auth_app
+from fief.db import AsyncSession
+from fief.db.unit_of_work import after_commit, commit, in_unit_of_work, unit_of_work
+from fief.dependencies.db import get_main_async_session
+from fief.dependencies.tasks import get_send_task
+from fief.models import AuditLog
+from fief.repositories import AuditLogRepository
+from fief.services.user_permissions_cache import user_permissions_cache
+from fief.settings import settings
+from fief.tasks import send_task
+from tests.data import TestData
+
+
+class HandledError(Exception):
+    pass
+
+
+@pytest.fixture
+def session_mock() -> MagicMock:
+    session = MagicMock(spec=AsyncSession)
+    session.info = {}
+    session.commit = AsyncMock()
+    session.flush = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+@pytest.mark.asyncio
+class TestUnitOfWork:
+    async def test_commit_outside(self, session_mock: MagicMock):
+        await commit(session_mock)
+
+        session_mock.commit.assert_awaited_once()
+        session_mock.flush.assert_not_awaited()
+
+    async def test_commit_once(self, session_mock: MagicMock):
+        callback = MagicMock()
+        async with unit_of_work(session_mock):
+            assert in_unit_of_work(session_mock)
+            await commit(session_mock)
+            await commit(session_mock)
+            await after_commit(session_mock, callback)
+            session_mock.commit.assert_not_awaited()
+            callback.assert_not_called()
+
+        assert session_mock.flush.await_count == 2
+        session_mock.commit.assert_awaited_once()
+        callback.assert_called_once()
+        assert not in_unit_of_work(session_mock)
+
+    async def test_rollback(self, session_mock: MagicMock):
+        callback = MagicMock()
+        with pytest.raises(ValueError):
+            async with unit_of_work(session_mock, commit_on=(HandledError,)):
+                await commit(session_mock)
+                await after_commit(session_mock, callback)
+                raise ValueError()
+
+        session_mock.rollback.assert_awaited_once()
+        session_mock.commit.assert_not_awaited()
+        callback.assert_not_called()
+        assert not in_unit_of_work(session_mock)
+
+    async def test_after_commit_outside(self, session_mock: MagicMock):
+        callback = AsyncMock()
+        await after_commit(session_mock, callback)
+
+        callback.assert_awaited_once()
+
+    async def test_after_commit_async(self, session_mock: MagicMock):
+        callback = AsyncMock()
+        async with unit_of_work(session_mock):
+            await after_commit(session_mock, callback)
+            callback.assert_not_called()
+
+        callback.assert_awaited_once()
+
+    async def test_after_commit_failing(self, session_mock: MagicMock):
+        failing_callback = MagicMock(side_effect=ValueError())
+        callback = MagicMock()
+        async with unit_of_work(session_mock):
+            await after_commit(session_mock, failing_callback)
+            await after_commit(session_mock, callback)
+
+        failing_callback.assert_called_once()
+        callback.assert_called_once()
+
+    async def test_commit_on(self, session_mock: MagicMock):
+        with pytest.raises(HandledError):
+            async with unit_of_work(session_mock, commit_on=(HandledError,)):
+                await commit(session_mock)
+                raise HandledError()
+
+        session_mock.commit.assert_awaited_once()
+        session_mock.rollback.assert_not_awaited()
+
+    async def test_repository(self, main_session: AsyncSession, test_data: TestData):
+        audit_log_repository = AuditLogRepository(main_session)
+        with patch.object(
+            main_session, "commit", wraps=main_session.commit
+        ) as commit_mock:
+            async with unit_of_work(main_session):
+                for _ in range(3):
+                    audit_log = await audit_log_repository.create(
+                        AuditLog(
+                            timestamp=datetime.now(UTC), level="INFO", message="Log"
+                        )
+                    )
+                    # Flushed, so the row is there for the rest of the work
+                    assert (
+                        await audit_log_repository.get_by_id(audit_log.id) is not None
+                    )
+                commit_mock.assert_not_awaited()
+
+        commit_mock.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+class TestGetSendTask:
+    async def test_outside(self, session_mock: MagicMock):
+        assert await get_send_task(session_mock) is send_task
+
+    async def test_deferred(self, session_mock: MagicMock):
+        task = MagicMock()
+        async with unit_of_work(session_mock):
+            deferred_send_task = await get_send_task(session_mock)
+            deferred_send_task(task, "ARG")
+            task.send_with_options.assert_not_called()
+
+        task.send_with_options.assert_called_once_with(
+            args=("ARG",), kwargs={}, delay=None
+        )
+
+
+@pytest.fixture
+def enable_unit_of_work(
+    main_session: AsyncSession, main_session_manager
+) -> Generator[Callable[[FastAPI], None], None, None]:
+    """
+    Serve the requests of an app through the actual `get_main_async_session`,
+    with the unit of work enabled.
+    """
+
+    async def _get_main_async_session(request: Request):
+        request.state.main_async_session_maker = main_session_manager
+        async with contextlib.asynccontextmanager(get_main_async_session)(
+            request
+        ) as session:
+            yield session
+
+    def _enable_unit_of_work(app: FastAPI) -> None:
+        app.dependency_overrides[get_main_async_session] = _get_main_async_session
+        # Ignore the work done by the fixtures
+        main_session.commit.reset_mock()  # type: ignore[attr-defined]
+        main_session.rollback.reset_mock()  # type: ignore[attr-defined]
+
+    with (
+        patch.object(settings, "database_unit_of_work", True),
+        patch.object(main_session, "commit", wraps=main_session.commit),
+        patch.object(main_session, "rollback", wraps=main_session.rollback),
+    ):
+        yield _enable_unit_of_work
+
+
+@pytest.mark.asyncio
+class TestRequest:
+    @pytest.mark.authenticated_admin
+    async def test_api_invalidate_after_commit(
+        self,
+        enable_unit_of_work: Callable[[FastAPI], None],
+        test_client_api: httpx.AsyncClient,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        enable_unit_of_work(api_app)
+        commit_mock: AsyncMock = main_session.commit  # type: ignore[assignment]
+
+        async def _invalidate(*args, **kwargs):
+            commit_mock.assert_awaited_once()
+
+        permission = test_data["permissions"]["castles:create"]
+        user = test_data["users"]["regular"]
+        with patch.object(
+            user_permissions_cache, "invalidate", side_effect=_invalidate
+        ) as invalidate_mock:
+            response = await test_client_api.post(
+                f"/users/{user.id}/permissions", json={"id": str(permission.id)}
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        invalidate_mock.assert_awaited_once_with(user.id)
+
+    @pytest.mark.authenticated_admin
+    async def test_api_handled_exception(
+        self,
+        enable_unit_of_work: Callable[[FastAPI], None],
+        test_client_api: httpx.AsyncClient,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        enable_unit_of_work(api_app)
+
+        permission = test_data["permissions"]["castles:delete"]
+        user = test_data["users"]["regular"]
+        response = await test_client_api.post(
+            f"/users/{user.id}/permissions", json={"id": str(permission.id)}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        main_session.commit.assert_awaited_once()  # type: ignore[attr-defined]
+        main_session.rollback.assert_not_awaited()  # type: ignore[attr-defined]
+
+    async def test_auth_login(
+        self,
+        enable_unit_of_work: Callable[[FastAPI], None],
+        test_client_auth_csrf: httpx.AsyncClient,
+        csrf_token: str,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        enable_unit_of_work(auth_app)
+
+        login_session = test_data["login_sessions"]["default"]
+        tenant = login_session.client.tenant
+        path_prefix = tenant.slug if not tenant.default else ""
+
+        response = await test_client_auth_csrf.post(
+            f"{path_prefix}/login",
+            data={
+                "email": "anne@bretagne.duchy",
+                "password": "herminetincture",
+                "csrf_token": csrf_token,
+            },
+            cookies={settings.login_session_cookie_name: login_session.token},
+        )
+
+        assert response.status_code == status.HTTP_302_FOUND
+        assert settings.session_cookie_name in response.cookies
+        main_session.commit.assert_awaited_once()  # type: ignore[attr-defined]
+
+    async def test_auth_login_bad_credentials(
+        self,
+        enable_unit_of_work: Callable[[FastAPI], None],
+        test_client_auth_csrf: httpx.AsyncClient,
+        csrf_token: str,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        enable_unit_of_work(auth_app)
+
+        login_session = test_data["login_sessions"]["default"]
+        tenant = login_session.client.tenant
+        path_prefix = tenant.slug if not tenant.default else ""
+
+        response = await test_client_auth_csrf.post(
+            f"{path_prefix}/login",
+            data={
+                "email": "anne@bretagne.duchy",
+                "password": "foo",
+                "csrf_token": csrf_token,
+            },
+            cookies={settings.login_session_cookie_name: login_session.token},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.headers["X-Fief-Error"] == "bad_credentials"
+        main_session.commit.assert_awaited_once()  # type: ignore[attr-defined]
+        main_session.rollback.assert_not_awaited()  # type: ignore[attr-defined]
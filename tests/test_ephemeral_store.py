@@ -0,0 +1,122 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from fief import ephemeral_store
+from fief.ephemeral_store import (
+    MemoryEphemeralStore,
+    NearCacheEphemeralStore,
+    RedisEphemeralStore,
+)
+
+
+@pytest.mark.asyncio
+class TestMemoryEphemeralStore:
+    async def test_get(self):
+        store = MemoryEphemeralStore()
+        await store.set("key", "value", 10)
+
+        assert await store.get("key") == "value"
+        assert await store.get("other_key") is None
+
+    async def test_expired(self):
+        store = MemoryEphemeralStore()
+        with patch.object(ephemeral_store.time, "monotonic", return_value=1000.0):
+            await store.set("key", "value", 10)
+
+        with patch.object(ephemeral_store.time, "monotonic", return_value=1010.0):
+            assert await store.get("key") is None
+
+    async def test_sweep_expired(self):
+        with patch.object(ephemeral_store.time, "monotonic", return_value=1000.0):
+            store = MemoryEphemeralStore(sweep_interval_seconds=60)
+            await store.set("key", "value", 10)
+            await store.set("other_key", "value", 100)
+
+        with patch.object(ephemeral_store.time, "monotonic", return_value=1030.0):
+            await store.set("new_key", "value", 10)
+            assert "key" in store._values
+
+        with patch.object(ephemeral_store.time, "monotonic", return_value=1060.0):
+            await store.set("new_key", "value", 10)
+            assert "key" not in store._values
+            assert await store.get("other_key") == "value"
+
+    async def test_pop(self):
+        store = MemoryEphemeralStore()
+        await store.set("key", "value", 10)
+
+        assert await store.pop("key") == "value"
+        assert await store.pop("key") is None
+
+    async def test_delete(self):
+        store = MemoryEphemeralStore()
+        await store.set("key", "value", 10)
+        await store.delete("key")
+
+        assert await store.get("key") is None
+
+
+@pytest.mark.asyncio
+class TestRedisEphemeralStore:
+    async def test_pop(self):
+        redis = MagicMock()
+        redis.getdel = AsyncMock(return_value=b"value")
+        store = RedisEphemeralStore(lambda: redis)
+
+        assert await store.pop("key") == "value"
+        redis.getdel.assert_called_once_with("fief:ephemeral:key")
+
+
+@pytest.mark.asyncio
+class TestNearCacheEphemeralStore:
+    async def test_get_cached(self):
+        store = MemoryEphemeralStore()
+        near_cache_store = NearCacheEphemeralStore(store, ttl_seconds=5, max_size=10)
+        await near_cache_store.set("key", "value", 10)
+
+        assert await near_cache_store.get("key") == "value"
+        # Simulate a change from another process
+        await store.set("key", "other_value", 10)
+        assert await near_cache_store.get("key") == "value"
+
+        with patch.object(
+            ephemeral_store.time, "monotonic", return_value=time.monotonic() + 5
+        ):
+            assert await near_cache_store.get("key") == "other_value"
+
+    async def test_max_size(self):
+        store = MemoryEphemeralStore()
+        near_cache_store = NearCacheEphemeralStore(store, ttl_seconds=5, max_size=1)
+        await near_cache_store.set("key1", "value1", 10)
+        await near_cache_store.set("key2", "value2", 10)
+
+        assert await near_cache_store.get("key1") == "value1"
+        assert await near_cache_store.get("key2") == "value2"
+        await store.delete("key1")
+        await store.delete("key2")
+
+        assert await near_cache_store.get("key1") is None
+        assert await near_cache_store.get("key2") == "value2"
+
+    async def test_delete(self):
+        store = MemoryEphemeralStore()
+        near_cache_store = NearCacheEphemeralStore(store, ttl_seconds=5, max_size=10)
+        await near_cache_store.set("key", "value", 10)
+        assert await near_cache_store.get("key") == "value"
+
+        await near_cache_store.delete("key")
+
+        assert await near_cache_store.get("key") is None
+        assert await store.get("key") is None
+
+    async def test_disabled(self):
+        store = MemoryEphemeralStore()
+        near_cache_store = NearCacheEphemeralStore(store, ttl_seconds=0, max_size=10)
+        await near_cache_store.set("key", "value", 10)
+        assert await near_cache_store.get("key") == "value"
+
+        await store.delete("key")
+
+        assert await near_cache_store.get("key") is None
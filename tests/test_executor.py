@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+from fief.executor import BoundedExecutor, ExecutorBusyError, ExecutorMode
+
+
+def get_thread_name() -> str:
+    return threading.current_thread().name
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def fail():
+    raise ValueError()
+
+
+@pytest.mark.asyncio
+class TestBoundedExecutor:
+    async def test_inline(self):
+        executor = BoundedExecutor("test", ExecutorMode.INLINE)
+
+        assert await executor.run(get_thread_name) == threading.current_thread().name
+        assert executor.metrics.completed == 1
+
+    async def test_thread(self):
+        executor = BoundedExecutor("test", ExecutorMode.THREAD, max_workers=1)
+
+        thread_name = await executor.run(get_thread_name)
+        assert thread_name.startswith("fief-test")
+        assert executor.metrics.submitted == 1
+        assert executor.metrics.completed == 1
+        assert executor.metrics.in_flight == 0
+
+        executor.shutdown()
+
+    async def test_process(self):
+        executor = BoundedExecutor("test", ExecutorMode.PROCESS, max_workers=1)
+
+        assert await executor.run(add, 1, b=2) == 3
+        assert executor.metrics.completed == 1
+
+        executor.shutdown()
+
+    async def test_failure(self):
+        executor = BoundedExecutor("test", ExecutorMode.THREAD, max_workers=1)
+
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+        assert executor.metrics.failed == 1
+        assert executor.metrics.in_flight == 0
+
+        executor.shutdown()
+
+    async def test_max_pending(self):
+        executor = BoundedExecutor(
+            "test", ExecutorMode.THREAD, max_workers=1, max_pending=1
+        )
+        event = threading.Event()
+
+        pending = asyncio.create_task(executor.run(event.wait, 5))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorBusyError):
+            await executor.run(add, 1, 2)
+        assert executor.metrics.rejected == 1
+
+        event.set()
+        assert await pending is True
+        assert await executor.run(add, 1, 2) == 3
+
+        executor.shutdown()
@@ -0,0 +1,90 @@
+import json
+import threading
+import uuid
+from unittest.mock import MagicMock
+
+from fief.logger import AuditLogSink, logger
+from fief.models import AuditLogMessage
+
+
+def _add_sink(sink: AuditLogSink) -> tuple[int, str]:
+    key = f"test_audit_sink_{uuid.uuid4().hex}"
+    handler_id = logger.add(sink, filter=lambda r: r["extra"].get(key) is True)
+    return handler_id, key
+
+
+class TestAuditLogSink:
+    def test_send_on_stop(self):
+        task = MagicMock()
+        sink = AuditLogSink(task, batch_size=10, flush_interval_seconds=60)
+        handler_id, key = _add_sink(sink)
+
+        for _ in range(3):
+            logger.bind(**{key: True}).info(AuditLogMessage.USER_REGISTERED)
+        task.send.assert_not_called()
+
+        logger.remove(handler_id)
+
+        task.send.assert_called_once()
+        (records,) = task.send.call_args.args
+        assert len(records) == 3
+        record = json.loads(records[0])
+        assert record["message"] == AuditLogMessage.USER_REGISTERED
+        assert record["level"] == "INFO"
+
+    def test_send_after_stop(self):
+        task = MagicMock()
+        sink = AuditLogSink(task, batch_size=10, flush_interval_seconds=60)
+        handler_id, key = _add_sink(sink)
+
+        try:
+            sink.stop()
+            logger.bind(**{key: True}).info(AuditLogMessage.USER_REGISTERED)
+
+            task.send.assert_called_once()
+            (records,) = task.send.call_args.args
+            assert len(records) == 1
+        finally:
+            logger.remove(handler_id)
+
+    def test_send_full_batch(self):
+        sent = threading.Event()
+        task = MagicMock()
+        task.send.side_effect = lambda records: sent.set()
+        sink = AuditLogSink(task, batch_size=2, flush_interval_seconds=60)
+        handler_id, key = _add_sink(sink)
+
+        try:
+            for _ in range(2):
+                logger.bind(**{key: True}).info(AuditLogMessage.USER_REGISTERED)
+            assert sent.wait(timeout=5)
+            (records,) = task.send.call_args.args
+            assert len(records) == 2
+        finally:
+            logger.remove(handler_id)
+
+    def test_send_after_interval(self):
+        sent = threading.Event()
+        task = MagicMock()
+        task.send.side_effect = lambda records: sent.set()
+        sink = AuditLogSink(task, batch_size=10, flush_interval_seconds=0.05)
+        handler_id, key = _add_sink(sink)
+
+        try:
+            logger.bind(**{key: True}).info(AuditLogMessage.USER_REGISTERED)
+            assert sent.wait(timeout=5)
+        finally:
+            logger.remove(handler_id)
+
+        assert sum(len(call.args[0]) for call in task.send.call_args_list) == 1
+
+    def test_send_error(self):
+        task = MagicMock()
+        task.send.side_effect = ConnectionError()
+        sink = AuditLogSink(task, batch_size=10, flush_interval_seconds=60)
+        handler_id, key = _add_sink(sink)
+
+        logger.bind(**{key: True}).info(AuditLogMessage.USER_REGISTERED)
+        logger.remove(handler_id)
+
+        task.send.assert_called_once()
@@ -1,3 +1,8 @@
+import pytest
+from jwcrypto import jwt
+
+from fief.crypto.jwk import SignatureAlgorithm, generate_signature_jwk_string
+from fief.crypto.jwt import sign_jwt
 from fief.models import EmailDomain, Tenant
 from fief.settings import settings
 from tests.data import TestData
@@ -57,3 +62,75 @@ class TestGetEmailSender:
         )
 
         assert tenant.get_email_sender() == ("anne@bretagne.duchy", "Anne")
+
+
+class TestSignAlgorithm:
+    @pytest.mark.parametrize("algorithm", list(SignatureAlgorithm))
+    def test_generate(self, algorithm: SignatureAlgorithm):
+        tenant = Tenant(name="Default", sign_algorithm=algorithm)
+
+        assert tenant.sign_algorithm == algorithm
+        assert tenant.previous_sign_jwks is None
+
+    def test_legacy_key(self, test_data: TestData):
+        tenant = test_data["tenants"]["default"]
+
+        assert tenant.sign_algorithm == SignatureAlgorithm.RS256
+
+    @pytest.mark.parametrize("algorithm", list(SignatureAlgorithm))
+    def test_sign_and_verify(self, algorithm: SignatureAlgorithm):
+        tenant = Tenant(name="Default", sign_algorithm=algorithm)
+
+        token = sign_jwt(tenant.get_sign_jwk(), {"sub": "anne"})
+
+        decoded = jwt.JWT(
+            jwt=token,
+            key=tenant.get_sign_jwk_set(),
+            algs=tenant.get_sign_algorithms(),
+        )
+        assert decoded.token.jose_header["alg"] == algorithm.value
+
+
+class TestRotateSignJWK:
+    def test_keep_previous_key(self):
+        tenant = Tenant(name="Default", sign_algorithm=SignatureAlgorithm.RS256)
+        previous_key = tenant.get_sign_jwk()
+        token = sign_jwt(previous_key, {"sub": "anne"})
+
+        tenant.rotate_sign_jwk(SignatureAlgorithm.EDDSA, 3600)
+
+        assert tenant.sign_algorithm == SignatureAlgorithm.EDDSA
+        assert tenant.get_sign_jwk()["kid"] != previous_key["kid"]
+        assert tenant.get_sign_algorithms() == [
+            SignatureAlgorithm.EDDSA,
+            SignatureAlgorithm.RS256,
+        ]
+        jwt.JWT(
+            jwt=token,
+            key=tenant.get_sign_jwk_set(),
+            algs=tenant.get_sign_algorithms(),
+        )
+
+    def test_no_overlap(self):
+        tenant = Tenant(name="Default", sign_algorithm=SignatureAlgorithm.RS256)
+        previous_key = tenant.get_sign_jwk()
+
+        tenant.rotate_sign_jwk(overlap_seconds=0)
+
+        assert tenant.sign_algorithm == SignatureAlgorithm.RS256
+        assert tenant.previous_sign_jwks == []
+        assert tenant.get_sign_jwk_set().get_key(previous_key["kid"]) is None
+
+    def test_prune_expired_keys(self):
+        tenant = Tenant(name="Default", sign_algorithm=SignatureAlgorithm.ES256)
+        expired_jwk = tenant.sign_jwk
+        tenant.previous_sign_jwks = [{"jwk": expired_jwk, "expires_at": 0}]
+        tenant.sign_jwk = generate_signature_jwk_string(SignatureAlgorithm.ES256)
+
+        assert tenant.get_previous_sign_jwks() == []
+
+        tenant.rotate_sign_jwk(overlap_seconds=3600)
+
+        assert tenant.previous_sign_jwks is not None
+        assert len(tenant.previous_sign_jwks) == 1
+        assert tenant.previous_sign_jwks[0]["jwk"] != expired_jwk
@@ -0,0 +1,14 @@
+import pytest
+
+from fief.redis import close_redis, get_redis
+
+
+@pytest.mark.asyncio
+async def test_close_redis():
+    client = get_redis()
+    assert get_redis() is client
+
+    await close_redis()
+
+    assert get_redis() is not client
+    await close_redis()
@@ -0,0 +1,260 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from fief.db import AsyncSession
+from fief.ephemeral_store import MemoryEphemeralStore
+from fief.models import (
+    AdminSessionToken,
+    AuthorizationCode,
+    LoginSession,
+    OAuthSession,
+    RegistrationSession,
+    RegistrationSessionFlow,
+    SessionToken,
+)
+from fief.repositories.ephemeral import (
+    EphemeralAdminSessionTokenRepository,
+    EphemeralAuthorizationCodeRepository,
+    EphemeralLoginSessionRepository,
+    EphemeralOAuthSessionRepository,
+    EphemeralRegistrationSessionRepository,
+    EphemeralSessionTokenRepository,
+)
+from fief.services.acr import ACR
+from tests.data import TestData
+
+
+@pytest.mark.asyncio
+class TestEphemeralAuthorizationCodeRepository:
+    async def test_pop_valid_by_code(
+        self, main_session: AsyncSession, test_data: TestData
+    ):
+        client = test_data["clients"]["default_tenant"]
+        authenticated_at = datetime.now(UTC) - timedelta(minutes=5)
+        repository = EphemeralAuthorizationCodeRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        authorization_code = await repository.create(
+            AuthorizationCode(
+                code="CODE_HASH",
+                c_hash="C_HASH",
+                redirect_uri="https://bretagne.duchy/callback",
+                user_id=test_data["users"]["regular"].id,
+                client_id=client.id,
+                scope=["openid", "offline_access"],
+                authenticated_at=authenticated_at,
+                acr=ACR.LEVEL_ONE,
+                expires_at=client.get_authorization_code_expires_at(),
+            )
+        )
+
+        popped_authorization_code = await repository.pop_valid_by_code("CODE_HASH")
+        assert popped_authorization_code is not None
+        assert popped_authorization_code.id == authorization_code.id
+        assert popped_authorization_code.scope == ["openid", "offline_access"]
+        assert popped_authorization_code.authenticated_at == authenticated_at
+        assert popped_authorization_code.acr == ACR.LEVEL_ONE
+        assert popped_authorization_code.client.id == client.id
+        assert popped_authorization_code.user.id == test_data["users"]["regular"].id
+
+        assert await repository.pop_valid_by_code("CODE_HASH") is None
+
+    async def test_expired(self, main_session: AsyncSession, test_data: TestData):
+        repository = EphemeralAuthorizationCodeRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        await repository.create(
+            AuthorizationCode(
+                code="CODE_HASH",
+                c_hash="C_HASH",
+                redirect_uri="https://bretagne.duchy/callback",
+                user_id=test_data["users"]["regular"].id,
+                client_id=test_data["clients"]["default_tenant"].id,
+                authenticated_at=datetime.now(UTC),
+                expires_at=datetime.now(UTC) - timedelta(seconds=1),
+            )
+        )
+
+        assert await repository.get_valid_by_code("CODE_HASH") is None
+        assert await repository.get_by_code("CODE_HASH") is not None
+
+
+@pytest.mark.asyncio
+class TestEphemeralLoginSessionRepository:
+    async def test_get_by_token(self, main_session: AsyncSession, test_data: TestData):
+        client = test_data["clients"]["default_tenant"]
+        repository = EphemeralLoginSessionRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        login_session = await repository.create(
+            LoginSession(
+                response_type="code",
+                response_mode="query",
+                redirect_uri="https://nantes.city/callback",
+                scope=["openid"],
+                state="STATE",
+                client=client,
+            )
+        )
+        # Defaults are applied like they would be by the database
+        assert login_session.token is not None
+        assert login_session.expires_at > datetime.now(UTC)
+
+        stored_login_session = await repository.get_by_token(login_session.token)
+        assert stored_login_session is not None
+        assert stored_login_session.state == "STATE"
+        assert stored_login_session.client.tenant.id == client.tenant_id
+
+        await repository.delete(stored_login_session)
+        assert await repository.get_by_token(login_session.token) is None
+
+    async def test_expired(self, main_session: AsyncSession, test_data: TestData):
+        repository = EphemeralLoginSessionRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        login_session = await repository.create(
+            LoginSession(
+                response_type="code",
+                response_mode="query",
+                redirect_uri="https://nantes.city/callback",
+                client_id=test_data["clients"]["default_tenant"].id,
+                expires_at=datetime.now(UTC) - timedelta(seconds=1),
+            )
+        )
+
+        assert await repository.get_by_token(login_session.token) is None
+        assert (
+            await repository.get_by_token(login_session.token, fresh=False) is not None
+        )
+
+
+@pytest.mark.asyncio
+class TestEphemeralOAuthSessionRepository:
+    async def test_update(self, main_session: AsyncSession, test_data: TestData):
+        oauth_provider = test_data["oauth_providers"]["google"]
+        tenant = test_data["tenants"]["default"]
+        repository = EphemeralOAuthSessionRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        oauth_session = await repository.create(
+            OAuthSession(
+                redirect_uri="http://api.fief.dev/oauth/callback",
+                oauth_provider=oauth_provider,
+                tenant=tenant,
+            )
+        )
+
+        stored_oauth_session = await repository.get_by_token(oauth_session.token)
+        assert stored_oauth_session is not None
+        assert stored_oauth_session.oauth_provider.id == oauth_provider.id
+        assert stored_oauth_session.tenant.id == tenant.id
+        assert stored_oauth_session.oauth_account is None
+
+        oauth_account = test_data["oauth_accounts"]["new_user_google"]
+        stored_oauth_session.oauth_account = oauth_account
+        await repository.update(stored_oauth_session)
+
+        updated_oauth_session = await repository.get_by_token(oauth_session.token)
+        assert updated_oauth_session is not None
+        assert updated_oauth_session.oauth_account_id == oauth_account.id
+        assert updated_oauth_session.oauth_account is not None
+
+        await repository.delete(updated_oauth_session)
+        assert await repository.get_by_token(oauth_session.token) is None
+
+
+@pytest.mark.asyncio
+class TestEphemeralRegistrationSessionRepository:
+    async def test_update(self, main_session: AsyncSession, test_data: TestData):
+        tenant = test_data["tenants"]["default"]
+        repository = EphemeralRegistrationSessionRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        registration_session = await repository.create(
+            RegistrationSession(flow=RegistrationSessionFlow.OAUTH, tenant=tenant)
+        )
+        assert registration_session.expires_at > datetime.now(UTC)
+
+        registration_session.email = "louis@bretagne.duchy"
+        await repository.update(registration_session)
+
+        stored_registration_session = await repository.get_by_token(
+            registration_session.token
+        )
+        assert stored_registration_session is not None
+        assert stored_registration_session.flow == RegistrationSessionFlow.OAUTH
+        assert stored_registration_session.email == "louis@bretagne.duchy"
+        assert stored_registration_session.tenant_id == tenant.id
+        assert stored_registration_session.tenant.id == tenant.id
+
+    async def test_expired(self, main_session: AsyncSession, test_data: TestData):
+        repository = EphemeralRegistrationSessionRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        registration_session = await repository.create(
+            RegistrationSession(
+                tenant_id=test_data["tenants"]["default"].id,
+                expires_at=datetime.now(UTC) - timedelta(seconds=1),
+            )
+        )
+
+        assert await repository.get_by_token(registration_session.token) is None
+        assert (
+            await repository.get_by_token(registration_session.token, fresh=False)
+            is not None
+        )
+
+
+@pytest.mark.asyncio
+class TestEphemeralSessionTokenRepository:
+    async def test_get_by_token(self, main_session: AsyncSession, test_data: TestData):
+        user = test_data["users"]["regular"]
+        repository = EphemeralSessionTokenRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        session_token = await repository.create(
+            SessionToken(token="TOKEN_HASH", user_id=user.id)
+        )
+
+        stored_session_token = await repository.get_by_token("TOKEN_HASH")
+        assert stored_session_token is not None
+        assert stored_session_token.id == session_token.id
+        assert stored_session_token.created_at == session_token.created_at
+        assert stored_session_token.user.id == user.id
+
+        await repository.delete(stored_session_token)
+        assert await repository.get_by_token("TOKEN_HASH") is None
+
+    async def test_deleted_user(self, main_session: AsyncSession, test_data: TestData):
+        repository = EphemeralSessionTokenRepository(
+            main_session, MemoryEphemeralStore()
+        )
+        await repository.create(SessionToken(token="TOKEN_HASH", user_id=uuid.uuid4()))
+
+        assert await repository.get_by_token("TOKEN_HASH") is None
+
+
+@pytest.mark.asyncio
+class TestEphemeralAdminSessionTokenRepository:
+    async def test_get_by_token(self, main_session: AsyncSession):
+        store = MemoryEphemeralStore()
+        repository = EphemeralAdminSessionTokenRepository(main_session, store)
+        session_token = await repository.create(
+            AdminSessionToken(
+                token="TOKEN_HASH",
+                raw_tokens="{}",
+                raw_userinfo='{"sub": "6eb4c3b2-7a7c-4a05-87cf-6d7e8e6c55a8"}',
+            )
+        )
+
+        stored_session_token = await repository.get_by_token("TOKEN_HASH")
+        assert stored_session_token is not None
+        assert stored_session_token.id == session_token.id
+        assert stored_session_token.user_id == uuid.UUID(
+            "6eb4c3b2-7a7c-4a05-87cf-6d7e8e6c55a8"
+        )
+
+        await repository.delete(stored_session_token)
+        assert await repository.get_by_token("TOKEN_HASH") is None
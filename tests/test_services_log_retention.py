@@ -0,0 +1,129 @@
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from fief.db import AsyncSession
+from fief.models import AuditLog, WebhookLog
+from fief.repositories import AuditLogRepository, WebhookLogRepository
+from fief.services.log_retention import (
+    LogRetentionService,
+    get_month_start,
+    parse_partition_bounds,
+)
+from tests.data import TestData
+
+
+@pytest.mark.parametrize(
+    "value,months,expected",
+    [
+        (datetime(2026, 10, 17, 12, tzinfo=UTC), 0, datetime(2026, 10, 1, tzinfo=UTC)),
+        (datetime(2026, 10, 17, 12, tzinfo=UTC), 3, datetime(2027, 1, 1, tzinfo=UTC)),
+        (datetime(2026, 1, 17, 12, tzinfo=UTC), -1, datetime(2025, 12, 1, tzinfo=UTC)),
+    ],
+)
+def test_get_month_start(value: datetime, months: int, expected: datetime):
+    assert get_month_start(value, months) == expected
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        (
+            "FOR VALUES FROM ('2026-10-01 00:00:00+00') TO ('2026-11-01 00:00:00+00')",
+            (datetime(2026, 10, 1, tzinfo=UTC), datetime(2026, 11, 1, tzinfo=UTC)),
+        ),
+        (
+            "FOR VALUES FROM (MINVALUE) TO ('2026-10-17 12:30:00.5+00')",
+            (None, datetime(2026, 10, 17, 12, 30, 0, 500000, tzinfo=UTC)),
+        ),
+        ("DEFAULT", None),
+    ],
+)
+def test_parse_partition_bounds(
+    expression: str, expected: tuple[datetime | None, datetime | None] | None
+):
+    assert parse_partition_bounds(expression) == expected
+
+
+@pytest.mark.asyncio
+class TestLogRetentionService:
+    async def test_delete_expired(
+        self, main_session: AsyncSession, test_data: TestData
+    ):
+        now = datetime.now(UTC)
+        audit_log_repository = AuditLogRepository(main_session)
+        webhook_log_repository = WebhookLogRepository(main_session)
+        webhook = test_data["webhooks"]["all"]
+
+        audit_logs = await audit_log_repository.create_many(
+            [
+                AuditLog(
+                    timestamp=now - timedelta(days=days), level="INFO", message="Log"
+                )
+                for days in [40, 35, 1]
+            ]
+        )
+        webhook_logs = await webhook_log_repository.create_many(
+            [
+                WebhookLog(
+                    webhook_id=webhook.id,
+                    event="user.created",
+                    attempt=1,
+                    payload="{}",
+                    success=True,
+                    created_at=now - timedelta(days=days),
+                )
+                for days in [10, 1]
+            ]
+        )
+
+        log_retention = LogRetentionService(
+            audit_log_repository,
+            webhook_log_repository,
+            audit_logs_retention_days=30,
+            webhook_logs_retention_days=7,
+            chunk_size=1,
+        )
+        await log_retention.run(now)
+
+        assert await audit_log_repository.get_by_id(audit_logs[0].id) is None
+        assert await audit_log_repository.get_by_id(audit_logs[1].id) is None
+        assert await audit_log_repository.get_by_id(audit_logs[2].id) is not None
+        assert await webhook_log_repository.get_by_id(webhook_logs[0].id) is None
+        assert await webhook_log_repository.get_by_id(webhook_logs[1].id) is not None
+
+    async def test_deadline(self, main_session: AsyncSession, test_data: TestData):
+        now = datetime.now(UTC)
+        audit_log_repository = AuditLogRepository(main_session)
+        audit_log = await audit_log_repository.create(
+            AuditLog(timestamp=now - timedelta(days=40), level="INFO", message="Log")
+        )
+
+        log_retention = LogRetentionService(
+            audit_log_repository,
+            WebhookLogRepository(main_session),
+            audit_logs_retention_days=30,
+            webhook_logs_retention_days=7,
+            deadline=time.monotonic(),
+        )
+        await log_retention.run(now)
+
+        assert await audit_log_repository.get_by_id(audit_log.id) is not None
+
+    async def test_keep_forever(self, main_session: AsyncSession, test_data: TestData):
+        now = datetime.now(UTC)
+        audit_log_repository = AuditLogRepository(main_session)
+        audit_log = await audit_log_repository.create(
+            AuditLog(timestamp=now - timedelta(days=365), level="INFO", message="Log")
+        )
+
+        log_retention = LogRetentionService(
+            audit_log_repository,
+            WebhookLogRepository(main_session),
+            audit_logs_retention_days=0,
+            webhook_logs_retention_days=0,
+        )
+        await log_retention.run(now)
+
+        assert await audit_log_repository.get_by_id(audit_log.id) is not None
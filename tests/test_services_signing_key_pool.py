@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock
+
+import pytest
+from jwcrypto import jwk
+
+from fief.crypto.jwk import (
+    SignatureAlgorithm,
+    generate_signature_jwk_string,
+    get_signature_algorithm,
+)
+from fief.db import AsyncSession
+from fief.models import PooledSigningKey
+from fief.repositories import PooledSigningKeyRepository
+from fief.services.signing_key_pool import get_signing_key
+from fief.tasks import replenish_signing_keys
+from tests.data import TestData
+
+
+@pytest.fixture
+def repository(
+    main_session: AsyncSession, test_data: TestData
+) -> PooledSigningKeyRepository:
+    return PooledSigningKeyRepository(main_session)
+
+
+@pytest.mark.asyncio
+class TestGetSigningKey:
+    async def test_pooled(
+        self, repository: PooledSigningKeyRepository, send_task_mock: MagicMock
+    ):
+        pooled_jwk = generate_signature_jwk_string(SignatureAlgorithm.ES256)
+        await repository.create(
+            PooledSigningKey(algorithm=SignatureAlgorithm.ES256, jwk=pooled_jwk)
+        )
+
+        signing_key = await get_signing_key(
+            repository, send_task_mock, SignatureAlgorithm.ES256
+        )
+
+        assert signing_key == pooled_jwk
+        assert await repository.count_by_algorithm(SignatureAlgorithm.ES256) == 0
+        send_task_mock.assert_called_once_with(replenish_signing_keys)
+
+    @pytest.mark.parametrize("algorithm", list(SignatureAlgorithm))
+    async def test_empty_pool(
+        self,
+        algorithm: SignatureAlgorithm,
+        repository: PooledSigningKeyRepository,
+        send_task_mock: MagicMock,
+    ):
+        signing_key = await get_signing_key(repository, send_task_mock, algorithm)
+
+        key = jwk.JWK.from_json(signing_key)
+        assert key.has_private
+        assert get_signature_algorithm(key) == algorithm
+        send_task_mock.assert_called_once_with(replenish_signing_keys)
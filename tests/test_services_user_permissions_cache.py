@@ -0,0 +1,94 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from fief.services.user_permissions_cache import UserPermissionsCache
+
+
+@pytest.mark.asyncio
+class TestUserPermissionsCache:
+    async def test_cache_hit(self):
+        cache = UserPermissionsCache(10, 60)
+        user_id = uuid.uuid4()
+        load = AsyncMock(return_value=["castles:read"])
+
+        assert await cache.get_or_load(user_id, load) == ["castles:read"]
+        assert await cache.get_or_load(user_id, load) == ["castles:read"]
+        load.assert_awaited_once()
+        assert len(cache) == 1
+
+    async def test_invalidate(self):
+        cache = UserPermissionsCache(10, 60)
+        user_id = uuid.uuid4()
+        other_user_id = uuid.uuid4()
+        load = AsyncMock(return_value=["castles:read"])
+        other_load = AsyncMock(return_value=[])
+
+        await cache.get_or_load(user_id, load)
+        await cache.get_or_load(other_user_id, other_load)
+        await cache.invalidate(user_id)
+
+        load.return_value = ["castles:read", "castles:create"]
+        assert await cache.get_or_load(user_id, load) == [
+            "castles:read",
+            "castles:create",
+        ]
+        assert load.await_count == 2
+
+        await cache.get_or_load(other_user_id, other_load)
+        other_load.assert_awaited_once()
+
+    async def test_invalidate_all(self):
+        cache = UserPermissionsCache(10, 60)
+        user_id = uuid.uuid4()
+        load = AsyncMock(return_value=["castles:read"])
+
+        await cache.get_or_load(user_id, load)
+        await cache.invalidate_all()
+        await cache.get_or_load(user_id, load)
+
+        assert load.await_count == 2
+
+    async def test_invalidated_while_loading(self):
+        cache = UserPermissionsCache(10, 60)
+        user_id = uuid.uuid4()
+
+        async def _load() -> list[str]:
+            await cache.invalidate(user_id)
+            return ["castles:read"]
+
+        assert await cache.get_or_load(user_id, _load) == ["castles:read"]
+        assert len(cache) == 0
+
+    async def test_maxsize(self):
+        cache = UserPermissionsCache(2, 60)
+        load = AsyncMock(return_value=[])
+
+        for _ in range(3):
+            await cache.get_or_load(uuid.uuid4(), load)
+
+        assert len(cache) == 2
+
+    async def test_disabled(self):
+        cache = UserPermissionsCache(10, 0)
+        user_id = uuid.uuid4()
+        load = AsyncMock(return_value=["castles:read"])
+
+        await cache.get_or_load(user_id, load)
+        await cache.get_or_load(user_id, load)
+
+        assert load.await_count == 2
+        assert len(cache) == 0
+
+    async def test_redis_unavailable(self):
+        redis = MagicMock()
+        redis.mget = AsyncMock(side_effect=ConnectionError())
+        cache = UserPermissionsCache(10, 60, get_redis=lambda: redis)
+        user_id = uuid.uuid4()
+        load = AsyncMock(return_value=["castles:read"])
+
+        assert await cache.get_or_load(user_id, load) == ["castles:read"]
+        assert await cache.get_or_load(user_id, load) == ["castles:read"]
+        assert load.await_count == 2
@@ -0,0 +1,73 @@
+import pytest
+
+from fief.db import AsyncSession
+from fief.models import UserRole
+from fief.repositories import UserPermissionRepository, UserRoleRepository
+from fief.services.user_role_permissions import UserRolePermissionsService
+from tests.data import TestData
+
+
+@pytest.fixture
+def user_role_permissions(main_session: AsyncSession) -> UserRolePermissionsService:
+    return UserRolePermissionsService(
+        UserPermissionRepository(main_session),
+        UserRoleRepository(main_session),
+        chunk_size=1,
+    )
+
+
+@pytest.mark.asyncio
+class TestUpdateRolePermissions:
+    async def test_added_permissions(
+        self,
+        user_role_permissions: UserRolePermissionsService,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        role = test_data["roles"]["castles_visitor"]
+        user_role_repository = UserRoleRepository(main_session)
+        for user_alias in ["regular_secondary", "admin"]:
+            await user_role_repository.create(
+                UserRole(user_id=test_data["users"][user_alias].id, role_id=role.id)
+            )
+
+        permissions = [
+            test_data["permissions"]["castles:create"].id,
+            test_data["permissions"]["castles:update"].id,
+        ]
+        await user_role_permissions.update_role_permissions(role, permissions, [])
+        # Running it again, e.g. on task retry, is harmless
+        await user_role_permissions.update_role_permissions(role, permissions, [])
+
+        user_permission_repository = UserPermissionRepository(main_session)
+        for user_alias in ["regular", "regular_secondary", "admin"]:
+            user = test_data["users"][user_alias]
+            user_permissions = await user_permission_repository.list(
+                user_permission_repository.get_by_user_statement(user.id)
+            )
+            role_permissions = [
+                user_permission.permission_id
+                for user_permission in user_permissions
+                if user_permission.from_role_id == role.id
+            ]
+            assert len(role_permissions) == len(set(role_permissions))
+            assert set(permissions).issubset(role_permissions)
+
+    async def test_deleted_permissions(
+        self,
+        user_role_permissions: UserRolePermissionsService,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        role = test_data["roles"]["castles_visitor"]
+        permission = test_data["permissions"]["castles:read"]
+        await user_role_permissions.update_role_permissions(role, [], [permission.id])
+
+        user = test_data["users"]["regular"]
+        user_permission_repository = UserPermissionRepository(main_session)
+        user_permissions = await user_permission_repository.list(
+            user_permission_repository.get_by_user_statement(user.id)
+        )
+        assert [
+            user_permission.permission_id for user_permission in user_permissions
+        ] == [test_data["permissions"]["castles:delete"].id]
@@ -0,0 +1,117 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from fief.services.webhooks import circuit_breaker
+from fief.services.webhooks.circuit_breaker import (
+    WebhookCircuitBreaker,
+    WebhookCircuitStatus,
+)
+
+
+@pytest.fixture
+def webhook_circuit_breaker() -> WebhookCircuitBreaker:
+    return WebhookCircuitBreaker(2, 10, 25, 5)
+
+
+@pytest.mark.asyncio
+class TestWebhookCircuitBreaker:
+    async def test_closed(self, webhook_circuit_breaker: WebhookCircuitBreaker):
+        webhook_id = uuid.uuid4()
+
+        await webhook_circuit_breaker.record_failure(webhook_id)
+
+        assert await webhook_circuit_breaker.get_deferral(webhook_id) is None
+        circuit = await webhook_circuit_breaker.get_circuit(webhook_id)
+        assert circuit is not None
+        assert circuit.get_status() == WebhookCircuitStatus.CLOSED
+        assert circuit.failures == 1
+
+    async def test_success_resets_failures(
+        self, webhook_circuit_breaker: WebhookCircuitBreaker
+    ):
+        webhook_id = uuid.uuid4()
+
+        await webhook_circuit_breaker.record_failure(webhook_id)
+        await webhook_circuit_breaker.record_success(webhook_id)
+        await webhook_circuit_breaker.record_failure(webhook_id)
+
+        assert await webhook_circuit_breaker.get_deferral(webhook_id) is None
+
+    async def test_open(self, webhook_circuit_breaker: WebhookCircuitBreaker):
+        webhook_id = uuid.uuid4()
+        other_webhook_id = uuid.uuid4()
+
+        with patch.object(circuit_breaker.time, "time", return_value=1000.0):
+            await webhook_circuit_breaker.record_failure(webhook_id)
+            await webhook_circuit_breaker.record_failure(webhook_id)
+
+        with patch.object(circuit_breaker.time, "time", return_value=1004.0):
+            assert await webhook_circuit_breaker.get_deferral(webhook_id) == 6.0
+            assert await webhook_circuit_breaker.get_deferral(other_webhook_id) is None
+            circuit = await webhook_circuit_breaker.get_circuit(webhook_id)
+            assert circuit is not None
+            assert circuit.get_status() == WebhookCircuitStatus.OPEN
+
+    async def test_half_open_probe(
+        self, webhook_circuit_breaker: WebhookCircuitBreaker
+    ):
+        webhook_id = uuid.uuid4()
+
+        with patch.object(circuit_breaker.time, "time", return_value=1000.0):
+            await webhook_circuit_breaker.record_failure(webhook_id)
+            await webhook_circuit_breaker.record_failure(webhook_id)
+
+        with patch.object(circuit_breaker.time, "time", return_value=1010.0):
+            # A single delivery probes the receiver
+            assert await webhook_circuit_breaker.get_deferral(webhook_id) is None
+            assert await webhook_circuit_breaker.get_deferral(webhook_id) == 5
+
+            await webhook_circuit_breaker.record_success(webhook_id)
+
+            assert await webhook_circuit_breaker.get_deferral(webhook_id) is None
+            circuit = await webhook_circuit_breaker.get_circuit(webhook_id)
+            assert circuit is not None
+            assert circuit.get_status() == WebhookCircuitStatus.CLOSED
+
+    async def test_failed_probe_backoff(
+        self, webhook_circuit_breaker: WebhookCircuitBreaker
+    ):
+        webhook_id = uuid.uuid4()
+
+        with patch.object(circuit_breaker.time, "time", return_value=1000.0):
+            await webhook_circuit_breaker.record_failure(webhook_id)
+            await webhook_circuit_breaker.record_failure(webhook_id)
+
+        with patch.object(circuit_breaker.time, "time", return_value=1010.0):
+            assert await webhook_circuit_breaker.get_deferral(webhook_id) is None
+            await webhook_circuit_breaker.record_failure(webhook_id)
+            assert await webhook_circuit_breaker.get_deferral(webhook_id) == 20.0
+
+        with patch.object(circuit_breaker.time, "time", return_value=1030.0):
+            assert await webhook_circuit_breaker.get_deferral(webhook_id) is None
+            await webhook_circuit_breaker.record_failure(webhook_id)
+            # Capped to max_open_seconds
+            assert await webhook_circuit_breaker.get_deferral(webhook_id) == 25.0
+
+    async def test_disabled(self):
+        webhook_circuit_breaker = WebhookCircuitBreaker(0, 10, 25, 5)
+        webhook_id = uuid.uuid4()
+
+        for _ in range(5):
+            await webhook_circuit_breaker.record_failure(webhook_id)
+
+        assert await webhook_circuit_breaker.get_deferral(webhook_id) is None
+
+    async def test_redis_unavailable(self):
+        redis = MagicMock()
+        redis.hgetall = AsyncMock(side_effect=ConnectionError())
+        webhook_circuit_breaker = WebhookCircuitBreaker(
+            2, 10, 25, 5, get_redis=lambda: redis
+        )
+        webhook_id = uuid.uuid4()
+
+        assert await webhook_circuit_breaker.get_deferral(webhook_id) is None
+        assert await webhook_circuit_breaker.get_circuit(webhook_id) is None
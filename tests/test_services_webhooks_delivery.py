@@ -1,3 +1,7 @@
+import hmac
+import json
+from hashlib import sha256
+
 import httpx
 import pytest
 import respx
@@ -8,13 +12,13 @@ from fief.db import AsyncSession
 from fief.models import WebhookLog
 from fief.repositories import WebhookLogRepository
 from fief.services.webhooks.delivery import WebhookDelivery, WebhookDeliveryError
-from fief.services.webhooks.models import ClientCreated, WebhookEvent
+from fief.services.webhooks.models import ClientCreated, UserCreated, WebhookEvent
 from tests.data import TestData
 
 
 @pytest.fixture
-def webhook_delivery(main_session: AsyncSession) -> WebhookDelivery:
-    return WebhookDelivery(WebhookLogRepository(main_session))
+def webhook_delivery(main_session_manager) -> WebhookDelivery:
+    return WebhookDelivery(main_session_manager)
 
 
 @pytest.fixture
@@ -130,3 +134,48 @@ class TestWebhookDelivery:
         assert webhook_log.error_type == "HTTPError"
         assert webhook_log.error_message == "Something went wrong"
         assert not webhook_log.success
+
+    async def test_deliver_batch(
+        self,
+        respx_mock: respx.MockRouter,
+        webhook_delivery: WebhookDelivery,
+        webhook_event: WebhookEvent,
+        test_data: TestData,
+        main_session: AsyncSession,
+    ):
+        webhook = test_data["webhooks"]["all"]
+        route_mock = respx_mock.post(webhook.url).mock(
+            return_value=httpx.Response(200, text="Ok")
+        )
+        events = [webhook_event, WebhookEvent(type=UserCreated.key(), data={})]
+
+        await webhook_delivery.deliver_batch(webhook, events, attempt=2)
+
+        assert route_mock.call_count == 1
+        request, _ = route_mock.calls.last
+        timestamp = request.headers["X-Fief-Webhook-Timestamp"]
+        signature = hmac.new(
+            webhook.secret.encode("utf-8"),
+            msg=f"{timestamp}.{request.content.decode('utf-8')}".encode(),
+            digestmod=sha256,
+        ).hexdigest()
+        assert request.headers["X-Fief-Webhook-Signature"] == signature
+        assert json.loads(request.content) == [
+            event.model_dump(mode="json") for event in events
+        ]
+
+        webhook_log_repository = WebhookLogRepository(main_session)
+        webhook_logs = await webhook_log_repository.list(
+            select(WebhookLog).where(WebhookLog.batch_id.is_not(None))
+        )
+
+        assert len(webhook_logs) == 2
+        assert {webhook_log.event for webhook_log in webhook_logs} == {
+            event.type for event in events
+        }
+        assert len({webhook_log.batch_id for webhook_log in webhook_logs}) == 1
+        for webhook_log in webhook_logs:
+            assert webhook_log.webhook_id == webhook.id
+            assert webhook_log.attempt == 2
+            assert webhook_log.response == "Ok"
+            assert webhook_log.success
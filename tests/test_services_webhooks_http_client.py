@@ -0,0 +1,20 @@
+import pytest
+
+from fief.services.webhooks.http_client import (
+    close_webhook_http_client,
+    get_webhook_http_client,
+)
+
+
+@pytest.mark.asyncio
+class TestGetWebhookHTTPClient:
+    async def test_reuse_client(self):
+        client = get_webhook_http_client()
+        assert get_webhook_http_client() is client
+
+    async def test_closed_client(self):
+        client = get_webhook_http_client()
+        await close_webhook_http_client()
+
+        assert client.is_closed
+        assert get_webhook_http_client() is not client
@@ -0,0 +1,66 @@
+import json
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import select
+
+from fief.db import AsyncSession
+from fief.models import AuditLog, AuditLogMessage
+from fief.repositories import AuditLogRepository
+from fief.tasks.audit_log import WriteAuditLog
+from tests.data import TestData
+
+
+def _get_record(object_id: uuid.UUID) -> str:
+    return json.dumps(
+        {
+            "time": datetime.now(UTC).isoformat(),
+            "level": "INFO",
+            "message": AuditLogMessage.OBJECT_CREATED,
+            "extra": {
+                "audit": True,
+                "object_id": str(object_id),
+                "object_class": "Client",
+                "subject_user_id": None,
+                "admin_user_id": None,
+                "admin_api_key_id": None,
+                "foo": "bar",
+            },
+        }
+    )
+
+
+@pytest.mark.asyncio
+class TestTasksWriteAuditLog:
+    async def test_batch(
+        self, main_session_manager, main_session: AsyncSession, test_data: TestData
+    ):
+        object_ids = [uuid.uuid4() for _ in range(3)]
+
+        write_audit_log = WriteAuditLog(main_session_manager)
+        await write_audit_log.run([_get_record(object_id) for object_id in object_ids])
+
+        audit_log_repository = AuditLogRepository(main_session)
+        audit_logs = await audit_log_repository.list(
+            select(AuditLog).where(AuditLog.object_id.in_(object_ids))
+        )
+        assert {audit_log.object_id for audit_log in audit_logs} == set(object_ids)
+        for audit_log in audit_logs:
+            assert audit_log.message == AuditLogMessage.OBJECT_CREATED
+            assert audit_log.object_class == "Client"
+            assert audit_log.extra == {"foo": "bar"}
+
+    async def test_single_record(
+        self, main_session_manager, main_session: AsyncSession, test_data: TestData
+    ):
+        object_id = uuid.uuid4()
+
+        write_audit_log = WriteAuditLog(main_session_manager)
+        await write_audit_log.run(_get_record(object_id))
+
+        audit_log_repository = AuditLogRepository(main_session)
+        audit_log = await audit_log_repository.get_one_or_none(
+            select(AuditLog).where(AuditLog.object_id == object_id)
+        )
+        assert audit_log is not None
@@ -0,0 +1,211 @@
+import asyncio
+import contextvars
+import logging
+import pathlib
+import threading
+from collections.abc import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from dramatiq.asyncio import EventLoopThread
+from dramatiq.middleware import Retries
+from redis.asyncio import Redis
+from sqlalchemy import URL, text
+
+from fief.db.engine import create_engine
+from fief.redis import get_redis
+from fief.tasks import base
+from fief.tasks.base import WorkerRuntime, close_worker_runtime, get_worker_runtime
+
+variable = contextvars.ContextVar[str | None]("variable", default=None)
+
+
+class TestWorkerRuntime:
+    def test_reuse_event_loop(self):
+        runtime = WorkerRuntime()
+
+        async def _get_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        try:
+            assert runtime.run(_get_loop()) is runtime.run(_get_loop())
+        finally:
+            runtime.close()
+
+    def test_isolated_context(self):
+        runtime = WorkerRuntime()
+
+        async def _set_variable() -> str | None:
+            previous_value = variable.get()
+            variable.set("value")
+            return previous_value
+
+        try:
+            assert runtime.run(_set_variable()) is None
+            assert runtime.run(_set_variable()) is None
+        finally:
+            runtime.close()
+
+    def test_reuse_engine(self, tmp_path: pathlib.Path):
+        runtime = WorkerRuntime()
+        database_url = URL.create(
+            "sqlite+aiosqlite", database=str(tmp_path / "fief.db")
+        )
+        engine_factory = MagicMock(
+            side_effect=lambda: create_engine((database_url, {}))
+        )
+
+        async def _query() -> int:
+            async with runtime.get_main_session() as session:
+                result = await session.execute(text("SELECT 1"))
+                return result.scalar_one()
+
+        with patch.object(base, "create_main_engine", engine_factory):
+            try:
+                assert runtime.run(_query()) == 1
+                assert runtime.run(_query()) == 1
+            finally:
+                runtime.close()
+
+        engine_factory.assert_called_once()
+
+    def test_close_redis(self):
+        runtime = WorkerRuntime()
+
+        async def _get_redis() -> Redis:
+            return get_redis()
+
+        client = runtime.run(_get_redis())
+        with patch.object(client, "aclose") as aclose_mock:
+            runtime.close()
+
+        aclose_mock.assert_awaited_once()
+
+
+def test_worker_runtime_per_thread():
+    runtimes: list[WorkerRuntime] = []
+
+    def _get_runtimes():
+        runtimes.append(get_worker_runtime())
+        runtimes.append(get_worker_runtime())
+        close_worker_runtime()
+
+    threads = [threading.Thread(target=_get_runtimes) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert runtimes[0] is runtimes[1]
+    assert runtimes[2] is runtimes[3]
+    assert runtimes[0] is not runtimes[2]
+
+
+@pytest.fixture
+def event_loop_thread() -> Generator[EventLoopThread, None, None]:
+    event_loop_thread = EventLoopThread(logging.getLogger(__name__))
+    event_loop_thread.start(timeout=1.0)
+    yield event_loop_thread
+    event_loop_thread.stop()
+
+
+class TestAsyncWorkerRuntime:
+    def test_concurrency_limit(self, event_loop_thread: EventLoopThread):
+        runtime = WorkerRuntime(event_loop_thread, concurrency=2)
+        running = 0
+        max_running = 0
+
+        async def _task():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+        threads = [
+            threading.Thread(target=runtime.run, args=(_task(),)) for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        runtime.close()
+
+        assert max_running == 2
+
+    def test_shared_event_loop(self, event_loop_thread: EventLoopThread):
+        runtime = WorkerRuntime(event_loop_thread, concurrency=2)
+
+        async def _get_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        try:
+            assert runtime.run(_get_loop()) is event_loop_thread.loop
+        finally:
+            runtime.close()
+
+    def test_isolated_context(self, event_loop_thread: EventLoopThread):
+        runtime = WorkerRuntime(event_loop_thread, concurrency=2)
+
+        async def _set_variable() -> str | None:
+            previous_value = variable.get()
+            variable.set("value")
+            return previous_value
+
+        try:
+            assert runtime.run(_set_variable()) is None
+            assert runtime.run(_set_variable()) is None
+        finally:
+            runtime.close()
+
+    def test_submit(self, event_loop_thread: EventLoopThread):
+        runtime = WorkerRuntime(event_loop_thread, concurrency=2)
+        running = 0
+        max_running = 0
+        done = 0
+
+        async def _task():
+            nonlocal running, max_running, done
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            done += 1
+
+        # A single thread keeps submitting while slots are busy
+        for _ in range(6):
+            runtime.submit(_task())
+        assert done < 6
+
+        runtime.close()
+
+        assert done == 6
+        assert max_running == 2
+
+    def test_submit_task_failure(self, event_loop_thread: EventLoopThread):
+        runtime = WorkerRuntime(event_loop_thread, concurrency=2)
+        message = MagicMock()
+        retries = MagicMock(spec=Retries)
+        broker = MagicMock()
+        broker.middleware = [retries]
+
+        class FailingTask(base.TaskBase):
+            __name__ = "failing"
+
+            async def run(self):
+                raise ValueError()
+
+        with (
+            patch.object(base, "get_worker_runtime", return_value=runtime),
+            patch.object(
+                base.CurrentMessage, "get_current_message", return_value=message
+            ),
+            patch.object(base.dramatiq, "get_broker", return_value=broker),
+        ):
+            assert FailingTask()() is None
+            runtime.close()
+
+        retries.after_process_message.assert_called_once()
+        args, kwargs = retries.after_process_message.call_args
+        assert args == (broker, message)
+        assert isinstance(kwargs["exception"], ValueError)
@@ -2,11 +2,51 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from fief.db import AsyncSession
+from fief.repositories import AuthorizationCodeRepository, LoginSessionRepository
 from fief.tasks.cleanup import CleanupTask
+from tests.data import TestData
 
 
 @pytest.mark.asyncio
 class TestTasksCleanup:
-    async def test_cleanup(self, main_session_manager, send_task_mock: MagicMock):
-        cleanup = CleanupTask(main_session_manager, send_task=send_task_mock)
+    async def test_cleanup(
+        self,
+        main_session_manager,
+        main_session: AsyncSession,
+        test_data: TestData,
+        send_task_mock: MagicMock,
+    ):
+        cleanup = CleanupTask(
+            main_session_manager, send_task=send_task_mock, chunk_size=1
+        )
         await cleanup.run()
+
+        login_session_repository = LoginSessionRepository(main_session)
+        for alias, login_session in test_data["login_sessions"].items():
+            deleted = await login_session_repository.get_by_id(login_session.id) is None
+            assert deleted == (alias == "expired")
+
+        authorization_code_repository = AuthorizationCodeRepository(main_session)
+        for alias, authorization_code in test_data["authorization_codes"].items():
+            deleted = (
+                await authorization_code_repository.get_by_id(authorization_code.id)
+                is None
+            )
+            assert deleted == (alias == "expired")
+
+    async def test_max_duration(
+        self,
+        main_session_manager,
+        main_session: AsyncSession,
+        test_data: TestData,
+        send_task_mock: MagicMock,
+    ):
+        cleanup = CleanupTask(
+            main_session_manager, send_task=send_task_mock, max_duration_seconds=0
+        )
+        await cleanup.run()
+
+        login_session = test_data["login_sessions"]["expired"]
+        login_session_repository = LoginSessionRepository(main_session)
+        assert await login_session_repository.get_by_id(login_session.id) is not None
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from unittest.mock import MagicMock
 
 import pytest
@@ -20,3 +22,30 @@ class TestTasksOnAfterRegister:
         await on_after_register.run(str(user.id))
 
         email_provider_mock.send_email.assert_called_once()
+
+    async def test_slow_email_provider(self, main_session_manager, test_data: TestData):
+        sent_at: list[float] = []
+
+        def _send_email(**kwargs):
+            sent_at.append(time.monotonic())
+            time.sleep(0.5)
+
+        email_provider_mock = MagicMock(spec=EmailProvider)
+        email_provider_mock.send_email.side_effect = _send_email
+
+        on_after_register = OnAfterRegisterTask(
+            main_session_manager, email_provider_mock
+        )
+
+        async def _wait_for_send() -> float:
+            while not sent_at:
+                await asyncio.sleep(0.01)
+            # Time it took to run again once the email is being sent
+            return time.monotonic() - sent_at[0]
+
+        user = test_data["users"]["regular"]
+        delay, _ = await asyncio.gather(
+            _wait_for_send(), on_after_register.run(str(user.id))
+        )
+
+        assert delay < 0.25
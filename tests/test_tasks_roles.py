@@ -14,6 +14,7 @@ class TestTasksOnRoleUpdated:
     async def test_not_existing_role(
         self,
         main_session_manager,
+        test_data: TestData,
         not_existing_uuid: uuid.UUID,
     ):
         on_user_role_updated = OnRoleUpdated(main_session_manager)
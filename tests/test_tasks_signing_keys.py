@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fief.crypto.jwk import SignatureAlgorithm
+from fief.db import AsyncSession
+from fief.repositories import PooledSigningKeyRepository
+from fief.settings import settings
+from fief.tasks.signing_keys import ReplenishSigningKeysTask
+from tests.data import TestData
+
+
+@pytest.fixture
+def redis_mock() -> MagicMock:
+    redis = MagicMock()
+    lock = redis.lock.return_value
+    lock.acquire = AsyncMock(return_value=True)
+    lock.release = AsyncMock()
+    return redis
+
+
+@pytest.mark.asyncio
+class TestTasksReplenishSigningKeys:
+    async def test_replenish(
+        self,
+        main_session: AsyncSession,
+        main_session_manager,
+        send_task_mock: MagicMock,
+        redis_mock: MagicMock,
+        test_data: TestData,
+    ):
+        replenish_signing_keys = ReplenishSigningKeysTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            get_redis=lambda: redis_mock,
+        )
+        repository = PooledSigningKeyRepository(main_session)
+
+        await repository.pop(SignatureAlgorithm.RS256)
+        await replenish_signing_keys.run()
+        for algorithm in SignatureAlgorithm:
+            count = await repository.count_by_algorithm(algorithm)
+            assert count == settings.signing_key_pool_size
+
+        await repository.pop(SignatureAlgorithm.RS256)
+        await replenish_signing_keys.run()
+        assert (
+            await repository.count_by_algorithm(SignatureAlgorithm.RS256)
+            == settings.signing_key_pool_size
+        )
+
+        assert redis_mock.lock.return_value.release.await_count == 2
+
+    async def test_already_replenishing(
+        self,
+        main_session: AsyncSession,
+        main_session_manager,
+        send_task_mock: MagicMock,
+        redis_mock: MagicMock,
+        test_data: TestData,
+    ):
+        lock = redis_mock.lock.return_value
+        lock.acquire.return_value = False
+        replenish_signing_keys = ReplenishSigningKeysTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            get_redis=lambda: redis_mock,
+        )
+        repository = PooledSigningKeyRepository(main_session)
+        count = await repository.count_by_algorithm(SignatureAlgorithm.RS256)
+        assert count < settings.signing_key_pool_size
+
+        await replenish_signing_keys.run()
+
+        assert await repository.count_by_algorithm(SignatureAlgorithm.RS256) == count
+        lock.release.assert_not_awaited()
@@ -1,3 +1,7 @@
+import asyncio
+import collections
+import contextlib
+import uuid
 from unittest.mock import MagicMock
 
 import httpx
@@ -7,6 +11,10 @@ from dramatiq import Message
 from dramatiq.middleware import CurrentMessage
 from pytest_mock import MockerFixture
 
+from fief.db import AsyncSession
+from fief.repositories import WebhookRepository
+from fief.services.webhooks.batch import WebhookBatchBuffer
+from fief.services.webhooks.circuit_breaker import WebhookCircuitBreaker
 from fief.services.webhooks.delivery import WebhookDeliveryError
 from fief.services.webhooks.models import (
     ClientCreated,
@@ -14,10 +22,33 @@ from fief.services.webhooks.models import (
     UserRoleDeleted,
     WebhookEvent,
 )
-from fief.tasks.webhooks import DeliverWebhookTask, TriggerWebhooksTask
+from fief.settings import settings
+from fief.tasks.webhooks import (
+    DeliverWebhookBatchTask,
+    DeliverWebhookTask,
+    FlushWebhookBatchTask,
+    TriggerWebhooksTask,
+    deliver_webhook,
+    deliver_webhook_batch,
+    flush_webhook_batch,
+)
 from tests.data import TestData
 
 
+class MemoryWebhookBatchBuffer(WebhookBatchBuffer):
+    def __init__(self) -> None:
+        self.queues: dict[uuid.UUID, list[str]] = collections.defaultdict(list)
+
+    async def push(self, webhook_id: uuid.UUID, event: str) -> int:
+        self.queues[webhook_id].append(event)
+        return len(self.queues[webhook_id])
+
+    async def pop(self, webhook_id: uuid.UUID, count: int) -> tuple[list[str], int]:
+        queue = self.queues[webhook_id]
+        events, self.queues[webhook_id] = queue[:count], queue[count:]
+        return events, len(self.queues[webhook_id])
+
+
 @pytest.fixture
 def webhook_event() -> WebhookEvent:
     return WebhookEvent(type=ClientCreated.key(), data={})
@@ -47,6 +78,40 @@ class TestTasksDeliverWebhook:
 
         assert route_mock.called
 
+    async def test_no_session_during_request(
+        self,
+        mocker: MockerFixture,
+        respx_mock: respx.MockRouter,
+        webhook_event: WebhookEvent,
+        main_session: AsyncSession,
+        test_data: TestData,
+    ):
+        mocker.patch.object(CurrentMessage, "get_current_message", return_value=None)
+        open_sessions = 0
+
+        @contextlib.asynccontextmanager
+        async def _main_session_manager(*args, **kwargs):
+            nonlocal open_sessions
+            open_sessions += 1
+            try:
+                yield main_session
+            finally:
+                open_sessions -= 1
+
+        def _receiver(request: httpx.Request) -> httpx.Response:
+            assert open_sessions == 0
+            return httpx.Response(200)
+
+        webhook = test_data["webhooks"]["all"]
+        route_mock = respx_mock.post(webhook.url).mock(side_effect=_receiver)
+
+        deliver_webhook = DeliverWebhookTask(_main_session_manager)
+
+        await deliver_webhook.run(str(webhook.id), webhook_event.model_dump_json())
+
+        assert route_mock.called
+        assert open_sessions == 0
+
     async def test_deliver_error(
         self,
         mocker: MockerFixture,
@@ -54,6 +119,7 @@ class TestTasksDeliverWebhook:
         webhook_event: WebhookEvent,
         main_session_manager,
         test_data: TestData,
+        local_webhook_circuit_breaker: WebhookCircuitBreaker,
     ):
         get_current_message_mock = mocker.patch.object(
             CurrentMessage, "get_current_message"
@@ -68,6 +134,47 @@ class TestTasksDeliverWebhook:
         with pytest.raises(WebhookDeliveryError):
             await deliver_webhook.run(str(webhook.id), webhook_event.model_dump_json())
 
+        circuit = await local_webhook_circuit_breaker.get_circuit(webhook.id)
+        assert circuit is not None
+        assert circuit.failures == 1
+
+    async def test_circuit_open(
+        self,
+        mocker: MockerFixture,
+        respx_mock: respx.MockRouter,
+        webhook_event: WebhookEvent,
+        main_session_manager,
+        test_data: TestData,
+        send_task_mock: MagicMock,
+        local_webhook_circuit_breaker: WebhookCircuitBreaker,
+    ):
+        webhook = test_data["webhooks"]["all"]
+        route_mock = respx_mock.post(webhook.url).mock(return_value=httpx.Response(200))
+        for _ in range(local_webhook_circuit_breaker.failure_threshold):
+            await local_webhook_circuit_breaker.record_failure(webhook.id)
+        mocker.patch.object(
+            CurrentMessage,
+            "get_current_message",
+            return_value=Message("queue", "actor", (), {}, {"retries": 2}),
+        )
+
+        deliver_webhook_task = DeliverWebhookTask(
+            main_session_manager, send_task=send_task_mock
+        )
+        event = webhook_event.model_dump_json()
+        await deliver_webhook_task.run(str(webhook.id), event)
+
+        assert not route_mock.called
+        send_task_mock.assert_called_once()
+        assert send_task_mock.call_args.args == (deliver_webhook,)
+        assert send_task_mock.call_args.kwargs["webhook_id"] == str(webhook.id)
+        assert send_task_mock.call_args.kwargs["event"] == event
+        assert (
+            send_task_mock.call_args.kwargs["delay"]
+            >= (local_webhook_circuit_breaker.open_seconds - 1) * 1000
+        )
+        assert send_task_mock.call_args.kwargs["retries"] == 2
+
 
 @pytest.mark.asyncio
 class TestTasksTriggerWebhooks:
@@ -80,7 +187,9 @@ class TestTasksTriggerWebhooks:
         webhook_event = WebhookEvent(type=ClientCreated.key(), data={})
 
         trigger_webhooks = TriggerWebhooksTask(
-            main_session_manager, send_task=send_task_mock
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=MemoryWebhookBatchBuffer(),
         )
 
         await trigger_webhooks.run(webhook_event.model_dump_json())
@@ -99,7 +208,9 @@ class TestTasksTriggerWebhooks:
         webhook_event = WebhookEvent(type=UserCreated.key(), data={})
 
         trigger_webhooks = TriggerWebhooksTask(
-            main_session_manager, send_task=send_task_mock
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=MemoryWebhookBatchBuffer(),
         )
 
         await trigger_webhooks.run(webhook_event.model_dump_json())
@@ -120,7 +231,9 @@ class TestTasksTriggerWebhooks:
         webhook_event = WebhookEvent(type=UserRoleDeleted.key(), data={})
 
         trigger_webhooks = TriggerWebhooksTask(
-            main_session_manager, send_task=send_task_mock
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=MemoryWebhookBatchBuffer(),
         )
 
         await trigger_webhooks.run(webhook_event.model_dump_json())
@@ -131,3 +244,273 @@ class TestTasksTriggerWebhooks:
         ]
         assert str(test_data["webhooks"]["all"].id) in webhook_ids
         assert str(test_data["webhooks"]["object_user_role"].id) in webhook_ids
+
+    async def test_updated_webhook_events(
+        self,
+        main_session_manager,
+        main_session: AsyncSession,
+        test_data: TestData,
+        send_task_mock: MagicMock,
+    ):
+        webhook_repository = WebhookRepository(main_session)
+        webhook = await webhook_repository.get_by_id(
+            test_data["webhooks"]["user_created"].id
+        )
+        assert webhook is not None
+        webhook.events = [ClientCreated.key(), UserCreated.key(), ClientCreated.key()]
+        await webhook_repository.update(webhook)
+        webhook.events = [ClientCreated.key()]
+        await webhook_repository.update(webhook)
+
+        trigger_webhooks = TriggerWebhooksTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=MemoryWebhookBatchBuffer(),
+        )
+
+        await trigger_webhooks.run(
+            WebhookEvent(type=UserCreated.key(), data={}).model_dump_json()
+        )
+        assert send_task_mock.call_count == 1
+        assert send_task_mock.call_args[1]["webhook_id"] == str(
+            test_data["webhooks"]["all"].id
+        )
+
+        send_task_mock.reset_mock()
+        await trigger_webhooks.run(
+            WebhookEvent(type=ClientCreated.key(), data={}).model_dump_json()
+        )
+        webhook_ids = [
+            call_arg[1]["webhook_id"] for call_arg in send_task_mock.call_args_list
+        ]
+        assert sorted(webhook_ids) == sorted(
+            [str(test_data["webhooks"]["all"].id), str(webhook.id)]
+        )
+
+    async def test_batched_webhook(
+        self,
+        mocker: MockerFixture,
+        main_session_manager,
+        main_session: AsyncSession,
+        test_data: TestData,
+        send_task_mock: MagicMock,
+    ):
+        mocker.patch.object(settings, "webhooks_batch_max_events", 2)
+        webhook_repository = WebhookRepository(main_session)
+        webhook = await webhook_repository.get_by_id(
+            test_data["webhooks"]["user_created"].id
+        )
+        assert webhook is not None
+        webhook.batch = True
+        await webhook_repository.update(webhook)
+
+        webhook_batch_buffer = MemoryWebhookBatchBuffer()
+        trigger_webhooks = TriggerWebhooksTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=webhook_batch_buffer,
+        )
+
+        events = [
+            WebhookEvent(type=UserCreated.key(), data={"i": i}).model_dump_json()
+            for i in range(3)
+        ]
+        for event in events:
+            await trigger_webhooks.run(event)
+
+        assert webhook_batch_buffer.queues[webhook.id] == events
+        all_webhook_id = str(test_data["webhooks"]["all"].id)
+        for event in events:
+            send_task_mock.assert_any_call(
+                deliver_webhook, webhook_id=all_webhook_id, event=event
+            )
+        flush_calls = [
+            call
+            for call in send_task_mock.call_args_list
+            if call.args[0] is flush_webhook_batch
+        ]
+        assert [call.kwargs for call in flush_calls] == [
+            {
+                "webhook_id": str(webhook.id),
+                "delay": settings.webhooks_batch_max_wait_ms,
+            },
+            {"webhook_id": str(webhook.id), "delay": None},
+        ]
+
+    async def test_fan_out(
+        self,
+        mocker: MockerFixture,
+        respx_mock: respx.MockRouter,
+        main_session_manager,
+        test_data: TestData,
+        send_task_mock: MagicMock,
+    ):
+        mocker.patch.object(settings, "webhooks_fanout_concurrency", 1)
+        running = 0
+        max_running = 0
+
+        async def _receiver(request: httpx.Request) -> httpx.Response:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return httpx.Response(200)
+
+        route_mock = respx_mock.post("https://internal.bretagne.duchy/webhook").mock(
+            side_effect=_receiver
+        )
+
+        trigger_webhooks = TriggerWebhooksTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=MemoryWebhookBatchBuffer(),
+        )
+        await trigger_webhooks.run(
+            WebhookEvent(type=UserCreated.key(), data={}).model_dump_json()
+        )
+
+        assert route_mock.call_count == 2
+        assert max_running == 1
+        send_task_mock.assert_not_called()
+
+    async def test_fan_out_retry(
+        self,
+        mocker: MockerFixture,
+        respx_mock: respx.MockRouter,
+        main_session_manager,
+        test_data: TestData,
+        send_task_mock: MagicMock,
+    ):
+        # Logs are written on the shared test session: no concurrent requests
+        mocker.patch.object(settings, "webhooks_fanout_concurrency", 1)
+        respx_mock.post("https://internal.bretagne.duchy/webhook").mock(
+            return_value=httpx.Response(500)
+        )
+
+        trigger_webhooks = TriggerWebhooksTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=MemoryWebhookBatchBuffer(),
+        )
+        event = WebhookEvent(type=UserCreated.key(), data={}).model_dump_json()
+        await trigger_webhooks.run(event)
+
+        assert send_task_mock.call_count == 2
+        retried_webhook_ids = set()
+        for call in send_task_mock.call_args_list:
+            assert call.args == (deliver_webhook,)
+            assert call.kwargs["event"] == event
+            assert call.kwargs["retries"] == 1
+            assert call.kwargs["delay"] > 0
+            retried_webhook_ids.add(call.kwargs["webhook_id"])
+        assert retried_webhook_ids == {
+            str(test_data["webhooks"]["all"].id),
+            str(test_data["webhooks"]["user_created"].id),
+        }
+
+    async def test_fan_out_error(
+        self,
+        mocker: MockerFixture,
+        respx_mock: respx.MockRouter,
+        main_session_manager,
+        test_data: TestData,
+        send_task_mock: MagicMock,
+    ):
+        mocker.patch.object(settings, "webhooks_fanout_concurrency", 1)
+        mocker.patch.object(
+            TriggerWebhooksTask,
+            "_get_deferral_delay",
+            side_effect=[RuntimeError(), None],
+        )
+        route_mock = respx_mock.post("https://internal.bretagne.duchy/webhook").mock(
+            return_value=httpx.Response(200)
+        )
+
+        trigger_webhooks = TriggerWebhooksTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=MemoryWebhookBatchBuffer(),
+        )
+        event = WebhookEvent(type=UserCreated.key(), data={}).model_dump_json()
+        await trigger_webhooks.run(event)
+
+        assert route_mock.call_count == 1
+        send_task_mock.assert_called_once()
+        assert send_task_mock.call_args.args == (deliver_webhook,)
+        assert send_task_mock.call_args.kwargs["event"] == event
+        assert "retries" not in send_task_mock.call_args.kwargs
+
+
+@pytest.mark.asyncio
+class TestTasksFlushWebhookBatch:
+    async def test_flush(
+        self,
+        mocker: MockerFixture,
+        main_session_manager,
+        send_task_mock: MagicMock,
+    ):
+        mocker.patch.object(settings, "webhooks_batch_max_events", 2)
+        webhook_id = uuid.uuid4()
+        webhook_batch_buffer = MemoryWebhookBatchBuffer()
+        webhook_batch_buffer.queues[webhook_id] = ["event1", "event2", "event3"]
+
+        flush_webhook_batch_task = FlushWebhookBatchTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=webhook_batch_buffer,
+        )
+        await flush_webhook_batch_task.run(str(webhook_id))
+
+        send_task_mock.assert_any_call(
+            deliver_webhook_batch,
+            webhook_id=str(webhook_id),
+            events=["event1", "event2"],
+        )
+        send_task_mock.assert_any_call(
+            flush_webhook_batch,
+            webhook_id=str(webhook_id),
+            delay=settings.webhooks_batch_max_wait_ms,
+        )
+        assert webhook_batch_buffer.queues[webhook_id] == ["event3"]
+
+    async def test_empty(
+        self,
+        main_session_manager,
+        send_task_mock: MagicMock,
+    ):
+        flush_webhook_batch_task = FlushWebhookBatchTask(
+            main_session_manager,
+            send_task=send_task_mock,
+            webhook_batch_buffer=MemoryWebhookBatchBuffer(),
+        )
+        await flush_webhook_batch_task.run(str(uuid.uuid4()))
+
+        send_task_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestTasksDeliverWebhookBatch:
+    async def test_deliver_error(
+        self,
+        mocker: MockerFixture,
+        respx_mock: respx.MockRouter,
+        main_session_manager,
+        test_data: TestData,
+    ):
+        mocker.patch.object(CurrentMessage, "get_current_message", return_value=None)
+
+        webhook = test_data["webhooks"]["all"]
+        route_mock = respx_mock.post(webhook.url).mock(return_value=httpx.Response(500))
+
+        deliver_webhook_batch_task = DeliverWebhookBatchTask(main_session_manager)
+
+        with pytest.raises(WebhookDeliveryError):
+            await deliver_webhook_batch_task.run(
+                str(webhook.id),
+                [
+                    WebhookEvent(type=UserCreated.key(), data={}).model_dump_json(),
+                    WebhookEvent(type=ClientCreated.key(), data={}).model_dump_json(),
+                ],
+            )
+        assert route_mock.call_count == 1